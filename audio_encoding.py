@@ -0,0 +1,151 @@
+"""
+In-memory audio encoding for the Groq translator
+Audio goes from NumPy arrays straight to bytes for the transcription client and
+st.audio, without temp files. Uploads to Whisper are resampled to the 16 kHz
+mono it works at internally and optionally compressed, and split if they would
+exceed the provider's size limit.
+"""
+
+import io
+import os
+import time
+from dataclasses import dataclass
+from math import gcd
+
+import numpy as np
+import soundfile as sf
+from scipy import signal
+
+WHISPER_RATE = 16000
+MAX_UPLOAD_BYTES = 24 * 1024 * 1024
+
+# codec: (soundfile format, subtype, extension, MIME type)
+CODECS = {
+    'wav': ('WAV', 'PCM_16', 'wav', 'audio/wav'),
+    'flac': ('FLAC', 'PCM_16', 'flac', 'audio/flac'),
+    'opus': ('OGG', 'OPUS', 'ogg', 'audio/ogg'),
+}
+
+
+@dataclass
+class EncodedAudio:
+    filename: str
+    data: bytes
+    mime: str
+    seconds: float
+
+
+@dataclass
+class UploadReport:
+    """Bytes and timings of one transcription, for before/after comparisons"""
+    codec: str
+    raw_bytes: int
+    uploaded_bytes: int
+    parts: int
+    encode_seconds: float
+    request_seconds: float = 0.0
+
+    @property
+    def ratio(self):
+        return self.raw_bytes / self.uploaded_bytes if self.uploaded_bytes else 0.0
+
+    @property
+    def total_seconds(self):
+        return self.encode_seconds + self.request_seconds
+
+    def summary(self):
+        return (f"Uploaded {self.uploaded_bytes / 1024:.0f} KB as {self.codec} in {self.parts} part(s) "
+                f"(PCM WAV at the recorded rate: {self.raw_bytes / 1024:.0f} KB, {self.ratio:.1f}x); "
+                f"encode {self.encode_seconds:.2f} s, transcription {self.request_seconds:.2f} s, "
+                f"total {self.total_seconds:.2f} s")
+
+
+def encode_wav(audio, sample_rate, subtype='PCM_16'):
+    buffer = io.BytesIO()
+    sf.write(buffer, audio, sample_rate, format='WAV', subtype=subtype)
+    return buffer.getvalue()
+
+
+def pcm_wav_bytes(samples, channels=1):
+    """Size of a 16-bit PCM WAV file with this many samples per channel"""
+    return 44 + samples * channels * 2
+
+
+def decode_audio(data):
+    """(float32 samples, sample rate) from encoded bytes in any format libsndfile reads"""
+    audio, sample_rate = sf.read(io.BytesIO(data), dtype='float32')
+    return audio, sample_rate
+
+
+def to_mono(audio):
+    audio = np.asarray(audio, dtype=np.float32)
+    return audio.mean(axis=1, dtype=np.float32) if audio.ndim == 2 else audio
+
+
+def resample(audio, sample_rate, target_rate=WHISPER_RATE):
+    """Polyphase resampling to the target rate (anti-aliasing included)"""
+    if sample_rate == target_rate:
+        return np.asarray(audio, dtype=np.float32)
+    factor = gcd(int(sample_rate), int(target_rate))
+    resampled = signal.resample_poly(audio, target_rate // factor, int(sample_rate) // factor)
+    return resampled.astype(np.float32, copy=False)
+
+
+def encode(audio, sample_rate, codec='flac', name='audio'):
+    audio_format, subtype, extension, mime = CODECS[codec]
+    buffer = io.BytesIO()
+    sf.write(buffer, audio, sample_rate, format=audio_format, subtype=subtype)
+    return EncodedAudio(f"{name}.{extension}", buffer.getvalue(), mime, len(audio) / sample_rate)
+
+
+def _split_encode(audio, sample_rate, codec, max_bytes, name):
+    encoded = encode(audio, sample_rate, codec, name)
+    if len(encoded.data) <= max_bytes or len(audio) < 2 * sample_rate:
+        return [encoded]
+    middle = len(audio) // 2
+    return (_split_encode(audio[:middle], sample_rate, codec, max_bytes, name)
+            + _split_encode(audio[middle:], sample_rate, codec, max_bytes, name))
+
+
+def prepare_upload(audio, sample_rate, codec='flac', max_bytes=MAX_UPLOAD_BYTES, name='audio'):
+    """
+    Resample to 16 kHz mono, encode, and split into parts of at most max_bytes
+
+    Returns:
+        (list of EncodedAudio in playback order, UploadReport)
+    """
+    started = time.perf_counter()
+    audio = to_mono(audio)
+    raw_bytes = pcm_wav_bytes(len(audio))
+    parts = _split_encode(resample(audio, sample_rate), WHISPER_RATE, codec, max_bytes, name)
+    if len(parts) > 1:
+        for index, part in enumerate(parts, 1):
+            stem, extension = part.filename.rsplit('.', 1)
+            part.filename = f"{stem}-{index}.{extension}"
+    report = UploadReport(
+        codec=f"{codec.upper()} {WHISPER_RATE // 1000} kHz mono",
+        raw_bytes=raw_bytes,
+        uploaded_bytes=sum(len(part.data) for part in parts),
+        parts=len(parts),
+        encode_seconds=time.perf_counter() - started
+    )
+    return parts, report
+
+
+def read_audio_result(result):
+    """
+    Audio bytes from a TTS result: bytes, a file-like object or a file path
+
+    A file path is read and deleted right away, so nothing is left behind.
+    """
+    if isinstance(result, (bytes, bytearray)):
+        return bytes(result)
+    if hasattr(result, 'read'):
+        return result.read()
+    with open(result, 'rb') as f:
+        data = f.read()
+    try:
+        os.remove(result)
+    except OSError:
+        pass
+    return data
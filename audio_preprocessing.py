@@ -0,0 +1,75 @@
+"""
+Audio preprocessing for the Groq translator
+Envelopes are computed over whole frames in one NumPy pass, filter designs are
+cached per sample rate as second-order sections, and audio stays float32 from
+capture to encoding.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+from scipy import signal
+
+# Alternating +/- offset far below 16-bit resolution. Digital silence makes the
+# IIR state decay into subnormal floats, which slows filtering about 20x; a
+# Nyquist-rate signal passes the high-pass and keeps the state normal.
+DENORMAL_GUARD = np.float32(1e-20)
+
+
+def as_float32(audio):
+    """1-D float32 view of the audio (copies only if the dtype or layout differs)"""
+    return np.ascontiguousarray(np.asarray(audio).reshape(-1), dtype=np.float32)
+
+
+def frame_envelope(audio, frame_size, kind='rms'):
+    """
+    Per-frame RMS or peak level, one value per `frame_size` samples
+
+    A trailing partial frame gets its own value.
+    """
+    audio = as_float32(audio)
+    count = len(audio) // frame_size
+    frames = audio[:count * frame_size].reshape(count, frame_size)
+    tail = audio[count * frame_size:]
+    if kind == 'peak':
+        envelope = np.maximum(frames.max(axis=1), -frames.min(axis=1))
+        tail_level = np.abs(tail).max() if len(tail) else None
+    else:
+        envelope = np.sqrt(np.einsum('ij,ij->i', frames, frames) / frame_size)
+        tail_level = np.sqrt(np.dot(tail, tail) / len(tail)) if len(tail) else None
+    if tail_level is not None:
+        envelope = np.append(envelope, np.float32(tail_level))
+    return envelope
+
+
+@lru_cache(maxsize=32)
+def highpass_sos(sample_rate, cutoff=100.0, order=5):
+    """Butterworth high-pass as float32 second-order sections, designed once per rate"""
+    sos = signal.butter(order, cutoff / (sample_rate / 2), btype='highpass', output='sos')
+    return sos.astype(np.float32)
+
+
+def reduce_noise(audio, sample_rate, cutoff=100.0, order=5):
+    # Zero-phase high-pass, like the filtfilt version, without float64 copies
+    guarded = as_float32(audio).copy()
+    guarded[::2] += DENORMAL_GUARD
+    guarded[1::2] -= DENORMAL_GUARD
+    filtered = signal.sosfiltfilt(highpass_sos(sample_rate, cutoff, order), guarded)
+    return filtered.astype(np.float32, copy=False)
+
+
+def trim_silence(audio, threshold=0.01, frame_size=1000):
+    """View of the audio between the first and last frame whose peak exceeds the threshold"""
+    audio = as_float32(audio)
+    loud = np.flatnonzero(frame_envelope(audio, frame_size, 'peak') > threshold)
+    if len(loud) == 0:
+        return audio
+    return audio[loud[0] * frame_size:min((loud[-1] + 1) * frame_size, len(audio))]
+
+
+def preprocess(audio, sample_rate, gain=1.0, threshold=0.01):
+    """High-pass, trim and apply gain; the gain is applied in place on the trimmed view"""
+    audio = trim_silence(reduce_noise(audio, sample_rate), threshold)
+    if gain != 1.0:
+        audio *= np.float32(gain)
+    return audio
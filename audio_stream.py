@@ -0,0 +1,166 @@
+"""
+Streaming microphone capture for the Groq translator
+The sounddevice callback only copies blocks into a ring buffer; the app reads
+new samples from it and cuts them into speech segments on voice activity, so
+segments can be transcribed while recording continues.
+"""
+
+import threading
+from collections import deque
+
+import numpy as np
+
+from audio_preprocessing import frame_envelope
+
+
+class RingBuffer:
+    """Fixed-size float32 buffer written by the audio callback and read by the app"""
+
+    def __init__(self, capacity):
+        self.capacity = int(capacity)
+        self.data = np.zeros(self.capacity, dtype=np.float32)
+        self.written = 0
+        self.read_pos = 0
+        self.dropped = 0
+        self._lock = threading.Lock()
+
+    def write(self, block):
+        block = np.asarray(block, dtype=np.float32).reshape(-1)
+        if len(block) > self.capacity:
+            block = block[-self.capacity:]
+        with self._lock:
+            start = self.written % self.capacity
+            first = min(len(block), self.capacity - start)
+            self.data[start:start + first] = block[:first]
+            self.data[:len(block) - first] = block[first:]
+            self.written += len(block)
+
+    def read(self):
+        """Samples written since the last read (oldest ones are dropped if the reader fell behind)"""
+        with self._lock:
+            available = self.written - self.read_pos
+            if available > self.capacity:
+                self.dropped += available - self.capacity
+                available = self.capacity
+            start = (self.written - available) % self.capacity
+            end = start + available
+            if end <= self.capacity:
+                samples = self.data[start:end].copy()
+            else:
+                samples = np.concatenate((self.data[start:], self.data[:end - self.capacity]))
+            self.read_pos = self.written
+        return samples
+
+
+class VoiceActivitySegmenter:
+    """
+    Cut a stream of samples into speech segments using frame energy
+
+    A segment starts at the first frame above the threshold (plus a short
+    pre-roll) and ends after `hangover_ms` of silence or at `max_segment_s`.
+    Segments with less than `min_speech_ms` of voiced frames are discarded.
+    """
+
+    def __init__(self, sample_rate, threshold=0.01, frame_ms=30, min_speech_ms=250,
+                 hangover_ms=600, max_segment_s=15, pre_roll_ms=200):
+        self.sample_rate = sample_rate
+        self.threshold = threshold
+        self.frame_size = max(1, int(sample_rate * frame_ms / 1000))
+        self.min_speech_frames = max(1, int(min_speech_ms / frame_ms))
+        self.hangover_frames = max(1, int(hangover_ms / frame_ms))
+        self.max_frames = max(1, int(max_segment_s * 1000 / frame_ms))
+        self.pre_roll = deque(maxlen=max(1, int(pre_roll_ms / frame_ms)))
+        self.position = 0
+        self._pending = np.zeros(0, dtype=np.float32)
+        self._frames = []
+        self._voiced = 0
+        self._silence = 0
+        self._start = 0
+
+    def feed(self, samples):
+        """Add samples; returns a list of (start_seconds, segment) for finished segments"""
+        samples = np.concatenate((self._pending, np.asarray(samples, dtype=np.float32)))
+        count = len(samples) // self.frame_size
+        self._pending = samples[count * self.frame_size:]
+        frames = samples[:count * self.frame_size].reshape(count, self.frame_size)
+        voiced = frame_envelope(frames, self.frame_size) > self.threshold
+
+        finished = []
+        for frame, is_voiced in zip(frames, voiced):
+            if not self._frames:
+                if is_voiced:
+                    self._start = self.position - len(self.pre_roll) * self.frame_size
+                    self._frames = list(self.pre_roll)
+                    self.pre_roll.clear()
+                else:
+                    self.pre_roll.append(frame)
+                    self.position += self.frame_size
+                    continue
+
+            self._frames.append(frame)
+            self.position += self.frame_size
+            if is_voiced:
+                self._voiced += 1
+                self._silence = 0
+            else:
+                self._silence += 1
+
+            if self._silence >= self.hangover_frames or len(self._frames) >= self.max_frames:
+                segment = self._close()
+                if segment is not None:
+                    finished.append(segment)
+        return finished
+
+    def flush(self):
+        """Finish the segment in progress at the end of a recording"""
+        if self._frames:
+            self._frames.append(self._pending)
+        self._pending = np.zeros(0, dtype=np.float32)
+        segment = self._close()
+        return [segment] if segment is not None else []
+
+    def _close(self):
+        frames, voiced, start = self._frames, self._voiced, self._start
+        self._frames, self._voiced, self._silence = [], 0, 0
+        if voiced < self.min_speech_frames:
+            return None
+        return start / self.sample_rate, np.concatenate(frames)
+
+
+class StreamingRecorder:
+    """Record from an input device into a RingBuffer with an sd.InputStream callback"""
+
+    def __init__(self, sample_rate=44100, buffer_seconds=30, device=None):
+        self.sample_rate = sample_rate
+        self.device = device
+        self.buffer = RingBuffer(sample_rate * buffer_seconds)
+        self.status_errors = 0
+        self._stream = None
+
+    def _callback(self, indata, frames, time_info, status):
+        if status:
+            self.status_errors += 1
+        self.buffer.write(indata[:, 0])
+
+    def start(self):
+        import sounddevice as sd
+
+        self._stream = sd.InputStream(samplerate=self.sample_rate, channels=1, dtype='float32',
+                                      device=self.device, callback=self._callback)
+        self._stream.start()
+        return self
+
+    def read(self):
+        return self.buffer.read()
+
+    def stop(self):
+        if self._stream is not None:
+            self._stream.stop()
+            self._stream.close()
+            self._stream = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
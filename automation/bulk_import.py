@@ -5,13 +5,22 @@ Reads notebooks and sources from CSV/Excel/JSON files and imports them
 """
 
 import asyncio
+import csv
 import json
-import yaml
-import pandas as pd
+import time
 from pathlib import Path
-from typing import List, Dict
+from typing import Callable, List, Dict, Optional, Tuple
 import logging
 from notebooklm_automation import NotebookLMAutomation
+from dedup import SourceDeduplicator
+from rpc_replay import DEFAULT_RPC_PATH, notebook_id_from_url
+from planner import plan_notebooks, log_plan
+from checkpoint import record_completed, load_completed, shard_checkpoints
+from inbox import InboxWatcher, source_type_for
+from manifests import ExcelCache, group_rows, load_excel, read_columnar
+from progress import ProgressTracker, ProgressDashboard, summary_line
+from tracing import FailureTracer
+from results import NotebookResult, RecordWriter, summarize
 
 # Configure logging
 logging.basicConfig(
@@ -24,15 +33,41 @@ logger = logging.getLogger(__name__)
 class BulkImporter:
     """Handle bulk import of notebooks and sources from various file formats"""
     
-    def __init__(self, config_path: str = 'config.yaml'):
-        """Initialize with configuration"""
-        self.config = self.load_config(config_path)
+    def __init__(self, config_path: str = 'config.yaml', config: Optional[dict] = None):
+        """
+        Initialize with configuration
+        
+        Args:
+            config_path: Path to the YAML config file
+            config: Already loaded configuration (takes precedence over config_path)
+        """
+        self.config = config if config is not None else self.load_config(config_path)
         self.automation = NotebookLMAutomation(
-            headless=self.config['browser']['headless']
+            headless=self.config['browser']['headless'],
+            base_url=self.config['notebooklm'].get('base_url', 'https://notebooklm.google.com'),
+            max_file_size=self.config.get('uploads', {}).get('max_file_size_mb', 200) * 1024 * 1024,
+            max_chunk_bytes=self.config.get('text_chunks', {}).get('max_chunk_kb', 500) * 1024,
+            rpc_replay=self.config['notebooklm'].get('rpc_replay', False),
+            rpc_path=self.config['notebooklm'].get('rpc_path', DEFAULT_RPC_PATH)
         )
+        self.progress = ProgressTracker()
+        self.automation.progress = self.progress
+        
+        tracing = self.config.get('tracing', {})
+        if tracing.get('enabled', True):
+            self.automation.tracer = FailureTracer(
+                artifact_dir=tracing.get('dir', 'traces'),
+                max_bytes=tracing.get('max_mb', 200) * 1024 * 1024,
+                ring_size=tracing.get('ring_size', 50),
+                sample_rate=tracing.get('sample_rate', 0.25)
+            )
+            self.automation.tracer.capture_logs(logging.getLogger('notebooklm_automation'))
         
-    def load_config(self, config_path: str) -> dict:
+    @staticmethod
+    def load_config(config_path: str) -> dict:
         """Load configuration from YAML file"""
+        import yaml
+        
         with open(config_path, 'r') as f:
             return yaml.safe_load(f)
             
@@ -41,15 +76,8 @@ class BulkImporter:
         Load notebooks data from CSV file
         Expected columns: notebook_name, source_url
         """
-        df = pd.read_csv(csv_path)
-        
-        # Group by notebook name
-        notebooks = []
-        for notebook_name, group in df.groupby('notebook_name'):
-            notebooks.append({
-                'name': notebook_name,
-                'sources': group['source_url'].tolist()
-            })
+        with open(csv_path, 'r', newline='', encoding='utf-8-sig') as f:
+            notebooks = group_rows(csv.DictReader(f))
             
         logger.info(f"Loaded {len(notebooks)} notebooks from CSV")
         return notebooks
@@ -58,20 +86,29 @@ class BulkImporter:
         """
         Load notebooks data from Excel file
         Expected columns: notebook_name, source_url
-        """
-        df = pd.read_excel(excel_path, sheet_name=sheet_name)
         
-        # Group by notebook name
-        notebooks = []
-        for notebook_name, group in df.groupby('notebook_name'):
-            notebooks.append({
-                'name': notebook_name,
-                'sources': group['source_url'].dropna().tolist()
-            })
+        The sheet is streamed in read-only mode and cached as an Arrow file
+        until the workbook changes.
+        """
+        cache_config = self.config.get('excel_cache', {})
+        cache = None
+        if cache_config.get('enabled', True):
+            cache = ExcelCache(cache_config.get('dir', '.manifest_cache'))
+        notebooks = load_excel(excel_path, sheet_name, cache=cache)
             
         logger.info(f"Loaded {len(notebooks)} notebooks from Excel")
         return notebooks
         
+    def load_from_columnar(self, path: str, fmt: str) -> List[Dict]:
+        """
+        Load notebooks data from a Parquet or Arrow file
+        Expected columns: notebook_name, source_url
+        """
+        notebooks = read_columnar(path, fmt)
+        
+        logger.info(f"Loaded {len(notebooks)} notebooks from {fmt.capitalize()}")
+        return notebooks
+        
     def load_from_json(self, json_path: str) -> List[Dict]:
         """
         Load notebooks data from JSON file
@@ -83,75 +120,535 @@ class BulkImporter:
         logger.info(f"Loaded {len(notebooks)} notebooks from JSON")
         return notebooks
         
-    async def import_notebooks(self, notebooks_data: List[Dict]) -> Dict:
-        """Import notebooks with progress tracking"""
+    async def deduplicate(self, notebooks_data: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Drop near-duplicate sources before any browser work
+
+        Returns:
+            Tuple of (deduplicated notebooks data, list of collapsed sources)
+        """
+        dedup_config = self.config.get('dedup', {})
+        deduplicator = SourceDeduplicator(
+            max_distance=dedup_config.get('max_distance', 3),
+            scope=dedup_config.get('scope', 'notebook'),
+            fetch_concurrency=dedup_config.get('fetch_concurrency', 8),
+            fetch_timeout=dedup_config.get('fetch_timeout', 15),
+            min_tokens=dedup_config.get('min_tokens', 20)
+        )
+        return await deduplicator.deduplicate(notebooks_data)
+        
+    async def import_notebook(self, notebook: Dict, worker: str = 'main',
+                              on_created: Optional[Callable[[str], None]] = None) -> NotebookResult:
+        """
+        Create one notebook and add its sources in batches
+        
+        A notebook with a 'notebook_url' was created by an earlier attempt; it
+        is reopened and only the sources it still lacks are added.
+        
+        Args:
+            notebook: Dictionary with 'name' and 'sources' keys
+            worker: Name the progress tracker shows this work under
+            on_created: Called with the new notebook's URL before sources are added
+            
+        Returns:
+            Result record; ok is True if the notebook was created and all its
+            sources were added
+        """
+        sources = notebook.get('sources', [])
+        record = NotebookResult(name=notebook['name'], source_type=notebook.get('source_type', 'url'),
+                                sources_total=len(sources), worker=worker)
+        started = time.monotonic()
+        
+        try:
+            if notebook.get('notebook_url'):
+                # Resume rather than create a second notebook
+                pending = await self.automation.resume_notebook(notebook['notebook_url'], notebook['name'], sources)
+                record.ok = True
+                record.sources_added = len(sources) - len(pending)
+                logger.info(f"Resuming {notebook['name']}: {len(pending)} of {len(sources)} sources to add")
+            else:
+                # Create notebook
+                pending = sources
+                record.ok = await self.automation.create_new_notebook(notebook['name'])
+                if not record.ok:
+                    record.fail('NotebookCreationFailed')
+                elif on_created:
+                    on_created(self.automation.page.url)
+            record.create_seconds = time.monotonic() - started
+            if record.ok:
+                record.notebook_id = notebook_id_from_url(self.automation.page.url)
+            
+            if record.ok and pending:
+                self.progress.set_worker(worker, 'adding sources', notebook['name'])
+                add_started = time.monotonic()
+                
+                # Add sources in batches
+                batch_size = self.config['bulk_operations']['batch_size']
+                for j in range(0, len(pending), batch_size):
+                    batch = pending[j:j+batch_size]
+                    if await self.automation.add_sources(batch, source_type=record.source_type):
+                        record.sources_added += len(batch)
+                    
+                    # Delay between batches
+                    if j + batch_size < len(pending):
+                        await asyncio.sleep(
+                            self.config['notebooklm']['delays']['between_bulk_ops']
+                        )
+                record.add_seconds = time.monotonic() - add_started
+            if record.ok and record.sources_added < record.sources_total:
+                record.fail('SourcesNotAdded')
+                
+        except Exception as e:
+            record.fail_with(e)
+            
+        record.total_seconds = time.monotonic() - started
+        record.finished_at = time.time()
+        return record
+        
+    async def import_notebooks(self, notebooks_data: List[Dict],
+                               checkpoint_path: Optional[str] = None) -> Dict:
+        """
+        Import notebooks with progress tracking
+        
+        Args:
+            notebooks_data: List of dictionaries with 'name' and 'sources' keys
+            checkpoint_path: File to record each completed notebook in
+        """
+        dashboard = self.dashboard()
+        try:
+            # Initialize browser and login if needed
+            await self.start_browser()
+            await dashboard.start()
+            return await self.import_loaded(notebooks_data, checkpoint_path)
+        finally:
+            await dashboard.stop()
+            await self.automation.close()
+            
+    def record_writer(self) -> Optional[RecordWriter]:
+        """Writer for per-notebook result records, if a results file is configured"""
+        path = self.config.get('results', {}).get('file')
+        return RecordWriter(path) if path else None
+        
+    def dashboard(self) -> ProgressDashboard:
+        """Terminal progress and optional HTTP status endpoint for this importer"""
+        progress_config = self.config.get('progress', {})
+        refresh_interval = progress_config.get('refresh_interval', 1)
+        return ProgressDashboard(
+            self.progress,
+            refresh_interval=refresh_interval if progress_config.get('enabled', True) else None,
+            log_interval=progress_config.get('log_interval', 30),
+            status_port=progress_config.get('status_port'),
+            status_host=progress_config.get('status_host', '127.0.0.1')
+        )
+        
+    async def start_browser(self):
+        """Open the browser with the configured profile and log in if needed"""
+        user_data_dir = self.config['browser'].get('user_data_dir')
+        await self.automation.init_browser(user_data_dir)
+        await self.automation.login_if_needed()
+        
+    async def import_loaded(self, notebooks_data: List[Dict],
+                            checkpoint_path: Optional[str] = None) -> Dict:
+        """
+        Import notebooks with an already started browser, leaving it open
+        
+        Args:
+            notebooks_data: List of dictionaries with 'name' and 'sources' keys
+            checkpoint_path: File to record each completed notebook in
+        """
         results = {
             'successful': [],
             'failed': [],
-            'total': len(notebooks_data)
+            'total': len(notebooks_data),
+            'uploads': [],
+            'records': []
         }
         
-        try:
-            # Initialize browser
-            user_data_dir = self.config['browser'].get('user_data_dir')
-            await self.automation.init_browser(user_data_dir)
-            
-            # Login if needed
-            await self.automation.login_if_needed()
-            
+        self.progress.add_work(len(notebooks_data),
+                               sum(len(nb.get('sources', [])) for nb in notebooks_data))
+        
+        # Local file notebooks are uploaded concurrently in their own tabs
+        file_notebooks = [nb for nb in notebooks_data if nb.get('source_type') == 'file']
+        notebooks_data = [nb for nb in notebooks_data if nb.get('source_type') != 'file']
+        
+        pipeline_tabs = self.config['bulk_operations'].get('pipeline_tabs', 1)
+        if pipeline_tabs > 1 and notebooks_data:
+            # Create the next notebook in another tab while sources ingest
+            records = await self.automation.pipelined_create_notebooks_with_sources(
+                notebooks_data,
+                tabs=pipeline_tabs,
+                batch_size=self.config['bulk_operations']['batch_size']
+            )
+            for record in records:
+                self.record_outcome(results, record, checkpoint_path)
+        else:
             # Process each notebook
             for i, notebook in enumerate(notebooks_data, 1):
                 name = notebook['name']
-                sources = notebook.get('sources', [])
                 
                 logger.info(f"[{i}/{len(notebooks_data)}] Processing: {name}")
+                self.progress.start(name)
+            
+                record = await self.import_notebook(notebook)
+                self.progress.finish(name, record.ok, record.sources_added)
+                self.record_outcome(results, record, checkpoint_path)
                 
-                try:
-                    # Create notebook
-                    success = await self.automation.create_new_notebook(name)
-                    
-                    if success and sources:
-                        # Add sources in batches
-                        batch_size = self.config['bulk_operations']['batch_size']
-                        for j in range(0, len(sources), batch_size):
-                            batch = sources[j:j+batch_size]
-                            await self.automation.add_sources(batch)
-                            
-                            # Delay between batches
-                            if j + batch_size < len(sources):
-                                await asyncio.sleep(
-                                    self.config['notebooklm']['delays']['between_bulk_ops']
-                                )
-                    
-                    if success:
-                        results['successful'].append(name)
-                        logger.info(f"✓ Successfully imported: {name}")
-                    else:
-                        results['failed'].append(name)
-                        logger.error(f"✗ Failed to import: {name}")
-                        
-                except Exception as e:
-                    results['failed'].append(name)
-                    logger.error(f"✗ Error importing {name}: {e}")
-                    
                 # Delay between notebooks
                 if i < len(notebooks_data):
                     await asyncio.sleep(
                         self.config['notebooklm']['delays']['between_bulk_ops']
                     )
+                
+        if file_notebooks:
+            logger.info(f"Uploading files for {len(file_notebooks)} notebooks...")
+            uploads = await self.automation.bulk_upload_files(
+                file_notebooks,
+                max_concurrent=self.config.get('uploads', {}).get('max_concurrent_notebooks', 3)
+            )
+            results['uploads'] = uploads
+            # One record per manifest entry, even when two share a name
+            for upload in uploads:
+                files = upload['files']
+                record = NotebookResult(
+                    name=upload['name'],
+                    source_type='file',
+                    notebook_id=notebook_id_from_url(upload['url']),
+                    sources_total=len(files),
+                    sources_added=sum(1 for item in files if item['ok']),
+                    create_seconds=upload['create_seconds'],
+                    add_seconds=upload['add_seconds'],
+                    total_seconds=upload['total_seconds']
+                )
+                if not upload['created']:
+                    record.fail('NotebookCreationFailed', upload['error'])
+                elif files and all(item['ok'] for item in files):
+                    record.ok = True
+                else:
+                    failed = [item for item in files if not item['ok']]
+                    record.fail('UploadFailed', failed[0]['error'] if failed else 'No files')
+                self.record_outcome(results, record, checkpoint_path)
+                    
+        if self.config.get('verification', {}).get('enabled'):
+            results['metrics'] = await self.verify_and_repair(notebooks_data, results['records'],
+                                                              checkpoint_path)
+            results['successful'] = [record.name for record in results['records'] if record.ok]
+            results['failed'] = [record.name for record in results['records'] if not record.ok]
+            
+        return results
+        
+    @staticmethod
+    def record_outcome(results: Dict, record: NotebookResult, checkpoint_path: Optional[str] = None):
+        """Add a notebook's result record to the run results and checkpoint it"""
+        results['records'].append(record)
+        if record.ok:
+            results['successful'].append(record.name)
+            if checkpoint_path:
+                record_completed(checkpoint_path, record.name)
+            logger.info(f"✓ Successfully imported: {record.name}")
+        else:
+            results['failed'].append(record.name)
+            detail = f"{record.error_class}: {record.error}" if record.error else record.error_class
+            logger.error(f"✗ Failed to import {record.name}: {detail}")
+        
+    async def verify_and_repair(self, notebooks_data: List[Dict],
+                                records: Optional[List[NotebookResult]] = None,
+                                checkpoint_path: Optional[str] = None) -> Dict:
+        """
+        Check imported notebooks against the manifest and re-add missing sources
+        
+        Repaired notebooks are checked again, and each verified record's ok and
+        error class are settled on its final source count.
+        
+        Args:
+            notebooks_data: URL/text notebooks that were imported this run
+            records: Result records to update with verified source counts and
+                repair attempts
+            checkpoint_path: File to record notebooks completed by the repair in
+            
+        Returns:
+            Verification metrics for the run report
+        """
+        verification = self.config.get('verification', {})
+        started = time.monotonic()
+        expectations = [
+            {'name': nb['name'], 'url': self.automation.notebook_urls[nb['name']],
+             'sources': nb.get('sources', [])}
+            for nb in notebooks_data
+            if nb['name'] in self.automation.notebook_urls
+            and nb.get('source_type', 'url') == 'url' and nb.get('sources')
+        ]
+        logger.info(f"Verifying {len(expectations)} notebooks...")
+        self.progress.set_worker('main', 'verifying')
+        reports = await self.automation.verify_notebooks(
+            expectations, max_concurrent=verification.get('max_concurrent', 3)
+        )
+        verify_seconds = time.monotonic() - started
+        
+        # Re-add only what is missing or failed, one notebook at a time
+        re_added = 0
+        batch_size = self.config['bulk_operations']['batch_size']
+        by_name = {record.name: record for record in records or []}
+        repaired = []
+        for expectation, report in zip(expectations, reports):
+            record = by_name.get(report['name'])
+            if report['error']:
+                # Re-adding everything to a notebook that couldn't be read would duplicate its sources
+                logger.warning(f"{report['name']}: could not verify sources, leaving as is: {report['error']}")
+                if record and record.ok:
+                    record.error_class = 'Unverified'
+                    record.error = report['error']
+                continue
+            to_add = report['missing'] + report['failed']
+            if record:
+                record.sources_added = report['expected'] - len(to_add)
+            if not to_add:
+                continue
+            logger.warning(f"{report['name']}: {len(to_add)} of {report['expected']} sources missing, re-adding")
+            if not verification.get('re_add', True):
+                continue
+            self.progress.retry(len(to_add))
+            self.progress.set_worker('main', 're-adding sources', report['name'])
+            if record:
+                record.attempts += 1
+            await self.automation.page.goto(report['url'])
+            await self.automation.page.wait_for_load_state('networkidle')
+            for j in range(0, len(to_add), batch_size):
+                if await self.automation.add_sources(to_add[j:j + batch_size]):
+                    re_added += len(to_add[j:j + batch_size])
+            repaired.append(expectation)
+                    
+        # Count again rather than trusting that every re-add went through
+        recount_errors = {}
+        if repaired:
+            self.progress.set_worker('main', 'verifying')
+            for report in await self.automation.verify_notebooks(
+                repaired, max_concurrent=verification.get('max_concurrent', 3)
+            ):
+                record = by_name.get(report['name'])
+                if report['error']:
+                    # Keep the count from before the repair
+                    logger.warning(f"{report['name']}: could not recount sources after repair: {report['error']}")
+                    recount_errors[report['name']] = report['error']
+                elif record:
+                    record.sources_added = report['expected'] - len(report['missing']) - len(report['failed'])
+        self.progress.set_worker('main', 'idle')
+        
+        # Same rule as import_notebook, so repaired notebooks lose their stale failure
+        for report in reports:
+            record = by_name.get(report['name'])
+            if record is None or report['error']:
+                continue
+            if record.sources_added < record.sources_total:
+                record.fail('SourcesNotAdded', recount_errors.get(record.name))
+            elif not record.ok:
+                record.ok, record.error_class, record.error = True, None, None
+                if checkpoint_path:
+                    record_completed(checkpoint_path, record.name)
+                    
+        metrics = {
+            'verified_notebooks': len(reports),
+            'unverified_notebooks': sum(1 for r in reports if r['error']),
+            'verify_seconds': round(verify_seconds, 3),
+            'verify_seconds_per_notebook': round(verify_seconds / len(reports), 3) if reports else 0.0,
+            'missing_sources': sum(len(r['missing']) for r in reports),
+            'failed_sources': sum(len(r['failed']) for r in reports),
+            'processing_sources': sum(len(r['processing']) for r in reports),
+            're_added_sources': re_added,
+            'repair_seconds': round(time.monotonic() - started - verify_seconds, 3)
+        }
+        logger.info(
+            f"Verification: {metrics['verified_notebooks']} notebooks in {metrics['verify_seconds']:.1f}s "
+            f"({metrics['unverified_notebooks']} unreadable), "
+            f"{metrics['missing_sources']} missing, {metrics['failed_sources']} failed, "
+            f"{metrics['re_added_sources']} re-added"
+        )
+        return metrics
+        
+    def open_queue(self, queue_url: str):
+        """Open the job queue described by queue_url with the configured timeouts"""
+        from job_queue import open_queue
+        
+        queue_config = self.config.get('queue', {})
+        return open_queue(
+            queue_url,
+            visibility_timeout=queue_config.get('visibility_timeout', 600),
+            max_attempts=queue_config.get('max_attempts', 3)
+        )
+        
+    async def _keep_lease(self, queue, job: Dict):
+        """Heartbeat a leased job until cancelled"""
+        interval = queue.visibility_timeout / 3
+        while True:
+            await asyncio.sleep(interval)
+            if not queue.heartbeat(job):
+                logger.warning(f"Lost lease on job {job['id']} ({job['payload']['name']})")
+                return
+                
+    async def run_worker(self, queue, worker_id: Optional[str] = None) -> Dict:
+        """
+        Lease notebook jobs from a shared queue and import them until it stays empty
+        
+        Args:
+            queue: JobQueue to lease from
+            worker_id: Name recorded on completed jobs (defaults to host-pid)
+            
+        Returns:
+            Results for the jobs this worker processed
+        """
+        queue_config = self.config.get('queue', {})
+        poll_interval = queue_config.get('poll_interval', 5)
+        idle_exit = queue_config.get('idle_exit', 60)
+        from job_queue import default_worker_id
+        
+        worker_id = worker_id or default_worker_id()
+        writer = self.record_writer()
+        results = {
+            'successful': [],
+            'failed': [],
+            'total': 0,
+            'uploads': [],
+            'records': []
+        }
+        
+        dashboard = self.dashboard()
+        try:
+            await self.start_browser()
+            await dashboard.start()
+            
+            idle_since = time.monotonic()
+            while True:
+                job = queue.lease(worker_id)
+                if job is None:
+                    if time.monotonic() - idle_since >= idle_exit:
+                        logger.info(f"Queue idle for {idle_exit}s, worker {worker_id} exiting")
+                        break
+                    await asyncio.sleep(poll_interval)
+                    continue
+                    
+                name = job['payload']['name']
+                sources = len(job['payload'].get('sources', []))
+                results['total'] += 1
+                logger.info(f"[{worker_id}] Leased {name} (attempt {job['attempts']})")
+                self.progress.add_work(1, sources)
+                if job['attempts'] > 1:
+                    self.progress.retry()
+                self.progress.start(name, worker_id)
+                
+                # Remember the notebook on the job, so a retry adds to it instead of creating another
+                keeper = asyncio.ensure_future(self._keep_lease(queue, job))
+                try:
+                    record = await self.import_notebook(
+                        job['payload'], worker_id,
+                        on_created=lambda url: queue.update_payload(job, {'notebook_url': url})
+                    )
+                finally:
+                    keeper.cancel()
+                record.attempts = job['attempts']
+                self.progress.finish(name, record.ok, record.sources_added, worker_id)
+                    
+                if record.ok and not queue.complete(job, {'worker': worker_id}):
+                    logger.warning(f"Lease on {name} expired before completion; result discarded")
+                    record.fail('LeaseLost', 'Lease expired before the job was completed')
+                elif not record.ok:
+                    queue.fail(job, f"{record.error_class}: {record.error}" if record.error else record.error_class)
+                self.record_outcome(results, record)
+                if writer:
+                    writer.write([record])
                     
+                idle_since = time.monotonic()
+                
         finally:
+            await dashboard.stop()
             await self.automation.close()
             
         return results
         
-    async def run(self, data_source: str, file_path: str):
+    async def watch(self, inbox: str):
         """
-        Run the bulk import
+        Import manifests as they are dropped into an inbox directory
+        
+        The browser stays open and logged in between files. Each manifest is
+        moved to inbox/done or inbox/failed with a .result.json report.
         
         Args:
-            data_source: Type of data source ('csv', 'excel', 'json')
-            file_path: Path to the data file
+            inbox: Directory to watch for manifests
+        """
+        watch_config = self.config.get('watch', {})
+        watcher = InboxWatcher(
+            inbox,
+            poll_interval=watch_config.get('poll_interval', 2),
+            settle_seconds=watch_config.get('settle_seconds', 1),
+            use_events=watch_config.get('use_events', True)
+        )
+        checkpoint_path = self.config.get('sharding', {}).get('checkpoint_file', 'checkpoint.jsonl')
+        writer = self.record_writer()
+        
+        dashboard = self.dashboard()
+        try:
+            await self.start_browser()
+            await dashboard.start()
+            
+            async for path in watcher.files():
+                logger.info(f"New manifest: {path.name}")
+                started = time.monotonic()
+                try:
+                    notebooks_data, collapsed = await self.prepare(source_type_for(path), str(path))
+                    report = await self.import_loaded(notebooks_data, checkpoint_path)
+                    report['deduplicated'] = collapsed
+                    if writer:
+                        writer.write(report['records'])
+                    report['records'] = [record.to_dict() for record in report['records']]
+                    ok = not report['failed']
+                except Exception as e:
+                    report = {'error': f"{e.__class__.__name__}: {e}"}
+                    ok = False
+                    logger.error(f"✗ Error importing {path.name}: {e}")
+                    
+                    # A dead page would fail every later file too, so start fresh
+                    await self.restart_browser(watch_config.get('restart_delay', 10))
+                    
+                report['seconds'] = round(time.monotonic() - started, 3)
+                target = watcher.move(path, ok, report)
+                logger.info(f"{'✓' if ok else '✗'} {path.name} -> {target} ({report['seconds']:.1f}s)")
+                
+        finally:
+            await dashboard.stop()
+            await self.automation.close()
+            
+    async def restart_browser(self, delay: float = 10, max_delay: float = 300):
+        """
+        Close and relaunch the browser, retrying with exponential backoff
+        
+        Used by long-running modes, which should wait out a failed relaunch
+        (e.g. a network outage during login) instead of exiting.
+        """
+        while True:
+            try:
+                await self.automation.close()
+            except Exception as e:
+                logger.debug(f"Error closing browser before restart: {e}")
+            try:
+                await self.start_browser()
+                return
+            except Exception as e:
+                logger.error(f"Browser restart failed, retrying in {delay:.0f}s: {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, max_delay)
+                
+    def plan(self, notebooks_data: List[Dict]) -> List[Dict]:
+        """Split notebooks over the source cap into overflow notebooks and log the plan"""
+        max_sources = self.config['notebooklm'].get('max_sources_per_notebook', 50)
+        group_by = self.config['bulk_operations'].get('overflow_group_by')
+        plan = plan_notebooks(notebooks_data, max_sources, group_by)
+        log_plan(plan, max_sources)
+        return plan
+        
+    async def prepare(self, data_source: str, file_path: str) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Load, deduplicate and plan notebooks without touching the browser
+        
+        Returns:
+            Tuple of (planned notebooks, list of collapsed duplicate sources)
         """
         # Load data based on source type
         if data_source == 'csv':
@@ -160,11 +657,72 @@ class BulkImporter:
             notebooks_data = self.load_from_excel(file_path)
         elif data_source == 'json':
             notebooks_data = self.load_from_json(file_path)
+        elif data_source in ('parquet', 'arrow'):
+            notebooks_data = self.load_from_columnar(file_path, data_source)
         else:
             raise ValueError(f"Unsupported data source: {data_source}")
             
-        # Import notebooks
-        results = await self.import_notebooks(notebooks_data)
+        # Collapse near-duplicate sources
+        collapsed = []
+        if self.config.get('dedup', {}).get('enabled'):
+            notebooks_data, collapsed = await self.deduplicate(notebooks_data)
+            
+        # Split notebooks that exceed the source cap before opening the browser
+        notebooks_data = self.plan(notebooks_data)
+        return notebooks_data, collapsed
+        
+    async def enqueue(self, data_source: str, file_path: str, queue_url: str) -> int:
+        """
+        Prepare a manifest and add its notebooks to a shared job queue
+        
+        Returns:
+            Number of newly enqueued notebooks
+        """
+        notebooks_data, _ = await self.prepare(data_source, file_path)
+        added = self.open_queue(queue_url).enqueue(notebooks_data)
+        logger.info(f"Enqueued {added} notebooks ({len(notebooks_data) - added} already queued)")
+        return added
+        
+    async def run(self, data_source: str, file_path: str, plan_only: bool = False,
+                  resume: bool = False):
+        """
+        Run the bulk import
+        
+        Args:
+            data_source: Type of data source ('csv', 'excel', 'json', 'parquet', 'arrow')
+            file_path: Path to the data file
+            plan_only: Report the import plan without starting the browser
+            resume: Skip notebooks already recorded in the checkpoint
+        """
+        notebooks_data, collapsed = await self.prepare(data_source, file_path)
+        if plan_only:
+            return {'plan': notebooks_data, 'deduplicated': collapsed}
+            
+        sharding = self.config.get('sharding', {})
+        checkpoint_path = sharding.get('checkpoint_file', 'checkpoint.jsonl')
+        if resume:
+            # A sharded run killed before merging has its progress only in the shard files
+            completed = load_completed([checkpoint_path, *shard_checkpoints(checkpoint_path)])
+            notebooks_data = [nb for nb in notebooks_data if nb['name'] not in completed]
+            logger.info(f"Resuming: skipping {len(completed)} completed notebooks")
+            
+        # Import notebooks, one process per browser profile when several are given
+        profiles = sharding.get('profiles') or []
+        if len(profiles) > 1:
+            # Process pools are only needed for sharded runs
+            from sharding import import_sharded
+            
+            results = await import_sharded(self.config, notebooks_data, profiles, checkpoint_path)
+        else:
+            if profiles:
+                self.config['browser']['user_data_dir'] = profiles[0]
+            results = await self.import_notebooks(notebooks_data, checkpoint_path=checkpoint_path)
+        results['deduplicated'] = collapsed
+        
+        writer = self.record_writer()
+        if writer:
+            written = writer.write(results['records'])
+            logger.info(f"Wrote {written} result records to {writer.path} (run {writer.run_id})")
         
         # Print summary
         logger.info("\n" + "="*50)
@@ -173,7 +731,48 @@ class BulkImporter:
         logger.info(f"Total notebooks: {results['total']}")
         logger.info(f"Successful: {len(results['successful'])}")
         logger.info(f"Failed: {len(results['failed'])}")
+        if 'shards' not in results:
+            logger.info(f"Throughput: {summary_line(self.progress.snapshot())}")
+        stats = summarize(results['records'])
+        if stats['successful']:
+            logger.info(
+                f"Mean per notebook: create {stats['mean_create_seconds']:.1f}s, "
+                f"add sources {stats['mean_add_seconds']:.1f}s, total {stats['mean_total_seconds']:.1f}s"
+            )
+        if stats['errors']:
+            by_count = sorted(stats['errors'].items(), key=lambda item: -item[1])
+            logger.info("Failures by error class: " + ", ".join(
+                f"{error_class} {count}" for error_class, count in by_count
+            ))
         
+        metrics = results.get('metrics', {})
+        if metrics:
+            logger.info(
+                f"Verified: {metrics['verified_notebooks']} notebooks in {metrics['verify_seconds']:.1f}s "
+                f"({metrics['unverified_notebooks']} unreadable, "
+                f"{metrics['missing_sources']} missing, {metrics['failed_sources']} failed, "
+                f"{metrics['re_added_sources']} re-added)"
+            )
+            
+        for i, shard in enumerate(results.get('shards', [])):
+            logger.info(
+                f"Shard {i} ({shard['profile']}): {shard['successful']}/{shard['notebooks']} "
+                f"successful, estimated {shard['estimated_seconds'] / 60:.1f} min"
+            )
+            
+        if results['uploads']:
+            logger.info("\nFile uploads:")
+            for upload in results['uploads']:
+                for item in upload['files']:
+                    status = "✓" if item['ok'] else "✗"
+                    detail = f"{item['seconds']:.1f}s" if item['ok'] else item['error']
+                    logger.info(f"  {status} [{upload['name']}] {item['file']} ({detail})")
+                    
+        if collapsed:
+            logger.info(f"\nCollapsed {len(collapsed)} near-duplicate sources:")
+            for item in collapsed:
+                logger.info(f"  - [{item['notebook']}] {item['source']} -> {item['duplicate_of']}")
+                
         if results['failed']:
             logger.info("\nFailed imports:")
             for name in results['failed']:
@@ -182,6 +781,22 @@ class BulkImporter:
         return results
 
 
+def log_queue_summary(summary: Dict):
+    """Log progress of a shared job queue"""
+    total = sum(summary[state] for state in ('pending', 'leased', 'done', 'failed'))
+    logger.info("="*50)
+    logger.info("QUEUE STATUS")
+    logger.info("="*50)
+    logger.info(f"Total jobs: {total}")
+    for state in ('pending', 'leased', 'done', 'failed'):
+        logger.info(f"{state.capitalize()}: {summary[state]}")
+    logger.info(f"Completed in the last 5 minutes: {summary['done_per_minute']:.1f}/min")
+    if summary['workers']:
+        logger.info("Completed per worker:")
+        for worker, count in sorted(summary['workers'].items(), key=lambda item: -item[1]):
+            logger.info(f"  - {worker}: {count}")
+            
+            
 def create_sample_files():
     """Create sample data files for testing"""
     
@@ -224,22 +839,28 @@ Web Development,https://vuejs.org/"""
     with open('sample_notebooks.json', 'w') as f:
         json.dump(json_data, f, indent=2)
         
-    # Sample Excel (requires pandas)
-    df = pd.DataFrame({
-        'notebook_name': [
-            'Cloud Computing', 'Cloud Computing', 'Cloud Computing',
-            'DevOps', 'DevOps', 'DevOps'
-        ],
-        'source_url': [
-            'https://aws.amazon.com/documentation/',
-            'https://cloud.google.com/docs',
-            'https://docs.microsoft.com/en-us/azure/',
-            'https://docs.docker.com/',
-            'https://kubernetes.io/docs/',
-            'https://docs.github.com/en/actions'
-        ]
-    })
-    df.to_excel('sample_notebooks.xlsx', index=False)
+    # Sample Excel (requires openpyxl)
+    try:
+        from openpyxl import Workbook
+    except ImportError:
+        logger.info("Created sample files: sample_notebooks.csv, sample_notebooks.json "
+                    "(install openpyxl for sample_notebooks.xlsx)")
+        return
+        
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.title = 'Sheet1'
+    sheet.append(['notebook_name', 'source_url'])
+    for row in [
+        ('Cloud Computing', 'https://aws.amazon.com/documentation/'),
+        ('Cloud Computing', 'https://cloud.google.com/docs'),
+        ('Cloud Computing', 'https://docs.microsoft.com/en-us/azure/'),
+        ('DevOps', 'https://docs.docker.com/'),
+        ('DevOps', 'https://kubernetes.io/docs/'),
+        ('DevOps', 'https://docs.github.com/en/actions')
+    ]:
+        sheet.append(row)
+    workbook.save('sample_notebooks.xlsx')
     
     logger.info("Created sample files: sample_notebooks.csv, sample_notebooks.json, sample_notebooks.xlsx")
 
@@ -249,12 +870,45 @@ async def main():
     import argparse
     
     parser = argparse.ArgumentParser(description='Bulk import notebooks to NotebookLM')
-    parser.add_argument('--source', choices=['csv', 'excel', 'json'], 
+    parser.add_argument('--source', choices=['csv', 'excel', 'json', 'parquet', 'arrow'], 
                        default='csv', help='Data source type')
     parser.add_argument('--file', required=False, help='Path to data file')
     parser.add_argument('--config', default='config.yaml', help='Path to config file')
     parser.add_argument('--create-samples', action='store_true', 
                        help='Create sample data files')
+    parser.add_argument('--plan-only', action='store_true',
+                       help='Print the import plan and exit without opening the browser')
+    parser.add_argument('--group-by', choices=['domain', 'path'],
+                       help='Keep sources from the same domain or URL path together when splitting')
+    parser.add_argument('--profiles', nargs='+', metavar='USER_DATA_DIR',
+                       help='Browser profiles to shard the import across, one process each')
+    parser.add_argument('--resume', action='store_true',
+                       help='Skip notebooks recorded as completed in the checkpoint file')
+    parser.add_argument('--pipeline-tabs', type=int,
+                       help='Tabs to rotate across so notebooks are created while others ingest')
+    parser.add_argument('--queue', metavar='URL',
+                       help='Shared job queue: sqlite:<file> or dir:<directory>')
+    parser.add_argument('--enqueue', action='store_true',
+                       help='Add the manifest\'s notebooks to --queue instead of importing')
+    parser.add_argument('--worker', action='store_true',
+                       help='Import notebooks leased from --queue until it stays empty')
+    parser.add_argument('--worker-id', help='Worker name recorded on completed jobs')
+    parser.add_argument('--queue-status', action='store_true',
+                       help='Print progress of the jobs in --queue')
+    parser.add_argument('--watch', metavar='INBOX_DIR',
+                       help='Keep running and import manifests as they are dropped into INBOX_DIR')
+    parser.add_argument('--results', metavar='FILE',
+                       help='Append per-notebook result records to FILE (.jsonl or .parquet)')
+    parser.add_argument('--status-port', type=int,
+                       help='Serve live progress as JSON on http://127.0.0.1:PORT/status')
+    parser.add_argument('--verify', action='store_true',
+                       help='Check every notebook\'s sources after import and re-add missing ones')
+    parser.add_argument('--rpc-replay', action='store_true',
+                       help='Replay recorded backend requests instead of clicking through the UI')
+    parser.add_argument('--dedup', action='store_true',
+                       help='Drop near-duplicate sources before importing')
+    parser.add_argument('--dedup-scope', choices=['notebook', 'manifest'],
+                       help='Dedup within each notebook or across the whole manifest')
     
     args = parser.parse_args()
     
@@ -262,13 +916,50 @@ async def main():
         create_sample_files()
         return
         
-    if not args.file:
+    if (args.enqueue or args.worker or args.queue_status) and not args.queue:
+        parser.error('--enqueue, --worker and --queue-status require --queue')
+        
+    if args.queue_status:
+        importer = BulkImporter(args.config)
+        log_queue_summary(importer.open_queue(args.queue).summary())
+        return
+        
+    # Apply command line overrides to the config
+    config = BulkImporter.load_config(args.config)
+    if args.dedup or args.dedup_scope:
+        config.setdefault('dedup', {})['enabled'] = True
+    if args.dedup_scope:
+        config['dedup']['scope'] = args.dedup_scope
+    if args.group_by:
+        config['bulk_operations']['overflow_group_by'] = args.group_by
+    if args.profiles:
+        config.setdefault('sharding', {})['profiles'] = args.profiles
+    if args.rpc_replay:
+        config['notebooklm']['rpc_replay'] = True
+    if args.verify:
+        config.setdefault('verification', {})['enabled'] = True
+    if args.pipeline_tabs:
+        config['bulk_operations']['pipeline_tabs'] = args.pipeline_tabs
+    if args.status_port:
+        config.setdefault('progress', {})['status_port'] = args.status_port
+    if args.results:
+        config.setdefault('results', {})['file'] = args.results
+        
+    if args.worker:
+        importer = BulkImporter(config=config)
+        results = await importer.run_worker(importer.open_queue(args.queue), args.worker_id)
+        logger.info(f"Worker done: {len(results['successful'])} imported, {len(results['failed'])} failed")
+        return
+        
+    if not args.file and not args.watch:
         # Use default sample file based on source type
         file_map = {
             'csv': 'sample_notebooks.csv',
             'excel': 'sample_notebooks.xlsx',
             'json': 'sample_notebooks.json'
         }
+        if args.source not in file_map:
+            parser.error(f'--file is required for --source {args.source}')
         args.file = file_map[args.source]
         
         if not Path(args.file).exists():
@@ -277,8 +968,14 @@ async def main():
             return
             
     # Run bulk import
-    importer = BulkImporter(args.config)
-    await importer.run(args.source, args.file)
+    importer = BulkImporter(config=config)
+    if args.watch:
+        await importer.watch(args.watch)
+        return
+    if args.enqueue:
+        await importer.enqueue(args.source, args.file, args.queue)
+        return
+    await importer.run(args.source, args.file, plan_only=args.plan_only, resume=args.resume)
 
 
 if __name__ == '__main__':
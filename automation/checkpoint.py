@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Import checkpoints for NotebookLM bulk runs
+Each completed notebook is appended as one JSON line, so an interrupted run
+can resume without recreating notebooks that already exist
+"""
+
+import json
+import time
+from pathlib import Path
+from typing import Iterable, List, Set
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def record_completed(checkpoint_path: str, name: str):
+    """Append a completed notebook to a checkpoint file"""
+    path = Path(checkpoint_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'a') as f:
+        f.write(json.dumps({'name': name, 'completed_at': time.time()}) + '\n')
+        f.flush()
+
+
+def shard_checkpoint_path(checkpoint_path: str, index: int) -> str:
+    """Checkpoint file a shard writes to before its progress is merged"""
+    checkpoint = Path(checkpoint_path)
+    return str(checkpoint.with_name(f"{checkpoint.stem}.shard-{index}{checkpoint.suffix}"))
+
+
+def shard_checkpoints(checkpoint_path: str) -> List[str]:
+    """Unmerged shard checkpoint files left next to a checkpoint, e.g. by a killed sharded run"""
+    checkpoint = Path(checkpoint_path)
+    return sorted(str(p) for p in checkpoint.parent.glob(f"{checkpoint.stem}.shard-*{checkpoint.suffix}"))
+
+
+def load_completed(checkpoint_paths: Iterable[str]) -> Set[str]:
+    """Names of notebooks recorded as completed in any of the checkpoint files"""
+    completed = set()
+    for checkpoint_path in checkpoint_paths:
+        path = Path(checkpoint_path)
+        if not path.exists():
+            continue
+        with open(path, 'r') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    completed.add(json.loads(line)['name'])
+                except (ValueError, KeyError):
+                    # A torn last line from a killed process
+                    logger.warning(f"Ignoring malformed checkpoint line in {path}")
+    return completed
+
+
+def merge_checkpoints(checkpoint_paths: Iterable[str], merged_path: str) -> int:
+    """
+    Fold several checkpoint files into one and remove the originals
+
+    Returns:
+        Number of completed notebooks in the merged checkpoint
+    """
+    paths = [Path(p) for p in checkpoint_paths if Path(p) != Path(merged_path)]
+    completed = load_completed([merged_path, *paths])
+
+    merged = Path(merged_path)
+    merged.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = merged.with_suffix(merged.suffix + '.tmp')
+    with open(tmp_path, 'w') as f:
+        for name in sorted(completed):
+            f.write(json.dumps({'name': name}) + '\n')
+    tmp_path.replace(merged)
+
+    for path in paths:
+        if path.exists():
+            path.unlink()
+    return len(completed)
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Near-duplicate detection for NotebookLM sources
+Fetches page text, fingerprints it with SimHash and collapses near-duplicates
+before they are pasted into a notebook
+"""
+
+import asyncio
+import hashlib
+import re
+from html.parser import HTMLParser
+from typing import List, Dict, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+FINGERPRINT_BITS = 64
+TOKEN_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+
+class _TextExtractor(HTMLParser):
+    """Collect visible text from an HTML document"""
+
+    SKIP_TAGS = {'script', 'style', 'noscript', 'template', 'svg', 'head'}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: List[str] = []
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS:
+            self._skip_depth += 1
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self.parts.append(data)
+
+
+def extract_text(html: str) -> str:
+    """Strip markup and return the visible text of an HTML page"""
+    parser = _TextExtractor()
+    parser.feed(html)
+    parser.close()
+    return ' '.join(parser.parts)
+
+
+def simhash(text: str, shingle_size: int = 3) -> int:
+    """
+    Compute a 64-bit SimHash fingerprint of a text
+
+    Args:
+        text: Page text
+        shingle_size: Number of consecutive words hashed together
+
+    Returns:
+        Fingerprint as an integer
+    """
+    tokens = [t.lower() for t in TOKEN_PATTERN.findall(text)]
+    if len(tokens) < shingle_size:
+        shingles = [' '.join(tokens)] if tokens else []
+    else:
+        shingles = [
+            ' '.join(tokens[i:i + shingle_size])
+            for i in range(len(tokens) - shingle_size + 1)
+        ]
+
+    weights: Dict[str, int] = {}
+    for shingle in shingles:
+        weights[shingle] = weights.get(shingle, 0) + 1
+
+    vector = [0] * FINGERPRINT_BITS
+    for shingle, weight in weights.items():
+        digest = hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest()
+        value = int.from_bytes(digest, 'big')
+        for bit in range(FINGERPRINT_BITS):
+            if value >> bit & 1:
+                vector[bit] += weight
+            else:
+                vector[bit] -= weight
+
+    fingerprint = 0
+    for bit in range(FINGERPRINT_BITS):
+        if vector[bit] > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Number of differing bits between two fingerprints"""
+    return bin(a ^ b).count('1')
+
+
+class SimHashIndex:
+    """
+    Banded SimHash index for near-duplicate lookups
+
+    The fingerprint is split into max_distance + 1 bands. Two fingerprints
+    within max_distance bits must agree on at least one whole band, so a
+    lookup only compares against fingerprints sharing a band instead of
+    scanning every page seen so far.
+    """
+
+    def __init__(self, max_distance: int = 3):
+        """
+        Args:
+            max_distance: Largest Hamming distance treated as a duplicate
+        """
+        self.max_distance = max_distance
+        self.num_bands = max_distance + 1
+        self.band_width = -(-FINGERPRINT_BITS // self.num_bands)
+        self._band_mask = (1 << self.band_width) - 1
+        self._bands: List[Dict[int, List[int]]] = [{} for _ in range(self.num_bands)]
+        self._fingerprints: List[int] = []
+        self._keys: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _band_values(self, fingerprint: int) -> List[int]:
+        return [
+            (fingerprint >> (band * self.band_width)) & self._band_mask
+            for band in range(self.num_bands)
+        ]
+
+    def find(self, fingerprint: int) -> Optional[str]:
+        """Return the key of an indexed near-duplicate, or None"""
+        checked = set()
+        for band, value in enumerate(self._band_values(fingerprint)):
+            for position in self._bands[band].get(value, ()):
+                if position in checked:
+                    continue
+                checked.add(position)
+                if hamming_distance(fingerprint, self._fingerprints[position]) <= self.max_distance:
+                    return self._keys[position]
+        return None
+
+    def add(self, key: str, fingerprint: int):
+        """Index a fingerprint under the given key"""
+        position = len(self._keys)
+        self._keys.append(key)
+        self._fingerprints.append(fingerprint)
+        for band, value in enumerate(self._band_values(fingerprint)):
+            self._bands[band].setdefault(value, []).append(position)
+
+
+class SourceDeduplicator:
+    """Drop near-duplicate URL sources from bulk import data"""
+
+    def __init__(self, max_distance: int = 3, scope: str = 'notebook',
+                 fetch_concurrency: int = 8, fetch_timeout: float = 15.0,
+                 min_tokens: int = 20):
+        """
+        Args:
+            max_distance: Largest SimHash Hamming distance treated as a duplicate
+            scope: 'notebook' to dedup within each notebook, 'manifest' to dedup
+                across every notebook in the import
+            fetch_concurrency: Number of pages fetched in parallel
+            fetch_timeout: Per-page fetch timeout in seconds
+            min_tokens: Pages with less text than this are never collapsed
+        """
+        if scope not in ('notebook', 'manifest'):
+            raise ValueError(f"Unsupported dedup scope: {scope}")
+        self.max_distance = max_distance
+        self.scope = scope
+        self.fetch_concurrency = fetch_concurrency
+        self.fetch_timeout = fetch_timeout
+        self.min_tokens = min_tokens
+
+    async def fetch_fingerprints(self, urls: List[str]) -> Dict[str, Optional[int]]:
+        """
+        Fetch each URL and fingerprint its text
+
+        Returns:
+            Dictionary of URL to fingerprint (None if the page could not be used)
+        """
+        import httpx
+
+        semaphore = asyncio.Semaphore(self.fetch_concurrency)
+        fingerprints: Dict[str, Optional[int]] = {}
+
+        async def fetch(client, url: str):
+            async with semaphore:
+                try:
+                    response = await client.get(url)
+                    response.raise_for_status()
+                    text = extract_text(response.text)
+                except Exception as e:
+                    logger.warning(f"Could not fetch {url} for dedup: {e}")
+                    fingerprints[url] = None
+                    return
+            # Hash outside the semaphore so CPU work doesn't hold a fetch slot
+            if len(TOKEN_PATTERN.findall(text)) < self.min_tokens:
+                fingerprints[url] = None
+            else:
+                fingerprints[url] = simhash(text)
+
+        async with httpx.AsyncClient(follow_redirects=True,
+                                     timeout=self.fetch_timeout) as client:
+            await asyncio.gather(*(fetch(client, url) for url in urls))
+
+        return fingerprints
+
+    def collapse(self, notebooks_data: List[Dict],
+                 fingerprints: Dict[str, Optional[int]]) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Remove near-duplicate sources using precomputed fingerprints
+
+        Args:
+            notebooks_data: List of dictionaries with 'name' and 'sources' keys
+            fingerprints: URL to fingerprint mapping from fetch_fingerprints
+
+        Returns:
+            Tuple of (deduplicated notebooks data, list of collapsed sources
+            with 'notebook', 'source' and 'duplicate_of' keys)
+        """
+        collapsed = []
+        deduped = []
+        shared_index = SimHashIndex(self.max_distance)
+        shared_seen: Dict[str, str] = {}
+
+        for notebook in notebooks_data:
+            if self.scope == 'manifest':
+                index, seen = shared_index, shared_seen
+            else:
+                index, seen = SimHashIndex(self.max_distance), {}
+
+            kept = []
+            for source in notebook.get('sources', []):
+                duplicate_of = seen.get(source)
+                fingerprint = fingerprints.get(source)
+                if duplicate_of is None and fingerprint is not None:
+                    duplicate_of = index.find(fingerprint)
+
+                if duplicate_of is not None:
+                    collapsed.append({
+                        'notebook': notebook['name'],
+                        'source': source,
+                        'duplicate_of': duplicate_of
+                    })
+                    continue
+
+                seen[source] = source
+                if fingerprint is not None:
+                    index.add(source, fingerprint)
+                kept.append(source)
+
+            deduped.append({**notebook, 'sources': kept})
+
+        return deduped, collapsed
+
+    async def deduplicate(self, notebooks_data: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Fetch, fingerprint and collapse near-duplicate sources
+
+        Args:
+            notebooks_data: List of dictionaries with 'name' and 'sources' keys
+
+        Returns:
+            Tuple of (deduplicated notebooks data, list of collapsed sources)
+        """
+        urls = list(dict.fromkeys(
+            source
+            for notebook in notebooks_data
+            for source in notebook.get('sources', [])
+            if isinstance(source, str) and source.startswith(('http://', 'https://'))
+        ))
+        logger.info(f"Fingerprinting {len(urls)} unique URLs for dedup...")
+        fingerprints = await self.fetch_fingerprints(urls)
+
+        deduped, collapsed = self.collapse(notebooks_data, fingerprints)
+        logger.info(f"Dedup ({self.scope} scope) collapsed {len(collapsed)} sources")
+        return deduped, collapsed
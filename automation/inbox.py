@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Inbox directory watching for continuous NotebookLM imports
+New manifest files are picked up as soon as they finish being written, using
+filesystem events (inotify via watchdog) when available and polling otherwise
+"""
+
+import asyncio
+import json
+import time
+from pathlib import Path
+from typing import AsyncIterator, Dict, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Manifest suffix -> --source type
+SOURCE_TYPES = {
+    '.csv': 'csv',
+    '.json': 'json',
+    '.xlsx': 'excel',
+    '.parquet': 'parquet',
+    '.arrow': 'arrow',
+    '.feather': 'arrow'
+}
+
+
+def source_type_for(path: Path) -> Optional[str]:
+    """Data source type for a manifest file, or None if it isn't one"""
+    return SOURCE_TYPES.get(path.suffix.lower())
+
+
+class InboxWatcher:
+    """Yield manifest files dropped into an inbox directory, oldest first"""
+
+    def __init__(self, inbox: str, poll_interval: float = 2.0, settle_seconds: float = 1.0,
+                 use_events: bool = True):
+        """
+        Args:
+            inbox: Directory upstream systems drop manifests into
+            poll_interval: Seconds between directory scans without filesystem events
+            settle_seconds: A file must be unmodified this long before it is read,
+                so half-written files are never imported
+            use_events: Use watchdog filesystem events if it is installed
+        """
+        self.inbox = Path(inbox)
+        self.done_dir = self.inbox / 'done'
+        self.failed_dir = self.inbox / 'failed'
+        self.poll_interval = poll_interval
+        self.settle_seconds = settle_seconds
+        self.use_events = use_events
+        self._wake: Optional[asyncio.Event] = None
+        self._observer = None
+        self._yielded = set()
+
+        for folder in (self.inbox, self.done_dir, self.failed_dir):
+            folder.mkdir(parents=True, exist_ok=True)
+
+    def _start_observer(self) -> bool:
+        """Wake the scan loop on filesystem events; False if watchdog isn't installed"""
+        try:
+            from watchdog.events import FileSystemEventHandler
+            from watchdog.observers import Observer
+        except ImportError:
+            logger.info("watchdog not installed, polling the inbox instead")
+            return False
+
+        loop = asyncio.get_running_loop()
+        wake = self._wake
+
+        class Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                if not event.is_directory:
+                    loop.call_soon_threadsafe(wake.set)
+
+        self._observer = Observer()
+        self._observer.schedule(Handler(), str(self.inbox), recursive=False)
+        self._observer.start()
+        return True
+
+    def _candidates(self) -> Dict[Path, float]:
+        """Manifest files in the inbox with their modification times"""
+        files = {}
+        for path in self.inbox.iterdir():
+            if path.name.startswith('.') or source_type_for(path) is None:
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            if path.is_file():
+                files[path] = stat.st_mtime
+        return files
+
+    async def files(self) -> AsyncIterator[Path]:
+        """
+        Yield each settled manifest once, then keep waiting for more
+
+        Files already in the inbox at startup are yielded first. The caller is
+        expected to move each file out (see move()) before asking for the next.
+        """
+        self._wake = asyncio.Event()
+        events = self.use_events and self._start_observer()
+        logger.info(f"Watching {self.inbox} ({'filesystem events' if events else 'polling'})")
+
+        try:
+            while True:
+                self._wake.clear()
+                now = time.time()
+                waiting = []
+                candidates = self._candidates()
+                # Forget files that were moved or deleted, so a long-running watch stays small
+                self._yielded.intersection_update(candidates.items())
+                for path, mtime in sorted(candidates.items(), key=lambda item: item[1]):
+                    age = now - mtime
+                    if (path, mtime) in self._yielded:
+                        # Left in place by the caller; don't import it twice
+                        continue
+                    if age >= self.settle_seconds:
+                        self._yielded.add((path, mtime))
+                        yield path
+                    else:
+                        waiting.append(self.settle_seconds - age)
+
+                if waiting:
+                    timeout = min(waiting)
+                elif events:
+                    # Events do the work; the long timeout only guards against missed ones
+                    timeout = max(self.poll_interval, 30)
+                else:
+                    timeout = self.poll_interval
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            if self._observer is not None:
+                self._observer.stop()
+                self._observer.join()
+                self._observer = None
+
+    def move(self, path: Path, ok: bool, report: Optional[Dict] = None) -> Path:
+        """
+        Move a processed manifest to done/ or failed/, with its report alongside
+
+        Returns:
+            The manifest's new path
+        """
+        folder = self.done_dir if ok else self.failed_dir
+        target = folder / path.name
+        if target.exists():
+            target = folder / f"{path.stem}.{time.strftime('%Y%m%d-%H%M%S')}{path.suffix}"
+        path.replace(target)
+        self._yielded = {entry for entry in self._yielded if entry[0] != path}
+
+        if report is not None:
+            with open(target.with_name(target.name + '.result.json'), 'w') as f:
+                json.dump(report, f, indent=2, default=str)
+        return target
@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""
+Job queue for distributed NotebookLM imports
+Producers enqueue one job per notebook; workers on any machine lease jobs with
+a visibility timeout, keep them alive with heartbeats and acknowledge them with
+their lease token, so an expired or stolen lease can't be completed twice
+"""
+
+import hashlib
+import json
+import os
+import socket
+import sqlite3
+import time
+import uuid
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import List, Dict, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def job_id_for(notebook: Dict) -> str:
+    """Stable id for a notebook job, so enqueueing the same manifest twice is a no-op"""
+    key = json.dumps([notebook['name'], notebook.get('sources', [])], sort_keys=True)
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+def _mtime(path: Path) -> float:
+    try:
+        return path.stat().st_mtime
+    except FileNotFoundError:
+        return 0.0
+
+
+class JobQueue(ABC):
+    """
+    Interface shared by the queue backends
+
+    A leased job is a dictionary with 'id', 'payload', 'attempts' and
+    'lease_token'. complete(), fail(), heartbeat() and update_payload() only
+    succeed while the caller still holds the lease identified by that token.
+    """
+
+    def __init__(self, visibility_timeout: float = 600, max_attempts: int = 3):
+        """
+        Args:
+            visibility_timeout: Seconds a lease lasts without a heartbeat
+            max_attempts: Leases per job before it is marked failed
+        """
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+
+    @abstractmethod
+    def enqueue(self, notebooks: List[Dict]) -> int:
+        """Add notebook jobs, returning how many were new"""
+
+    @abstractmethod
+    def lease(self, worker_id: str) -> Optional[Dict]:
+        """Take the next available job, or None if nothing is available"""
+
+    @abstractmethod
+    def heartbeat(self, job: Dict) -> bool:
+        """Extend a lease; False means the lease was lost"""
+
+    @abstractmethod
+    def update_payload(self, job: Dict, updates: Dict) -> bool:
+        """Merge updates into a leased job's payload so a retry sees them; False means the lease was lost"""
+
+    @abstractmethod
+    def complete(self, job: Dict, result: Optional[Dict] = None) -> bool:
+        """Mark a leased job done; False means the lease was lost"""
+
+    @abstractmethod
+    def fail(self, job: Dict, error: str) -> bool:
+        """Release a leased job for retry, or mark it failed after max_attempts"""
+
+    @abstractmethod
+    def summary(self) -> Dict:
+        """Counts of jobs per state plus per-worker completions"""
+
+
+class SQLiteJobQueue(JobQueue):
+    """Job queue in a SQLite file shared between workers"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id TEXT PRIMARY KEY,
+            payload TEXT NOT NULL,
+            state TEXT NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            lease_token TEXT,
+            lease_expires REAL,
+            worker TEXT,
+            result TEXT,
+            error TEXT,
+            enqueued_at REAL NOT NULL,
+            updated_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, lease_expires);
+    """
+
+    def __init__(self, path: str, visibility_timeout: float = 600, max_attempts: int = 3):
+        super().__init__(visibility_timeout, max_attempts)
+        self.path = path
+        conn = self._connect()
+        try:
+            conn.executescript(self.SCHEMA)
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        # isolation_level=None so BEGIN IMMEDIATE controls the write lock
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    def enqueue(self, notebooks: List[Dict]) -> int:
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            before = conn.total_changes
+            conn.executemany(
+                'INSERT OR IGNORE INTO jobs (id, payload, enqueued_at, updated_at) VALUES (?, ?, ?, ?)',
+                [(job_id_for(nb), json.dumps(nb), now + i * 1e-6, now) for i, nb in enumerate(notebooks)]
+            )
+            added = conn.total_changes - before
+            conn.execute('COMMIT')
+        finally:
+            conn.close()
+        return added
+
+    def lease(self, worker_id: str) -> Optional[Dict]:
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            # Expired leases that used up their attempts are failed, not retried
+            conn.execute(
+                "UPDATE jobs SET state = 'failed', error = 'Lease expired', lease_token = NULL, updated_at = ? "
+                "WHERE state = 'leased' AND lease_expires < ? AND attempts >= ?",
+                (now, now, self.max_attempts)
+            )
+            row = conn.execute(
+                "SELECT id, payload, attempts FROM jobs "
+                "WHERE state = 'pending' OR (state = 'leased' AND lease_expires < ?) "
+                "ORDER BY enqueued_at LIMIT 1",
+                (now,)
+            ).fetchone()
+            if row is None:
+                conn.execute('COMMIT')
+                return None
+
+            token = uuid.uuid4().hex
+            conn.execute(
+                "UPDATE jobs SET state = 'leased', lease_token = ?, lease_expires = ?, worker = ?, "
+                "attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                (token, now + self.visibility_timeout, worker_id, now, row[0])
+            )
+            conn.execute('COMMIT')
+        finally:
+            conn.close()
+
+        return {'id': row[0], 'payload': json.loads(row[1]), 'attempts': row[2] + 1, 'lease_token': token}
+
+    def _update_leased(self, job: Dict, assignments: str, params: tuple) -> bool:
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                f"UPDATE jobs SET {assignments}, updated_at = ? "
+                "WHERE id = ? AND state = 'leased' AND lease_token = ?",
+                (*params, time.time(), job['id'], job['lease_token'])
+            )
+            return cursor.rowcount == 1
+        finally:
+            conn.close()
+
+    def heartbeat(self, job: Dict) -> bool:
+        return self._update_leased(job, 'lease_expires = ?', (time.time() + self.visibility_timeout,))
+
+    def update_payload(self, job: Dict, updates: Dict) -> bool:
+        payload = {**job['payload'], **updates}
+        if not self._update_leased(job, 'payload = ?', (json.dumps(payload),)):
+            return False
+        job['payload'] = payload
+        return True
+
+    def complete(self, job: Dict, result: Optional[Dict] = None) -> bool:
+        return self._update_leased(
+            job, "state = 'done', lease_token = NULL, result = ?", (json.dumps(result or {}),)
+        )
+
+    def fail(self, job: Dict, error: str) -> bool:
+        state = 'failed' if job['attempts'] >= self.max_attempts else 'pending'
+        return self._update_leased(job, "state = ?, lease_token = NULL, error = ?", (state, error))
+
+    def summary(self) -> Dict:
+        conn = self._connect()
+        try:
+            counts = dict(conn.execute('SELECT state, COUNT(*) FROM jobs GROUP BY state').fetchall())
+            workers = dict(conn.execute(
+                "SELECT worker, COUNT(*) FROM jobs WHERE state = 'done' GROUP BY worker"
+            ).fetchall())
+            recent = conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE state = 'done' AND updated_at > ?",
+                (time.time() - 300,)
+            ).fetchone()[0]
+        finally:
+            conn.close()
+        return {
+            'pending': counts.get('pending', 0),
+            'leased': counts.get('leased', 0),
+            'done': counts.get('done', 0),
+            'failed': counts.get('failed', 0),
+            'workers': workers,
+            'done_per_minute': round(recent / 5, 2)
+        }
+
+
+class DirectoryJobQueue(JobQueue):
+    """
+    Job queue in a shared directory
+
+    Each job is a JSON file moved between pending/, leased/, done/ and failed/
+    with atomic renames, so exactly one worker wins each lease. A leased file's
+    name carries the lease token and its mtime is the heartbeat.
+    """
+
+    STATES = ('pending', 'leased', 'done', 'failed')
+
+    def __init__(self, path: str, visibility_timeout: float = 600, max_attempts: int = 3):
+        super().__init__(visibility_timeout, max_attempts)
+        self.root = Path(path)
+        for state in self.STATES:
+            (self.root / state).mkdir(parents=True, exist_ok=True)
+
+    def _write(self, path: Path, data: Dict):
+        tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+    def _leased_path(self, job: Dict) -> Path:
+        return self.root / 'leased' / f"{job['id']}.{job['lease_token']}.json"
+
+    def enqueue(self, notebooks: List[Dict]) -> int:
+        added = 0
+        for notebook in notebooks:
+            job_id = job_id_for(notebook)
+            if any((self.root / state / f"{job_id}.json").exists() for state in ('pending', 'done', 'failed')) \
+                    or any((self.root / 'leased').glob(f"{job_id}.*.json")):
+                continue
+            self._write(self.root / 'pending' / f"{job_id}.json", {
+                'id': job_id,
+                'payload': notebook,
+                'attempts': 0,
+                'enqueued_at': time.time()
+            })
+            added += 1
+        return added
+
+    def _reap_expired(self):
+        """Return jobs whose lease expired to pending (or failed after max_attempts)"""
+        now = time.time()
+        for path in (self.root / 'leased').glob('*.json'):
+            try:
+                if path.stat().st_mtime + self.visibility_timeout >= now:
+                    continue
+                job_id = path.name.split('.', 1)[0]
+                with open(path) as f:
+                    attempts = json.load(f).get('attempts', 0)
+                state = 'failed' if attempts >= self.max_attempts else 'pending'
+                os.rename(path, self.root / state / f"{job_id}.json")
+                logger.warning(f"Lease on job {job_id} expired, moved to {state}")
+            except (FileNotFoundError, ValueError):
+                # Another worker reaped, heartbeated or completed it first
+                continue
+
+    def lease(self, worker_id: str) -> Optional[Dict]:
+        self._reap_expired()
+        candidates = sorted((self.root / 'pending').glob('*.json'), key=_mtime)
+        for path in candidates:
+            job_id = path.stem
+            token = uuid.uuid4().hex
+            leased_path = self.root / 'leased' / f"{job_id}.{token}.json"
+            try:
+                # Touch first: the rename keeps the mtime, which is the lease clock
+                os.utime(path)
+                os.rename(path, leased_path)
+            except FileNotFoundError:
+                continue  # Another worker took it
+
+            with open(leased_path) as f:
+                data = json.load(f)
+            data['attempts'] = data.get('attempts', 0) + 1
+            data['worker'] = worker_id
+            self._write(leased_path, data)
+            return {'id': job_id, 'payload': data['payload'], 'attempts': data['attempts'],
+                    'lease_token': token}
+        return None
+
+    def heartbeat(self, job: Dict) -> bool:
+        try:
+            os.utime(self._leased_path(job))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def update_payload(self, job: Dict, updates: Dict) -> bool:
+        path = self._leased_path(job)
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return False
+        data['payload'].update(updates)
+        # Rewriting the file also refreshes its mtime, like a heartbeat
+        self._write(path, data)
+        job['payload'] = data['payload']
+        return True
+
+    def _finish(self, job: Dict, state: str, updates: Dict) -> bool:
+        target = self.root / state / f"{job['id']}.json"
+        try:
+            os.rename(self._leased_path(job), target)
+        except FileNotFoundError:
+            return False
+        with open(target) as f:
+            data = json.load(f)
+        data.update(updates, finished_at=time.time())
+        self._write(target, data)
+        return True
+
+    def complete(self, job: Dict, result: Optional[Dict] = None) -> bool:
+        return self._finish(job, 'done', {'result': result or {}})
+
+    def fail(self, job: Dict, error: str) -> bool:
+        state = 'failed' if job['attempts'] >= self.max_attempts else 'pending'
+        return self._finish(job, state, {'error': error})
+
+    def summary(self) -> Dict:
+        counts = {state: len(list((self.root / state).glob('*.json'))) for state in self.STATES}
+        workers: Dict[str, int] = {}
+        recent = 0
+        now = time.time()
+        for path in (self.root / 'done').glob('*.json'):
+            try:
+                with open(path) as f:
+                    data = json.load(f)
+            except (FileNotFoundError, ValueError):
+                continue
+            workers[data.get('worker')] = workers.get(data.get('worker'), 0) + 1
+            if data.get('finished_at', 0) > now - 300:
+                recent += 1
+        return {**counts, 'workers': workers, 'done_per_minute': round(recent / 5, 2)}
+
+
+def open_queue(url: str, visibility_timeout: float = 600, max_attempts: int = 3) -> JobQueue:
+    """
+    Open a queue from a URL-like spec
+
+    Args:
+        url: 'sqlite:path/to/jobs.db' or 'dir:path/to/queue'
+    """
+    scheme, _, path = url.partition(':')
+    path = path[2:] if path.startswith('//') else path
+    if scheme == 'sqlite':
+        return SQLiteJobQueue(path, visibility_timeout, max_attempts)
+    if scheme == 'dir':
+        return DirectoryJobQueue(path, visibility_timeout, max_attempts)
+    raise ValueError(f"Unsupported queue backend: {url} (use sqlite:<file> or dir:<directory>)")
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Manifest readers for NotebookLM bulk imports
+Excel workbooks are streamed with openpyxl's read-only mode and cached as
+Arrow files keyed by path, modification time and sheet, so repeated runs on an
+unchanged workbook skip the slow parse. Parquet and Arrow manifests are read
+directly.
+"""
+
+import hashlib
+import importlib.util
+import os
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = ('notebook_name', 'source_url')
+
+
+def group_rows(rows: Iterable[Dict]) -> List[Dict]:
+    """
+    Group manifest rows into notebooks, sorted by notebook name
+
+    Args:
+        rows: Mappings with 'notebook_name' and 'source_url' keys
+    """
+    groups: Dict[str, List[str]] = {}
+    for row in rows:
+        name = _cell_text(row.get('notebook_name'))
+        if not name:
+            continue
+        sources = groups.setdefault(name, [])
+        url = _cell_text(row.get('source_url'))
+        if url:
+            sources.append(url)
+    return [{'name': name, 'sources': groups[name]} for name in sorted(groups)]
+
+
+def _cell_text(value) -> str:
+    """Cell value as stripped text ('' for empty cells)"""
+    if value is None:
+        return ''
+    if isinstance(value, float) and value != value:
+        # NaN from columnar files written by pandas
+        return ''
+    return str(value).strip()
+
+
+def iter_excel_rows(excel_path: str, sheet_name: str = 'Sheet1') -> Iterator[Tuple[str, str]]:
+    """
+    Stream (notebook_name, source_url) pairs from a worksheet
+
+    Raises:
+        ValueError: if the sheet or a required column is missing
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(excel_path, read_only=True, data_only=True)
+    try:
+        if sheet_name not in workbook.sheetnames:
+            raise ValueError(f"Sheet '{sheet_name}' not found in {excel_path} "
+                             f"(sheets: {', '.join(workbook.sheetnames)})")
+        rows = workbook[sheet_name].iter_rows(values_only=True)
+        header = [_cell_text(cell) for cell in next(rows, ())]
+        missing = [column for column in COLUMNS if column not in header]
+        if missing:
+            raise ValueError(f"Missing columns in {excel_path}: {', '.join(missing)}")
+        name_col, url_col = (header.index(column) for column in COLUMNS)
+
+        for row in rows:
+            if len(row) <= max(name_col, url_col):
+                row = tuple(row) + (None,) * (max(name_col, url_col) + 1 - len(row))
+            yield _cell_text(row[name_col]), _cell_text(row[url_col])
+    finally:
+        workbook.close()
+
+
+def read_columnar(path: str, fmt: str) -> List[Dict]:
+    """
+    Read a Parquet or Arrow (IPC/Feather) manifest with one row per source
+
+    Args:
+        path: Manifest file
+        fmt: 'parquet' or 'arrow'
+    """
+    columns = list(COLUMNS)
+    if fmt == 'parquet':
+        import pyarrow.parquet as pq
+        table = pq.read_table(path, columns=columns)
+    else:
+        import pyarrow.feather as feather
+        table = feather.read_table(path, columns=columns)
+
+    names, urls = (table.column(column).to_pylist() for column in columns)
+    return group_rows({'notebook_name': name, 'source_url': url} for name, url in zip(names, urls))
+
+
+class ExcelCache:
+    """Arrow copies of parsed worksheets, invalidated when the workbook changes"""
+
+    def __init__(self, cache_dir: str = '.manifest_cache'):
+        self.cache_dir = Path(cache_dir)
+
+    @staticmethod
+    def _prefix(excel_path: str, sheet_name: str) -> str:
+        source = f"{Path(excel_path).resolve()}|{sheet_name}"
+        return hashlib.sha1(source.encode('utf-8')).hexdigest()[:16]
+
+    def cache_path(self, excel_path: str, sheet_name: str) -> Path:
+        """Cache file for the workbook's current version of a sheet"""
+        stat = os.stat(excel_path)
+        return self.cache_dir / f"{self._prefix(excel_path, sheet_name)}-{stat.st_mtime_ns}-{stat.st_size}.arrow"
+
+    def load(self, excel_path: str, sheet_name: str = 'Sheet1') -> Optional[List[Dict]]:
+        """Cached notebooks for a sheet, or None if the cache is missing or stale"""
+        path = self.cache_path(excel_path, sheet_name)
+        if not path.exists():
+            return None
+        try:
+            return read_columnar(str(path), 'arrow')
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable manifest cache {path}: {e}")
+            return None
+
+    def store(self, excel_path: str, sheet_name: str, rows: List[Tuple[str, str]]):
+        """Write parsed rows and drop caches of older versions of the same sheet"""
+        import pyarrow as pa
+        import pyarrow.feather as feather
+
+        path = self.cache_path(excel_path, sheet_name)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        table = pa.table({
+            'notebook_name': pa.array([name for name, _ in rows], pa.string()),
+            'source_url': pa.array([url for _, url in rows], pa.string())
+        })
+        tmp_path = path.with_suffix('.tmp')
+        feather.write_feather(table, str(tmp_path), compression='zstd')
+        tmp_path.replace(path)
+
+        for stale in self.cache_dir.glob(f"{self._prefix(excel_path, sheet_name)}-*.arrow"):
+            if stale != path:
+                stale.unlink()
+
+
+def load_excel(excel_path: str, sheet_name: str = 'Sheet1',
+               cache: Optional[ExcelCache] = None) -> List[Dict]:
+    """
+    Load notebooks from a worksheet, using and refreshing the Arrow cache
+
+    The cache is skipped if pyarrow isn't installed.
+    """
+    if cache is not None and importlib.util.find_spec('pyarrow') is None:
+        cache = None
+    if cache is not None:
+        cached = cache.load(excel_path, sheet_name)
+        if cached is not None:
+            logger.info(f"Loaded {excel_path} [{sheet_name}] from cache")
+            return cached
+
+    rows = list(iter_excel_rows(excel_path, sheet_name))
+    if cache is not None:
+        try:
+            cache.store(excel_path, sheet_name, rows)
+        except Exception as e:
+            logger.warning(f"Could not cache {excel_path}: {e}")
+    return group_rows({'notebook_name': name, 'source_url': url} for name, url in rows)
@@ -5,12 +5,22 @@ Automates bulk operations for NotebookLM including creating notebooks and adding
 """
 
 import asyncio
+import copy
 import json
 import time
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple, TYPE_CHECKING
 from pathlib import Path
-from playwright.async_api import async_playwright, Page, Browser, ElementHandle
 import logging
+from text_chunker import chunk_file
+from rpc_replay import RpcReplayer, DEFAULT_RPC_PATH, notebook_id_from_url
+from results import NotebookResult
+from verification import (EXTRACT_SOURCES_JS, SOURCE_ITEM_SELECTORS, SOURCE_ERROR_SELECTORS,
+                          SOURCE_PROCESSING_SELECTORS, compare_sources)
+
+if TYPE_CHECKING:
+    # Playwright is only imported when a browser is started, so CLI paths
+    # that never open one (--help, --plan-only, --queue-status) start fast
+    from playwright.async_api import Page, Browser, ElementHandle
 
 # Configure logging
 logging.basicConfig(
@@ -19,21 +29,59 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# File types accepted by NotebookLM's upload dialog
+SUPPORTED_FILE_TYPES = {
+    '.pdf', '.txt', '.md', '.markdown', '.docx', '.csv',
+    '.mp3', '.wav', '.m4a', '.ogg', '.aac'
+}
+MAX_FILE_SIZE = 200 * 1024 * 1024  # NotebookLM per-file upload limit
+
+# Elements shown while sources are still being processed
+INGEST_PROGRESS_SELECTORS = [
+    '[role="progressbar"]',
+    'mat-progress-spinner',
+    'mat-spinner',
+    '.loading',
+    '[aria-busy="true"]'
+]
+
 
 class NotebookLMAutomation:
     """Automate NotebookLM operations using Playwright"""
     
-    def __init__(self, headless: bool = False):
+    def __init__(self, headless: bool = False, base_url: str = 'https://notebooklm.google.com',
+                 max_file_size: int = MAX_FILE_SIZE, max_chunk_bytes: int = 500_000,
+                 rpc_replay: bool = False, rpc_path: str = DEFAULT_RPC_PATH, rpc_concurrency: int = 4):
         """
         Initialize the automation class
         
         Args:
             headless: Run browser in headless mode (False for debugging)
+            base_url: NotebookLM address
+            max_file_size: Largest local file accepted for upload, in bytes
+            max_chunk_bytes: Largest text chunk inserted as one source by 'text_file' sources
+            rpc_replay: Learn the backend requests behind notebook creation and URL
+                sources from the first UI run, then replay them directly
+            rpc_path: URL path of NotebookLM's RPC endpoint
+            rpc_concurrency: Number of replayed source requests in flight at once
         """
         self.headless = headless
-        self.browser: Optional[Browser] = None
-        self.page: Optional[Page] = None
+        self.base_url = base_url
+        self.max_file_size = max_file_size
+        self.max_chunk_bytes = max_chunk_bytes
+        self.browser: Optional['Browser'] = None
+        self.page: Optional['Page'] = None
         self.context = None
+        self.playwright = None
+        self._is_tab = False
+        self.rpc = RpcReplayer(rpc_path) if rpc_replay else None
+        self.rpc_concurrency = rpc_concurrency
+        # Notebook name -> URL for every notebook created in this session
+        self.notebook_urls: Dict[str, str] = {}
+        # Optional progress.ProgressTracker shared with tabs
+        self.progress = None
+        # Optional tracing.FailureTracer shared with tabs
+        self.tracer = None
         
     async def init_browser(self, user_data_dir: Optional[str] = None):
         """
@@ -42,7 +90,10 @@ class NotebookLMAutomation:
         Args:
             user_data_dir: Path to Chrome user data directory for persistent login
         """
-        playwright = await async_playwright().start()
+        from playwright.async_api import async_playwright
+        
+        # Kept so close() can stop the driver process; restarts would leak one each otherwise
+        self.playwright = playwright = await async_playwright().start()
         
         if user_data_dir:
             # Use persistent context to maintain login
@@ -64,11 +115,13 @@ class NotebookLMAutomation:
             )
             self.page = await self.context.new_page()
             
+        if self.tracer:
+            await self.tracer.attach(self.context)
         logger.info("Browser initialized")
         
     async def login_if_needed(self):
         """Check if login is needed and wait for manual login if required"""
-        await self.page.goto('https://notebooklm.google.com')
+        await self.page.goto(self.base_url)
         
         # Check if we're on a login page
         if 'accounts.google.com' in self.page.url:
@@ -86,7 +139,11 @@ class NotebookLMAutomation:
         
     async def create_new_notebook(self, notebook_name: Optional[str] = None) -> bool:
         """
-        Create a new notebook by clicking the 'Create new' button
+        Create a new notebook
+        
+        With RPC replay enabled, the first named notebook is created through the
+        UI while its backend requests are recorded; later ones replay those
+        requests and only fall back to the UI if replay fails.
         
         Args:
             notebook_name: Optional name for the notebook
@@ -94,6 +151,41 @@ class NotebookLMAutomation:
         Returns:
             True if successful, False otherwise
         """
+        if self.rpc and notebook_name and self.rpc.has('create'):
+            started = time.monotonic()
+            try:
+                values = await self.rpc.replay(self.page, 'create', {'title': notebook_name})
+                await self.page.goto(f"{self.base_url}/notebook/{values['notebook_id']}")
+                self.rpc.record_timing('create', 'rpc', time.monotonic() - started)
+                self.notebook_urls[notebook_name] = self.page.url
+                logger.info(f"Created notebook via RPC replay: {notebook_name}")
+                return True
+            except Exception as e:
+                logger.warning(f"RPC replay of notebook creation failed, using UI: {e}")
+                
+        recorder = None
+        if self.rpc and notebook_name and not self.rpc.has('create'):
+            recorder = self.rpc.recorder(self.page)
+            recorder.start()
+            
+        started = time.monotonic()
+        success = await self._step('create_notebook', notebook_name,
+                                   self._create_new_notebook_ui(notebook_name))
+        
+        if success and notebook_name:
+            self.notebook_urls[notebook_name] = self.page.url
+        if self.rpc and success:
+            self.rpc.record_timing('create', 'ui', time.monotonic() - started)
+        if recorder:
+            calls = await recorder.stop()
+            notebook_id = notebook_id_from_url(self.page.url)
+            if success and notebook_id:
+                self.rpc.learn('create', calls, {'title': notebook_name, 'notebook_id': notebook_id})
+                
+        return success
+        
+    async def _create_new_notebook_ui(self, notebook_name: Optional[str] = None) -> bool:
+        """Create a new notebook by clicking the 'Create new' button"""
         try:
             logger.info("Creating new notebook...")
             
@@ -174,43 +266,171 @@ class NotebookLMAutomation:
             logger.error(f"Error renaming notebook: {e}")
             return False
             
-    async def add_sources(self, sources: List[str], source_type: str = 'url') -> bool:
+    async def _open_add_sources_dialog(self) -> bool:
+        """Click the 'Add sources' button and return True if it was found"""
+        add_sources_selectors = [
+            'button:has-text("Add source")',
+            'button:has-text("Add sources")',
+            '[aria-label*="Add source"]',
+            'button:has-text("+")',
+            '[role="button"]:has-text("Add")',
+            'text="Add source"'
+        ]
+        
+        for selector in add_sources_selectors:
+            try:
+                await self.page.wait_for_selector(selector, timeout=5000)
+                await self.page.click(selector)
+                logger.info(f"Clicked add sources button using selector: {selector}")
+                return True
+            except:
+                continue
+                
+        logger.error("Could not find 'Add sources' button")
+        return False
+        
+    async def _submit_dialog(self) -> bool:
+        """Click the submit/add button of the open source dialog"""
+        submit_selectors = [
+            'button:has-text("Add")',
+            'button:has-text("Insert")',
+            'button:has-text("Submit")',
+            'button[type="submit"]',
+            '[aria-label*="Submit"]',
+            '[aria-label*="Add"]'
+        ]
+        
+        for selector in submit_selectors:
+            try:
+                await self.page.click(selector, timeout=3000)
+                logger.info("Clicked submit button")
+                return True
+            except:
+                continue
+                
+        return False
+        
+    async def _paste_text(self, element: 'ElementHandle', text: str):
+        """
+        Set a field's text in one step and notify the page
+        
+        Faster than fill() for large texts: the value is assigned directly and
+        a single input event is dispatched instead of per-keystroke editing.
+        """
+        await element.evaluate(
+            """(el, text) => {
+                if (el.isContentEditable) {
+                    el.textContent = text;
+                } else {
+                    const proto = el.tagName === 'TEXTAREA'
+                        ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+                    Object.getOwnPropertyDescriptor(proto, 'value').set.call(el, text);
+                }
+                el.dispatchEvent(new Event('input', { bubbles: true }));
+                el.dispatchEvent(new Event('change', { bubbles: true }));
+            }""",
+            text
+        )
+        
+    async def add_sources(self, sources: List[str], source_type: str = 'url',
+                          wait_for_ingest: bool = True) -> bool:
         """
         Add multiple sources to the current notebook
         
         Args:
             sources: List of sources (URLs, text, or file paths)
-            source_type: Type of source ('url', 'text', or 'file')
+            source_type: Type of source ('url', 'text', 'file', or 'text_file'
+                for large text files split into chunks)
+            wait_for_ingest: Wait for NotebookLM to process URL/text sources before
+                returning; pass False and call wait_for_ingest() later to overlap it
             
         Returns:
             True if successful, False otherwise
         """
-        try:
-            logger.info(f"Adding {len(sources)} sources...")
+        if source_type == 'text_file':
+            reports = [await self.add_text_document(path, self.max_chunk_bytes) for path in sources]
+            return all(r['chunks'] and r['added'] == r['chunks'] for r in reports)
             
-            # Find and click the "Add sources" button
-            add_sources_selectors = [
-                'button:has-text("Add source")',
-                'button:has-text("Add sources")',
-                '[aria-label*="Add source"]',
-                'button:has-text("+")',
-                '[role="button"]:has-text("Add")',
-                'text="Add source"'
-            ]
+        if source_type == 'file':
+            report = await self.upload_files(sources)
+            return bool(report) and all(item['ok'] for item in report)
             
-            button_clicked = False
-            for selector in add_sources_selectors:
+        if source_type == 'url' and self.rpc:
+            sources = await self._add_url_sources_rpc(sources)
+            if not sources:
+                return True
+            started = time.monotonic()
+            success = await self._step('add_sources', f"{len(sources)} {source_type}",
+                                       self._add_sources_ui(sources, source_type, wait_for_ingest))
+            if success:
+                self.rpc.record_timing('add_source', 'ui', (time.monotonic() - started) / len(sources))
+            return success
+            
+        return await self._step('add_sources', f"{len(sources)} {source_type}",
+                                self._add_sources_ui(sources, source_type, wait_for_ingest))
+        
+    async def _add_url_sources_rpc(self, sources: List[str]) -> List[str]:
+        """
+        Add URL sources by replaying recorded backend requests
+        
+        The first source of the first call goes through the UI to record the
+        request format.
+        
+        Returns:
+            Sources that still need to be added through the UI
+        """
+        notebook_id = notebook_id_from_url(self.page.url)
+        if not notebook_id or not sources:
+            return sources
+            
+        if not self.rpc.has('add_source'):
+            recorder = self.rpc.recorder(self.page)
+            recorder.start()
+            started = time.monotonic()
+            success = await self._step('add_sources', '1 url (recording)',
+                                       self._add_sources_ui(sources[:1], 'url'))
+            calls = await recorder.stop()
+            if not success:
+                return sources
+            self.rpc.record_timing('add_source', 'ui', time.monotonic() - started)
+            learned = self.rpc.learn('add_source', calls, {'source': sources[0], 'notebook_id': notebook_id})
+            sources = sources[1:]
+            if not learned or not sources:
+                return sources
+                
+        semaphore = asyncio.Semaphore(self.rpc_concurrency)
+        failed = []
+        
+        async def replay_source(source: str):
+            async with semaphore:
+                started = time.monotonic()
                 try:
-                    await self.page.wait_for_selector(selector, timeout=5000)
-                    await self.page.click(selector)
-                    button_clicked = True
-                    logger.info(f"Clicked add sources button using selector: {selector}")
-                    break
-                except:
-                    continue
+                    await self.rpc.replay(self.page, 'add_source',
+                                          {'source': source, 'notebook_id': notebook_id})
+                    self.rpc.record_timing('add_source', 'rpc', time.monotonic() - started)
+                except Exception as e:
+                    logger.warning(f"RPC replay failed for {source}, using UI: {e}")
+                    failed.append(source)
                     
-            if not button_clicked:
-                logger.error("Could not find 'Add sources' button")
+        await asyncio.gather(*(replay_source(source) for source in sources))
+        
+        replayed = len(sources) - len(failed)
+        if replayed:
+            logger.info(f"Added {replayed} sources via RPC replay")
+            # Reload so the source panel reflects sources added behind its back
+            await self.page.reload()
+            await self.page.wait_for_load_state('networkidle')
+            
+        return failed
+        
+    async def _add_sources_ui(self, sources: List[str], source_type: str,
+                              wait_for_ingest: bool = True) -> bool:
+        """Add sources by filling the 'Add sources' dialog"""
+        try:
+            logger.info(f"Adding {len(sources)} sources...")
+            
+            # Find and click the "Add sources" button
+            if not await self._open_add_sources_dialog():
                 return False
                 
             # Wait for the dialog/input field to appear
@@ -241,7 +461,7 @@ class NotebookLMAutomation:
                     elif source_type == 'text':
                         # For text, join with double newlines
                         sources_text = '\n\n'.join(sources)
-                        await input_element.fill(sources_text)
+                        await self._paste_text(input_element, sources_text)
                     else:
                         logger.error(f"Unsupported source type: {source_type}")
                         return False
@@ -257,26 +477,12 @@ class NotebookLMAutomation:
                 return False
                 
             # Click the submit/add button
-            submit_selectors = [
-                'button:has-text("Add")',
-                'button:has-text("Insert")',
-                'button:has-text("Submit")',
-                'button[type="submit"]',
-                '[aria-label*="Submit"]',
-                '[aria-label*="Add"]'
-            ]
-            
-            for selector in submit_selectors:
-                try:
-                    await self.page.click(selector, timeout=3000)
-                    logger.info("Clicked submit button")
-                    break
-                except:
-                    continue
+            await self._submit_dialog()
                     
             # Wait for sources to be processed
-            await self.page.wait_for_load_state('networkidle')
-            await asyncio.sleep(3)  # Give it time to process
+            if wait_for_ingest:
+                await self.page.wait_for_load_state('networkidle')
+                await asyncio.sleep(3)  # Give it time to process
             
             logger.info("Successfully added sources")
             return True
@@ -285,6 +491,334 @@ class NotebookLMAutomation:
             logger.error(f"Error adding sources: {e}")
             return False
             
+    def validate_files(self, file_paths: List[str]) -> Tuple[List[Path], List[Dict]]:
+        """
+        Check file existence, size and type before opening any dialog
+        
+        Args:
+            file_paths: Paths of local files to upload
+            
+        Returns:
+            Tuple of (valid paths, report entries for rejected files)
+        """
+        valid = []
+        rejected = []
+        
+        for file_path in file_paths:
+            path = Path(file_path)
+            error = None
+            size = None
+            
+            try:
+                size = path.stat().st_size
+            except OSError as e:
+                error = f"File not accessible: {e}"
+                
+            if error is None:
+                if not path.is_file():
+                    error = "Not a regular file"
+                elif path.suffix.lower() not in SUPPORTED_FILE_TYPES:
+                    error = f"Unsupported file type: {path.suffix or '(none)'}"
+                elif size == 0:
+                    error = "File is empty"
+                elif size > self.max_file_size:
+                    error = f"File too large: {size} bytes (limit {self.max_file_size})"
+                    
+            if error:
+                logger.warning(f"Skipping {file_path}: {error}")
+                rejected.append({
+                    'file': str(file_path),
+                    'size': size,
+                    'ok': False,
+                    'seconds': 0.0,
+                    'error': error
+                })
+            else:
+                valid.append(path)
+                
+        return valid, rejected
+        
+    async def _set_upload_files(self, paths: List[Path]) -> bool:
+        """Hand file paths to the upload dialog's file input"""
+        # Playwright sends local paths to the browser, which reads the files
+        # itself, so nothing is buffered in this process
+        upload_selectors = [
+            'button:has-text("Upload")',
+            'button:has-text("choose file")',
+            '[aria-label*="Upload"]',
+            'text="choose file"'
+        ]
+        
+        for selector in upload_selectors:
+            try:
+                async with self.page.expect_file_chooser(timeout=3000) as chooser_info:
+                    await self.page.click(selector, timeout=3000)
+                chooser = await chooser_info.value
+                await chooser.set_files([str(p) for p in paths])
+                logger.info(f"Selected {len(paths)} files using selector: {selector}")
+                return True
+            except:
+                continue
+                
+        # Fall back to a file input hidden in the dialog
+        try:
+            file_input = await self.page.wait_for_selector('input[type="file"]', state='attached', timeout=3000)
+            await file_input.set_input_files([str(p) for p in paths])
+            logger.info(f"Selected {len(paths)} files using file input")
+            return True
+        except:
+            logger.error("Could not find file upload control")
+            return False
+            
+    async def _wait_for_uploaded_file(self, path: Path, started: float, timeout: float) -> Dict:
+        """Wait until an uploaded file shows up in the source list"""
+        entry = {
+            'file': str(path),
+            'size': path.stat().st_size,
+            'ok': False,
+            'seconds': 0.0,
+            'error': None
+        }
+        
+        try:
+            await self.page.wait_for_selector(f'text="{path.name}"', timeout=timeout * 1000)
+            entry['ok'] = True
+        except Exception as e:
+            entry['error'] = f"Not listed after {timeout:.0f}s: {e.__class__.__name__}"
+            
+        entry['seconds'] = round(time.monotonic() - started, 3)
+        return entry
+        
+    async def upload_files(self, file_paths: List[str], batch_size: int = 20,
+                           timeout: float = 300) -> List[Dict]:
+        """
+        Upload local files to the current notebook through the file chooser
+        
+        Args:
+            file_paths: Paths of local files (PDF, text, Markdown, ...)
+            batch_size: Number of files selected per upload dialog
+            timeout: Seconds to wait for each batch to appear in the source list
+            
+        Returns:
+            One report entry per file with 'file', 'size', 'ok', 'seconds' and 'error'
+        """
+        valid, report = self.validate_files(file_paths)
+        logger.info(f"Uploading {len(valid)} files ({len(report)} rejected)...")
+        
+        for i in range(0, len(valid), batch_size):
+            batch = valid[i:i + batch_size]
+            started = time.monotonic()
+            
+            if not await self._step('upload_files', f"{len(batch)} files", self._open_upload_dialog(batch)):
+                report.extend({
+                    'file': str(path),
+                    'size': path.stat().st_size,
+                    'ok': False,
+                    'seconds': round(time.monotonic() - started, 3),
+                    'error': 'Upload dialog unavailable'
+                } for path in batch)
+                continue
+                
+            report.extend(await asyncio.gather(*(
+                self._wait_for_uploaded_file(path, started, timeout) for path in batch
+            )))
+            
+        uploaded = sum(1 for item in report if item['ok'])
+        logger.info(f"Uploaded {uploaded}/{len(report)} files")
+        for item in report:
+            if not item['ok']:
+                logger.error(f"✗ Upload failed: {item['file']} ({item['error']})")
+                
+        return report
+        
+    async def _open_upload_dialog(self, paths: List[Path]) -> bool:
+        """Open the 'Add sources' dialog and hand it a batch of files"""
+        return await self._open_add_sources_dialog() and await self._set_upload_files(paths)
+        
+    async def _step(self, step: str, detail: Optional[str], action) -> bool:
+        """Await a UI step, saving debugging artifacts if it fails and tracing is on"""
+        if not self.tracer:
+            return await action
+        return await self.tracer.run(self.page, step, detail, action)
+        
+    async def add_text_source(self, text: str) -> bool:
+        """
+        Add one block of text as its own 'Copied text' source
+        
+        Args:
+            text: Text content of the source
+            
+        Returns:
+            True if the text was submitted, False otherwise
+        """
+        if not await self._open_add_sources_dialog():
+            return False
+            
+        paste_option_selectors = [
+            'button:has-text("Copied text")',
+            'text="Copied text"',
+            'button:has-text("Paste text")',
+            '[aria-label*="Copied text"]'
+        ]
+        
+        for selector in paste_option_selectors:
+            try:
+                await self.page.click(selector, timeout=3000)
+                break
+            except:
+                continue
+                
+        text_input_selectors = [
+            'textarea[placeholder*="text"]',
+            'textarea[placeholder*="Paste"]',
+            'textarea',
+            '[contenteditable="true"]'
+        ]
+        
+        for selector in text_input_selectors:
+            try:
+                input_element = await self.page.wait_for_selector(selector, timeout=3000)
+                await self._paste_text(input_element, text)
+                break
+            except:
+                continue
+        else:
+            logger.error("Could not find text input for copied text source")
+            return False
+            
+        if not await self._submit_dialog():
+            logger.error("Could not submit copied text source")
+            return False
+            
+        await self.page.wait_for_load_state('networkidle')
+        return True
+        
+    async def add_text_document(self, file_path: str, max_chunk_bytes: Optional[int] = None) -> Dict:
+        """
+        Add a large text file as a series of size-capped 'Copied text' sources
+        
+        Args:
+            file_path: Path to a UTF-8 text or Markdown file
+            max_chunk_bytes: Largest chunk inserted as a single source
+                (defaults to the instance's max_chunk_bytes)
+            
+        Returns:
+            Report with 'file', 'chunks', 'added', 'bytes', 'seconds' and 'bytes_per_second'
+        """
+        started = time.monotonic()
+        report = {
+            'file': str(file_path),
+            'chunks': 0,
+            'added': 0,
+            'bytes': 0,
+            'seconds': 0.0,
+            'bytes_per_second': 0.0
+        }
+        
+        for chunk in chunk_file(file_path, max_bytes=max_chunk_bytes or self.max_chunk_bytes):
+            report['chunks'] += 1
+            if await self._step('add_text', f"{file_path} chunk {report['chunks']}", self.add_text_source(chunk)):
+                report['added'] += 1
+                report['bytes'] += len(chunk.encode('utf-8'))
+            else:
+                logger.error(f"Failed to add chunk {report['chunks']} of {file_path}")
+                
+        report['seconds'] = round(time.monotonic() - started, 3)
+        if report['seconds'] > 0:
+            report['bytes_per_second'] = round(report['bytes'] / report['seconds'], 1)
+            
+        logger.info(
+            f"Added {report['added']}/{report['chunks']} chunks from {file_path} "
+            f"({report['bytes'] / 1024:.0f} KB in {report['seconds']:.1f}s, "
+            f"{report['bytes_per_second'] / 1024:.1f} KB/s)"
+        )
+        return report
+        
+    async def open_tab(self) -> 'NotebookLMAutomation':
+        """
+        Open another tab in the same browser context
+        
+        Returns:
+            A NotebookLMAutomation sharing this session but driving its own page.
+            Closing it only closes the tab.
+        """
+        tab = copy.copy(self)
+        tab.page = await self.context.new_page()
+        tab._is_tab = True
+        await tab.page.goto(self.base_url)
+        await tab.page.wait_for_load_state('networkidle')
+        return tab
+        
+    async def bulk_upload_files(self, notebooks_files: List[Dict], max_concurrent: int = 3) -> List[Dict]:
+        """
+        Create notebooks and upload their files, several notebooks at a time
+        
+        Args:
+            notebooks_files: List of dictionaries with 'name' and 'sources' (file paths)
+            max_concurrent: Number of notebooks uploading at the same time
+            
+        Returns:
+            One result per notebook, in input order, with 'index', 'name',
+            'url', 'created', 'error', 'create_seconds', 'add_seconds',
+            'total_seconds' and 'files' (the per-file upload report)
+        """
+        semaphore = asyncio.Semaphore(max_concurrent)
+        slots = [f'upload-{i + 1}' for i in range(max_concurrent)]
+        
+        async def upload_notebook(index: int, notebook: Dict) -> Dict:
+            name = notebook['name']
+            result = {
+                'index': index,
+                'name': name,
+                'url': None,
+                'created': False,
+                'error': None,
+                'create_seconds': 0.0,
+                'add_seconds': 0.0,
+                'total_seconds': 0.0,
+                'files': []
+            }
+            async with semaphore:
+                slot = slots.pop(0)
+                started = time.monotonic()
+                tab = await self.open_tab()
+                try:
+                    if self.progress:
+                        self.progress.start(name, slot)
+                    try:
+                        result['created'] = await tab.create_new_notebook(name)
+                    except Exception as e:
+                        result['error'] = f"{e.__class__.__name__}: {e}"
+                    result['create_seconds'] = round(time.monotonic() - started, 3)
+                    if result['created']:
+                        result['url'] = tab.page.url
+                        if self.progress:
+                            self.progress.set_worker(slot, 'uploading', name)
+                        add_started = time.monotonic()
+                        result['files'] = await tab.upload_files(notebook.get('sources', []))
+                        result['add_seconds'] = round(time.monotonic() - add_started, 3)
+                    else:
+                        result['files'] = [{
+                            'file': str(path),
+                            'size': None,
+                            'ok': False,
+                            'seconds': 0.0,
+                            'error': result['error'] or 'Notebook creation failed'
+                        } for path in notebook.get('sources', [])]
+                    result['total_seconds'] = round(time.monotonic() - started, 3)
+                    if self.progress:
+                        report = result['files']
+                        self.progress.finish(name, bool(report) and all(item['ok'] for item in report),
+                                             sum(item['ok'] for item in report), slot)
+                finally:
+                    slots.append(slot)
+                    await tab.close()
+            return result
+                    
+        return list(await asyncio.gather(*(
+            upload_notebook(index, nb) for index, nb in enumerate(notebooks_files)
+        )))
+        
     async def get_notebooks_list(self) -> List[Dict[str, str]]:
         """
         Get list of existing notebooks
@@ -297,7 +831,7 @@ class NotebookLMAutomation:
         try:
             # Navigate to the main page if not already there
             if 'notebook' not in self.page.url:
-                await self.page.goto('https://notebooklm.google.com')
+                await self.page.goto(self.base_url)
                 await self.page.wait_for_load_state('networkidle')
             
             # Find notebook elements
@@ -369,7 +903,7 @@ class NotebookLMAutomation:
             logger.error(f"Error selecting notebook: {e}")
             return False
             
-    async def bulk_create_notebooks_with_sources(self, notebooks_data: List[Dict]) -> Dict[str, bool]:
+    async def bulk_create_notebooks_with_sources(self, notebooks_data: List[Dict]) -> List[NotebookResult]:
         """
         Create multiple notebooks with their respective sources
         
@@ -377,38 +911,268 @@ class NotebookLMAutomation:
             notebooks_data: List of dictionaries with 'name' and 'sources' keys
             
         Returns:
-            Dictionary with notebook names and success status
+            One result record per notebook, in input order
         """
-        results = {}
+        results = []
         
         for notebook in notebooks_data:
             name = notebook.get('name', f'Notebook {time.time()}')
             sources = notebook.get('sources', [])
+            record = NotebookResult(name=name, source_type=notebook.get('source_type', 'url'),
+                                    sources_total=len(sources))
+            started = time.monotonic()
             
             logger.info(f"Creating notebook: {name}")
             
-            # Create new notebook
-            if await self.create_new_notebook(name):
-                # Add sources
-                if sources:
-                    success = await self.add_sources(sources, source_type='url')
-                    results[name] = success
+            try:
+                # Create new notebook
+                if await self.create_new_notebook(name):
+                    record.create_seconds = time.monotonic() - started
+                    record.notebook_id = notebook_id_from_url(self.page.url)
+                    # Add sources
+                    if sources:
+                        add_started = time.monotonic()
+                        if await self.add_sources(sources, source_type=record.source_type):
+                            record.ok = True
+                            record.sources_added = len(sources)
+                        else:
+                            record.fail('SourcesNotAdded')
+                        record.add_seconds = time.monotonic() - add_started
+                    else:
+                        record.ok = True
                 else:
-                    results[name] = True
-            else:
-                results[name] = False
+                    record.fail('NotebookCreationFailed')
+            except Exception as e:
+                record.fail_with(e)
+                
+            record.total_seconds = time.monotonic() - started
+            record.finished_at = time.time()
+            results.append(record)
                 
             # Small delay between operations
             await asyncio.sleep(2)
             
         return results
         
+    async def wait_for_ingest(self, timeout: float = 300) -> bool:
+        """
+        Wait until the current notebook has no sources still processing
+        
+        Args:
+            timeout: Seconds to wait before giving up
+            
+        Returns:
+            True once processing indicators are gone, False on timeout
+        """
+        try:
+            await self.page.wait_for_load_state('networkidle')
+            await self.page.wait_for_function(
+                """(selectors) => !selectors.some(s => {
+                    const el = document.querySelector(s);
+                    return el && el.offsetParent !== null;
+                })""",
+                arg=INGEST_PROGRESS_SELECTORS,
+                timeout=timeout * 1000,
+                polling=1000
+            )
+            return True
+        except Exception as e:
+            logger.warning(f"Sources still processing after {timeout:.0f}s: {e.__class__.__name__}")
+            return False
+            
+    async def pipelined_create_notebooks_with_sources(self, notebooks_data: List[Dict], tabs: int = 2,
+                                                      batch_size: Optional[int] = None) -> List[NotebookResult]:
+        """
+        Create notebooks while earlier ones are still ingesting
+        
+        Notebooks rotate across several tabs. Once a notebook's sources are
+        submitted, its ingest is confirmed in the background and the next
+        notebook is created and named in the following tab. A tab is only
+        reused after its previous notebook has finished ingesting.
+        
+        Args:
+            notebooks_data: List of dictionaries with 'name' and 'sources' keys
+            tabs: Number of tabs to rotate across
+            batch_size: Sources per 'Add sources' dialog (all at once if None)
+            
+        Returns:
+            One result record per notebook, in input order
+        """
+        results = []
+        workers = [self] + [await self.open_tab() for _ in range(max(tabs, 1) - 1)]
+        pending: Dict[int, asyncio.Task] = {}
+        
+        def finished(record: NotebookResult, started: float, error_class: Optional[str] = None):
+            if error_class:
+                record.fail(error_class)
+            else:
+                record.ok = True
+            record.total_seconds = time.monotonic() - started
+            record.finished_at = time.time()
+            if self.progress:
+                self.progress.finish(record.name, record.ok, record.sources_added, record.worker)
+                
+        async def confirm_ingest(tab: 'NotebookLMAutomation', record: NotebookResult, started: float):
+            if self.progress:
+                self.progress.set_worker(record.worker, 'ingesting', record.name)
+            ingest_started = time.monotonic()
+            ingested = await tab.wait_for_ingest()
+            record.ingest_seconds = time.monotonic() - ingest_started
+            finished(record, started, None if ingested else 'IngestTimeout')
+            status = "✓" if record.ok else "✗"
+            logger.info(f"{status} Ingest finished for: {record.name}")
+            
+        try:
+            for i, notebook in enumerate(notebooks_data):
+                slot = i % len(workers)
+                tab = workers[slot]
+                name = notebook.get('name', f'Notebook {time.time()}')
+                sources = notebook.get('sources', [])
+                record = NotebookResult(name=name, source_type=notebook.get('source_type', 'url'),
+                                        sources_total=len(sources), worker=f'tab-{slot + 1}')
+                results.append(record)
+                
+                if slot in pending:
+                    await pending.pop(slot)
+                if tab.page.url.rstrip('/') != self.base_url.rstrip('/'):
+                    await tab.page.goto(self.base_url)
+                    
+                logger.info(f"Creating notebook in tab {slot + 1}: {name}")
+                if self.progress:
+                    self.progress.start(name, record.worker)
+                started = time.monotonic()
+                try:
+                    created = await tab.create_new_notebook(name)
+                except Exception as e:
+                    finished(record, started, e.__class__.__name__)
+                    record.error = str(e)
+                    continue
+                record.create_seconds = time.monotonic() - started
+                if not created:
+                    finished(record, started, 'NotebookCreationFailed')
+                    continue
+                record.notebook_id = notebook_id_from_url(tab.page.url)
+                if not sources:
+                    finished(record, started)
+                    continue
+                    
+                if self.progress:
+                    self.progress.set_worker(record.worker, 'adding sources', name)
+                step = batch_size or len(sources)
+                add_started = time.monotonic()
+                for j in range(0, len(sources), step):
+                    batch = sources[j:j + step]
+                    if await tab.add_sources(batch, source_type=record.source_type, wait_for_ingest=False):
+                        record.sources_added += len(batch)
+                record.add_seconds = time.monotonic() - add_started
+                    
+                if record.sources_added == len(sources):
+                    pending[slot] = asyncio.ensure_future(confirm_ingest(tab, record, started))
+                else:
+                    finished(record, started, 'SourcesNotAdded')
+                    
+            await asyncio.gather(*pending.values())
+            
+        finally:
+            for tab in workers[1:]:
+                await tab.close()
+                
+        return results
+        
+    async def extract_sources(self) -> List[Dict[str, str]]:
+        """
+        Read the current notebook's source list in a single in-page pass
+        
+        Returns:
+            List of dictionaries with 'title', 'url' and 'status'
+            ('ok', 'processing' or 'failed')
+        """
+        return await self.page.evaluate(EXTRACT_SOURCES_JS, {
+            'itemSelectors': SOURCE_ITEM_SELECTORS,
+            'errorSelectors': SOURCE_ERROR_SELECTORS,
+            'processingSelectors': SOURCE_PROCESSING_SELECTORS
+        })
+        
+    async def resume_notebook(self, notebook_url: str, notebook_name: str, sources: List[str]) -> List[str]:
+        """
+        Open a notebook an earlier attempt created and find what it still lacks
+        
+        Args:
+            notebook_url: URL of the existing notebook
+            notebook_name: Name the notebook was created under
+            sources: Sources the notebook should end up with
+            
+        Returns:
+            Sources that are missing from the notebook or failed to ingest
+        """
+        await self.page.goto(notebook_url)
+        await self.page.wait_for_load_state('networkidle')
+        self.notebook_urls[notebook_name] = self.page.url
+        report = compare_sources(sources, await self.extract_sources())
+        return report['missing'] + report['failed']
+        
+    async def verify_notebooks(self, expectations: List[Dict], max_concurrent: int = 3) -> List[Dict]:
+        """
+        Check that notebooks list the sources they were supposed to get
+        
+        Args:
+            expectations: List of dictionaries with 'name', 'url' and 'sources'
+            max_concurrent: Number of notebooks checked at the same time, one tab each
+            
+        Returns:
+            One report per notebook with 'name', 'url', 'expected', 'listed',
+            'missing', 'failed', 'processing', 'seconds' and 'error'; the
+            source lists are empty when 'error' is set
+        """
+        semaphore = asyncio.Semaphore(max_concurrent)
+        
+        async def verify(expectation: Dict) -> Dict:
+            report = {
+                'name': expectation['name'],
+                'url': expectation['url'],
+                'expected': len(expectation['sources']),
+                'listed': 0,
+                'missing': [],
+                'failed': [],
+                'processing': [],
+                'seconds': 0.0,
+                'error': None
+            }
+            async with semaphore:
+                started = time.monotonic()
+                tab = await self.open_tab()
+                try:
+                    await tab.page.goto(expectation['url'])
+                    await tab.page.wait_for_load_state('networkidle')
+                    listed = await tab.extract_sources()
+                    report['listed'] = len(listed)
+                    report.update(compare_sources(expectation['sources'], listed))
+                except Exception as e:
+                    # Nothing is known to be missing from a notebook that couldn't be read
+                    report['error'] = str(e)
+                finally:
+                    await tab.close()
+                report['seconds'] = round(time.monotonic() - started, 3)
+            return report
+            
+        return await asyncio.gather(*(verify(expectation) for expectation in expectations))
+        
     async def close(self):
         """Close the browser"""
-        if self.context:
-            await self.context.close()
-        if self.browser:
-            await self.browser.close()
+        if self._is_tab:
+            await self.page.close()
+            return
+        if self.rpc:
+            self.rpc.log_speedup()
+        try:
+            if self.context:
+                await self.context.close()
+            if self.browser:
+                await self.browser.close()
+        finally:
+            if self.playwright:
+                await self.playwright.stop()
+            self.context = self.browser = self.playwright = None
         logger.info("Browser closed")
 
 
@@ -477,9 +1241,10 @@ async def main():
         
         # Print results
         logger.info("Bulk creation results:")
-        for name, success in results.items():
-            status = "✓" if success else "✗"
-            logger.info(f"  {status} {name}")
+        for record in results:
+            status = "✓" if record.ok else f"✗ ({record.error_class})"
+            logger.info(f"  {status} {record.name}: {record.sources_added}/{record.sources_total} "
+                        f"sources in {record.total_seconds:.1f}s")
             
         # Example 3: Get list of notebooks
         notebooks = await automation.get_notebooks_list()
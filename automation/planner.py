@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Import planning for NotebookLM
+Splits notebooks that exceed the per-notebook source cap into numbered
+overflow notebooks before any browser work starts
+"""
+
+from collections import OrderedDict
+from typing import List, Dict, Optional
+from urllib.parse import urlparse
+import logging
+
+logger = logging.getLogger(__name__)
+
+GROUP_BY_CHOICES = ('domain', 'path')
+
+
+def source_group_key(source: str, group_by: str) -> str:
+    """
+    Key used to keep related sources in the same notebook
+
+    Args:
+        source: Source URL (non-URLs are grouped together)
+        group_by: 'domain' for the host name, 'path' for host plus first path segment
+    """
+    parsed = urlparse(source) if isinstance(source, str) else None
+    if not parsed or not parsed.netloc:
+        return ''
+    host = parsed.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    if group_by == 'domain':
+        return host
+    segments = [s for s in parsed.path.split('/') if s]
+    return f"{host}/{segments[0]}" if segments else host
+
+
+def overflow_name(name: str, part: int) -> str:
+    """Name of the part-th notebook for a group (the first keeps the original name)"""
+    return name if part == 1 else f"{name} ({part})"
+
+
+def _pack_groups(groups: List[List[str]], capacity: int) -> List[List[str]]:
+    """First-fit decreasing bin packing of source groups into notebooks"""
+    pieces = []
+    for group in groups:
+        # A group larger than a whole notebook is split first
+        for i in range(0, len(group), capacity):
+            pieces.append(group[i:i + capacity])
+
+    bins: List[List[str]] = []
+    for piece in sorted(pieces, key=len, reverse=True):
+        for bin_sources in bins:
+            if len(bin_sources) + len(piece) <= capacity:
+                bin_sources.extend(piece)
+                break
+        else:
+            bins.append(list(piece))
+    return bins
+
+
+def plan_notebooks(notebooks_data: List[Dict], max_sources: int,
+                   group_by: Optional[str] = None) -> List[Dict]:
+    """
+    Split notebooks over the source cap into numbered overflow notebooks
+
+    Args:
+        notebooks_data: List of dictionaries with 'name' and 'sources' keys
+        max_sources: Largest number of sources NotebookLM accepts per notebook
+        group_by: None to split in order, or 'domain'/'path' to keep sources
+            from the same site (or site section) together and bin-pack them
+
+    Returns:
+        Planned notebooks. Each keeps the original keys and adds
+        'original_name', 'part' and 'parts'.
+    """
+    if max_sources < 1:
+        raise ValueError(f"max_sources must be positive, got {max_sources}")
+    if group_by is not None and group_by not in GROUP_BY_CHOICES:
+        raise ValueError(f"Unsupported group_by: {group_by}")
+
+    plan = []
+    for notebook in notebooks_data:
+        sources = notebook.get('sources', [])
+
+        if len(sources) <= max_sources:
+            bins = [sources]
+        elif group_by:
+            groups: Dict[str, List[str]] = OrderedDict()
+            for source in sources:
+                groups.setdefault(source_group_key(source, group_by), []).append(source)
+            bins = _pack_groups(list(groups.values()), max_sources)
+        else:
+            bins = [sources[i:i + max_sources] for i in range(0, len(sources), max_sources)]
+
+        for part, bin_sources in enumerate(bins, 1):
+            plan.append({
+                **notebook,
+                'name': overflow_name(notebook['name'], part),
+                'sources': bin_sources,
+                'original_name': notebook['name'],
+                'part': part,
+                'parts': len(bins)
+            })
+
+    return plan
+
+
+def log_plan(plan: List[Dict], max_sources: int):
+    """Log the import plan, highlighting notebooks that were split"""
+    split = OrderedDict()
+    for entry in plan:
+        if entry['parts'] > 1:
+            split.setdefault(entry['original_name'], []).append(entry)
+
+    total_sources = sum(len(entry.get('sources', [])) for entry in plan)
+    logger.info("=" * 50)
+    logger.info("IMPORT PLAN")
+    logger.info("=" * 50)
+    logger.info(f"Notebooks to create: {len(plan)}")
+    logger.info(f"Sources to add: {total_sources}")
+    logger.info(f"Source cap per notebook: {max_sources}")
+
+    if split:
+        logger.info(f"{len(split)} notebooks exceed the cap and were split:")
+        for original_name, entries in split.items():
+            sizes = ', '.join(str(len(entry['sources'])) for entry in entries)
+            logger.info(f"  - {original_name}: {len(entries)} notebooks ({sizes} sources)")
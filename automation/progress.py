@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Live progress for NotebookLM bulk imports
+Tracks throughput, rolling latency, retries and what each worker (tab,
+uploader or queue worker) is doing. The tracker is rendered as a terminal
+progress bar and can also be served as JSON from a local HTTP endpoint.
+"""
+
+import asyncio
+import contextlib
+import json
+import statistics
+import sys
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ProgressTracker:
+    """
+    Thread-safe counters for an import run
+
+    Updates are O(1) and never render anything, so they can be called on
+    every step. Rendering happens separately on a timer (see ProgressDashboard).
+    """
+
+    def __init__(self, latency_window: int = 50, eta_alpha: float = 0.2):
+        """
+        Args:
+            latency_window: Completed notebooks kept for rolling latency
+            eta_alpha: Weight of the newest completion interval in the
+                smoothed rate used for the ETA
+        """
+        self.eta_alpha = eta_alpha
+        self.started = time.monotonic()
+        self.total_notebooks = 0
+        self.total_sources = 0
+        self.done = 0
+        self.failed = 0
+        self.sources_done = 0
+        self.retries = 0
+        self.latencies = deque(maxlen=latency_window)
+        self.workers: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._started_at: Dict[str, float] = {}
+        self._last_finish = self.started
+        self._interval: Optional[float] = None
+
+    def add_work(self, notebooks: int, sources: int = 0):
+        """Grow the totals (imports, queue leases and inbox files all add work)"""
+        with self._lock:
+            self.total_notebooks += notebooks
+            self.total_sources += sources
+
+    def set_worker(self, worker: str, state: str, notebook: Optional[str] = None):
+        """Record what a worker is doing, e.g. 'creating', 'adding sources', 'idle'"""
+        with self._lock:
+            entry = self.workers.setdefault(worker, {'done': 0, 'failed': 0})
+            entry.update(state=state, notebook=notebook, since=time.monotonic())
+
+    def start(self, name: str, worker: str = 'main'):
+        """A worker began importing a notebook"""
+        with self._lock:
+            self._started_at[name] = time.monotonic()
+        self.set_worker(worker, 'creating', name)
+
+    def finish(self, name: str, ok: bool, sources: int = 0, worker: str = 'main'):
+        """A notebook finished, successfully or not"""
+        now = time.monotonic()
+        with self._lock:
+            started = self._started_at.pop(name, None)
+            if started is not None:
+                self.latencies.append(now - started)
+            if ok:
+                self.done += 1
+                self.sources_done += sources
+            else:
+                self.failed += 1
+
+            interval = now - self._last_finish
+            self._last_finish = now
+            if self._interval is None:
+                self._interval = interval
+            else:
+                self._interval = self.eta_alpha * interval + (1 - self.eta_alpha) * self._interval
+
+            entry = self.workers.setdefault(worker, {'done': 0, 'failed': 0})
+            entry['done' if ok else 'failed'] += 1
+            entry.update(state='idle', notebook=None, since=now)
+
+    def retry(self, count: int = 1):
+        """Count re-leased jobs or re-added sources"""
+        with self._lock:
+            self.retries += count
+
+    def snapshot(self) -> Dict:
+        """Current state as a JSON-serializable dictionary"""
+        now = time.monotonic()
+        with self._lock:
+            elapsed = now - self.started
+            finished = self.done + self.failed
+            remaining = max(self.total_notebooks - finished, 0)
+            latencies = sorted(self.latencies)
+            minutes = elapsed / 60 if elapsed > 0 else None
+            return {
+                'elapsed_seconds': round(elapsed, 1),
+                'total_notebooks': self.total_notebooks,
+                'done': self.done,
+                'failed': self.failed,
+                'remaining': remaining,
+                'total_sources': self.total_sources,
+                'sources_done': self.sources_done,
+                'notebooks_per_minute': round(finished / minutes, 2) if minutes else 0.0,
+                'sources_per_minute': round(self.sources_done / minutes, 2) if minutes else 0.0,
+                'latency_mean_seconds': round(statistics.fmean(latencies), 2) if latencies else None,
+                'latency_p95_seconds': round(latencies[int(0.95 * (len(latencies) - 1))], 2) if latencies else None,
+                'retries': self.retries,
+                'eta_seconds': round(remaining * self._interval) if self._interval is not None else None,
+                'workers': {
+                    name: {
+                        'state': entry.get('state', 'idle'),
+                        'notebook': entry.get('notebook'),
+                        'state_seconds': round(now - entry['since'], 1) if 'since' in entry else None,
+                        'done': entry['done'],
+                        'failed': entry['failed']
+                    }
+                    for name, entry in self.workers.items()
+                }
+            }
+
+
+def format_eta(seconds: Optional[float]) -> str:
+    """ETA as h:mm:ss ('?' until the first notebook finishes)"""
+    if seconds is None:
+        return '?'
+    hours, rest = divmod(int(seconds), 3600)
+    return f"{hours}:{rest // 60:02d}:{rest % 60:02d}"
+
+
+def summary_line(snapshot: Dict) -> str:
+    """One-line status for logs and the progress bar"""
+    latency = snapshot['latency_mean_seconds']
+    busy = sum(1 for worker in snapshot['workers'].values() if worker['state'] != 'idle')
+    return (
+        f"{snapshot['notebooks_per_minute']:.1f} nb/min, {snapshot['sources_per_minute']:.1f} src/min, "
+        f"latency {latency if latency is not None else '?'}s, {snapshot['retries']} retries, "
+        f"{snapshot['failed']} failed, {busy}/{len(snapshot['workers'])} busy, "
+        f"ETA {format_eta(snapshot['eta_seconds'])}"
+    )
+
+
+class _StatusHandler(BaseHTTPRequestHandler):
+    tracker: ProgressTracker = None
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+    def do_GET(self):
+        if self.path.split('?')[0] not in ('/', '/status'):
+            self.send_error(404)
+            return
+        body = json.dumps(self.tracker.snapshot()).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class ProgressDashboard:
+    """Render a tracker in the terminal and optionally serve it over HTTP"""
+
+    def __init__(self, tracker: ProgressTracker, refresh_interval: Optional[float] = 1.0,
+                 log_interval: float = 30.0, status_port: Optional[int] = None,
+                 status_host: str = '127.0.0.1'):
+        """
+        Args:
+            tracker: Tracker to display
+            refresh_interval: Seconds between progress bar redraws (None to
+                disable terminal output)
+            log_interval: Seconds between status log lines when there is no
+                interactive terminal or tqdm isn't installed
+            status_port: Serve GET /status as JSON on this port (None to disable)
+            status_host: Interface for the status endpoint
+        """
+        self.tracker = tracker
+        self.refresh_interval = refresh_interval
+        self.log_interval = log_interval
+        self.status_port = status_port
+        self.status_host = status_host
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def _start_server(self):
+        handler = type('StatusHandler', (_StatusHandler,), {'tracker': self.tracker})
+        self._server = ThreadingHTTPServer((self.status_host, self.status_port), handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        logger.info(f"Progress status at http://{self.status_host}:{self.status_port}/status")
+
+    async def _render(self):
+        bar = None
+        redirect = contextlib.nullcontext()
+        if sys.stderr.isatty():
+            try:
+                from tqdm import tqdm
+                from tqdm.contrib.logging import logging_redirect_tqdm
+                bar = tqdm(total=0, unit='nb', dynamic_ncols=True)
+                # Log lines are printed above the bar instead of through it
+                redirect = logging_redirect_tqdm()
+            except ImportError:
+                pass
+
+        last_log = time.monotonic()
+        try:
+            with redirect:
+                await self._refresh(bar, last_log)
+        finally:
+            if bar is not None:
+                bar.close()
+
+    async def _refresh(self, bar, last_log: float):
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            snapshot = self.tracker.snapshot()
+            if bar is not None:
+                bar.total = snapshot['total_notebooks']
+                bar.n = snapshot['done'] + snapshot['failed']
+                bar.set_postfix_str(summary_line(snapshot), refresh=False)
+                bar.refresh()
+            elif time.monotonic() - last_log >= self.log_interval:
+                last_log = time.monotonic()
+                logger.info(
+                    f"Progress: {snapshot['done'] + snapshot['failed']}/{snapshot['total_notebooks']} "
+                    f"notebooks, {summary_line(snapshot)}"
+                )
+
+    async def start(self):
+        if self.status_port:
+            self._start_server()
+        if self.refresh_interval:
+            self._task = asyncio.ensure_future(self._render())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Per-notebook result records for NotebookLM imports
+One typed record per imported notebook, written as JSON lines or Parquet so
+throughput and failure hotspots can be analyzed across many runs
+"""
+
+import json
+import time
+import uuid
+from dataclasses import asdict, dataclass, field, fields
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class NotebookResult:
+    """Outcome of importing one notebook"""
+
+    name: str
+    ok: bool = False
+    notebook_id: Optional[str] = None
+    source_type: str = 'url'
+    sources_total: int = 0
+    sources_added: int = 0
+    create_seconds: float = 0.0
+    add_seconds: float = 0.0
+    ingest_seconds: float = 0.0
+    total_seconds: float = 0.0
+    attempts: int = 1
+    error_class: Optional[str] = None
+    error: Optional[str] = None
+    worker: Optional[str] = None
+    run_id: Optional[str] = None
+    finished_at: float = field(default_factory=time.time)
+
+    def fail(self, error_class: str, error: Optional[str] = None):
+        """Mark the record failed with an error class and optional message"""
+        self.ok = False
+        self.error_class = error_class
+        self.error = error
+
+    def fail_with(self, exc: Exception):
+        """Mark the record failed by an exception"""
+        self.fail(exc.__class__.__name__, str(exc))
+
+    def to_dict(self) -> Dict:
+        record = asdict(self)
+        for key in ('create_seconds', 'add_seconds', 'ingest_seconds', 'total_seconds'):
+            record[key] = round(record[key], 3)
+        return record
+
+
+def new_run_id() -> str:
+    """Sortable id for one import run: UTC timestamp plus a random suffix"""
+    return f"{time.strftime('%Y%m%dT%H%M%SZ', time.gmtime())}-{uuid.uuid4().hex[:6]}"
+
+
+class RecordWriter:
+    """
+    Append result records to a JSONL file or a set of Parquet files
+
+    JSONL records are appended and flushed as they are written, so long runs
+    keep their results if interrupted. Parquet files can't be appended to, so
+    each write() produces a part file named <stem>-<run_id>-<n>.parquet next
+    to the given path; read them back as one dataset.
+    """
+
+    def __init__(self, path: str, run_id: Optional[str] = None):
+        self.path = Path(path)
+        self.run_id = run_id or new_run_id()
+        self.parquet = self.path.suffix.lower() == '.parquet'
+        self._parts = 0
+
+    def write(self, records: Iterable[NotebookResult]) -> int:
+        """
+        Write records, stamping them with this writer's run id
+
+        Returns:
+            Number of records written
+        """
+        rows = []
+        for record in records:
+            record.run_id = record.run_id or self.run_id
+            rows.append(record.to_dict())
+        if not rows:
+            return 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.parquet:
+            self._write_parquet(rows)
+        else:
+            with open(self.path, 'a') as f:
+                for row in rows:
+                    f.write(json.dumps(row, ensure_ascii=False) + '\n')
+                f.flush()
+        return len(rows)
+
+    def _write_parquet(self, rows: List[Dict]):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self._parts += 1
+        part = self.path.with_name(f"{self.path.stem}-{self.run_id}-{self._parts:04d}.parquet")
+        columns = [f.name for f in fields(NotebookResult)]
+        table = pa.Table.from_pylist(rows).select(columns)
+        pq.write_table(table, str(part), compression='zstd')
+        logger.debug(f"Wrote {len(rows)} result records to {part}")
+
+
+def summarize(records: List[NotebookResult]) -> Dict:
+    """Counts, mean phase durations and failures by error class"""
+    ok = [r for r in records if r.ok]
+    errors: Dict[str, int] = {}
+    for record in records:
+        if not record.ok:
+            key = record.error_class or 'Unknown'
+            errors[key] = errors.get(key, 0) + 1
+
+    def mean(values: List[float]) -> float:
+        return round(sum(values) / len(values), 3) if values else 0.0
+
+    return {
+        'notebooks': len(records),
+        'successful': len(ok),
+        'failed': len(records) - len(ok),
+        'sources_added': sum(r.sources_added for r in records),
+        'mean_create_seconds': mean([r.create_seconds for r in ok]),
+        'mean_add_seconds': mean([r.add_seconds for r in ok]),
+        'mean_total_seconds': mean([r.total_seconds for r in ok]),
+        'errors': errors
+    }
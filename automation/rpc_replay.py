@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Direct RPC replay for NotebookLM
+Records the backend requests the page itself sends while a notebook is created
+or a source is added through the UI, then repeats them with new values using
+the page's session instead of clicking through dialogs again
+"""
+
+import asyncio
+import json
+import re
+from typing import List, Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RPC_PATH = '/_/LabsTailwindUi/data/batchexecute'
+UUID_PATTERN = re.compile(r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}')
+NOTEBOOK_URL_PATTERN = re.compile(r'/notebook/([\w-]+)')
+PLACEHOLDER_PATTERN = re.compile('\x00(\\w+):(\\d)\x00')
+RAW_TOKEN_CHAR = re.compile(r'[\w-]')
+PERCENT_ESCAPE = re.compile(r'%[0-9A-Fa-f]{2}')
+# Shorter values are too likely to match unrelated request fields to learn from
+MIN_VARIABLE_LENGTH = 3
+
+# Headers the request context sets itself
+DROPPED_HEADERS = {'content-length', 'cookie', 'host', 'connection', 'accept-encoding'}
+
+
+def escape_value(value: str, depth: int) -> str:
+    """Encode a value as it appears inside `depth` levels of nested JSON strings"""
+    for _ in range(depth):
+        value = json.dumps(value, ensure_ascii=False)[1:-1]
+    return value
+
+
+def _quote_depth(text: str, pos: int) -> int:
+    """JSON string nesting depth of text[pos], judged by the quote just before it"""
+    if pos == 0 or text[pos - 1] != '"':
+        return 0
+    backslashes = 0
+    i = pos - 2
+    while i >= 0 and text[i] == '\\':
+        backslashes += 1
+        i -= 1
+    return (backslashes + 1).bit_length()
+
+
+def _closes_string(text: str, pos: int, depth: int) -> bool:
+    """Whether text[pos:] starts with the closing quote of a JSON string at this depth"""
+    return text.startswith('\\' * (2 ** (depth - 1) - 1) + '"', pos)
+
+
+def _stands_alone(text: str, start: int, end: int) -> bool:
+    """Whether text[start:end] is delimited on both sides, counting %XX escapes as delimiters"""
+    if start and RAW_TOKEN_CHAR.match(text[start - 1]) and not PERCENT_ESCAPE.fullmatch(text[start - 3:start]):
+        return False
+    return end == len(text) or not RAW_TOKEN_CHAR.match(text[end])
+
+
+def templatize(text: str, variables: Dict[str, str], raw: bool = False) -> Tuple[str, bool]:
+    """
+    Replace recorded variable values in a request field with placeholders
+
+    Only whole JSON string tokens equal to a value are replaced, so a title
+    like "2" doesn't swallow an unrelated [2]. With raw=True (for URLs),
+    unquoted occurrences are also replaced when they stand alone between
+    delimiters such as '/' or '&'.
+
+    Returns:
+        Tuple of (templated text, whether any variable was found)
+    """
+    found = False
+    for name, value in variables.items():
+        if not value:
+            continue
+        encodings = {escape_value(value, depth) for depth in range(1, 5)} | {value}
+        for encoded in sorted(encodings, key=len, reverse=True):
+            start = 0
+            while True:
+                pos = text.find(encoded, start)
+                if pos == -1:
+                    break
+                end = pos + len(encoded)
+                depth = _quote_depth(text, pos)
+                if depth:
+                    whole = _closes_string(text, end, depth)
+                else:
+                    whole = raw and _stands_alone(text, pos, end)
+                if not whole:
+                    start = pos + 1
+                    continue
+                token = f"\x00{name}:{depth}\x00"
+                text = text[:pos] + token + text[end:]
+                start = pos + len(token)
+                found = True
+    return text, found
+
+
+def render(text: str, values: Dict[str, str]) -> str:
+    """Fill placeholders in a templated field with new values"""
+    return PLACEHOLDER_PATTERN.sub(
+        lambda m: escape_value(values[m.group(1)], int(m.group(2))), text
+    )
+
+
+def notebook_id_from_url(url: str) -> Optional[str]:
+    """Extract the notebook id from a NotebookLM notebook URL"""
+    match = NOTEBOOK_URL_PATTERN.search(url or '')
+    return match.group(1) if match else None
+
+
+class RpcRecorder:
+    """Capture backend RPC requests and responses sent by a page"""
+
+    def __init__(self, page, rpc_path: str = DEFAULT_RPC_PATH):
+        self.page = page
+        self.rpc_path = rpc_path
+        self.calls: List[Dict] = []
+        self._pending = []
+
+    async def _capture(self, request):
+        response = await request.response()
+        body = await response.text() if response else ''
+        self.calls.append({
+            'url': request.url,
+            'headers': await request.all_headers(),
+            'post_data': request.post_data or '',
+            'status': response.status if response else None,
+            'response': body
+        })
+
+    def _on_request_finished(self, request):
+        if request.method == 'POST' and self.rpc_path in request.url:
+            self._pending.append(asyncio.ensure_future(self._capture(request)))
+
+    def start(self):
+        self.page.on('requestfinished', self._on_request_finished)
+
+    async def stop(self) -> List[Dict]:
+        self.page.remove_listener('requestfinished', self._on_request_finished)
+        for task in self._pending:
+            try:
+                await task
+            except Exception as e:
+                logger.debug(f"Could not capture RPC call: {e}")
+        self._pending = []
+        return self.calls
+
+
+class RpcReplayer:
+    """Learn request templates from recorded UI actions and replay them"""
+
+    def __init__(self, rpc_path: str = DEFAULT_RPC_PATH):
+        """
+        Args:
+            rpc_path: URL path of the backend RPC endpoint to record
+        """
+        self.rpc_path = rpc_path
+        self.templates: Dict[str, List[Dict]] = {}
+        self.timings: Dict[str, Dict[str, List[float]]] = {}
+
+    def has(self, action: str) -> bool:
+        return action in self.templates
+
+    def recorder(self, page) -> RpcRecorder:
+        return RpcRecorder(page, self.rpc_path)
+
+    def learn(self, action: str, calls: List[Dict], variables: Dict[str, str]) -> bool:
+        """
+        Turn recorded calls into a replayable template
+
+        Only calls that carry one of the variables, or whose response returns
+        the notebook id, are kept; unrelated polling requests are dropped.
+
+        Args:
+            action: Template name, e.g. 'create' or 'add_source'
+            calls: Calls captured by an RpcRecorder
+            variables: Values used during the UI action, e.g. {'title': ...,
+                'notebook_id': ...}
+
+        Returns:
+            True if a template was learned
+        """
+        short = [name for name, value in variables.items() if value and len(value) < MIN_VARIABLE_LENGTH]
+        if short:
+            logger.info(f"Not learning '{action}' from short values ({', '.join(short)}), will learn from a later call")
+            return False
+
+        notebook_id = variables.get('notebook_id')
+        steps = []
+
+        for call in calls:
+            if call['status'] is None or call['status'] >= 400:
+                continue
+            url, url_found = templatize(call['url'], variables, raw=True)
+            form = []
+            body_found = False
+            for key, value in parse_qsl(call['post_data'], keep_blank_values=True):
+                value, found = templatize(value, variables)
+                body_found = body_found or found
+                form.append((key, value))
+
+            yields_id = None
+            if notebook_id and notebook_id in call['response']:
+                ids = UUID_PATTERN.findall(call['response'])
+                yields_id = ids.index(notebook_id) if notebook_id in ids else 0
+
+            if not (url_found or body_found or yields_id is not None):
+                continue
+
+            steps.append({
+                'url': url,
+                'headers': {k: v for k, v in call['headers'].items()
+                            if k.lower() not in DROPPED_HEADERS and not k.startswith(':')},
+                'form': form,
+                'yields_notebook_id': yields_id
+            })
+
+        if not steps:
+            logger.warning(f"No RPC calls recorded for '{action}', replay disabled for it")
+            return False
+
+        self.templates[action] = steps
+        logger.info(f"Learned RPC template for '{action}' ({len(steps)} calls)")
+        return True
+
+    async def replay(self, page, action: str, values: Dict[str, str]) -> Dict[str, str]:
+        """
+        Send a learned template's requests with the page's session
+
+        Args:
+            page: Page whose browser context supplies cookies
+            action: Template name
+            values: Values for the template's placeholders
+
+        Returns:
+            The values, plus 'notebook_id' if a response produced one
+
+        Raises:
+            RuntimeError: if a request fails or a needed value is missing
+        """
+        values = dict(values)
+        for step in self.templates[action]:
+            try:
+                url = render(step['url'], values)
+                form = [(key, render(value, values)) for key, value in step['form']]
+            except KeyError as e:
+                raise RuntimeError(f"No value for placeholder {e} in '{action}' template")
+
+            response = await page.request.post(
+                url,
+                headers=step['headers'],
+                data=urlencode(form),
+                fail_on_status_code=False
+            )
+            if not response.ok:
+                raise RuntimeError(f"RPC replay of '{action}' failed with HTTP {response.status}")
+
+            if step['yields_notebook_id'] is not None:
+                ids = UUID_PATTERN.findall(await response.text())
+                if not ids:
+                    raise RuntimeError(f"RPC replay of '{action}' returned no notebook id")
+                values['notebook_id'] = ids[min(step['yields_notebook_id'], len(ids) - 1)]
+
+        return values
+
+    def record_timing(self, action: str, path: str, seconds: float):
+        """Record how long an action took through 'rpc' or 'ui'"""
+        self.timings.setdefault(action, {'rpc': [], 'ui': []})[path].append(seconds)
+
+    def speedup_report(self) -> Dict[str, Dict]:
+        """Mean duration per action for each path and the resulting speedup"""
+        report = {}
+        for action, paths in self.timings.items():
+            rpc = sum(paths['rpc']) / len(paths['rpc']) if paths['rpc'] else None
+            ui = sum(paths['ui']) / len(paths['ui']) if paths['ui'] else None
+            report[action] = {
+                'rpc_calls': len(paths['rpc']),
+                'ui_calls': len(paths['ui']),
+                'rpc_mean_seconds': round(rpc, 3) if rpc is not None else None,
+                'ui_mean_seconds': round(ui, 3) if ui is not None else None,
+                'speedup': round(ui / rpc, 1) if rpc and ui else None
+            }
+        return report
+
+    def log_speedup(self):
+        for action, stats in self.speedup_report().items():
+            if stats['speedup']:
+                logger.info(
+                    f"RPC replay '{action}': {stats['rpc_mean_seconds']:.2f}s vs "
+                    f"{stats['ui_mean_seconds']:.2f}s via UI ({stats['speedup']}x faster, "
+                    f"{stats['rpc_calls']} replayed / {stats['ui_calls']} UI)"
+                )
+            else:
+                logger.info(f"RPC replay '{action}': {stats['rpc_calls']} replayed, {stats['ui_calls']} via UI")
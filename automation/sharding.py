@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Multi-profile sharding for NotebookLM bulk imports
+Each browser profile (one Google account) runs in its own process, so total
+throughput scales with the number of accounts instead of one account's limits
+"""
+
+import asyncio
+import copy
+import heapq
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict
+import logging
+
+from checkpoint import load_completed, merge_checkpoints, shard_checkpoint_path
+from progress import ProgressDashboard, ProgressTracker
+from results import NotebookResult
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_cost(notebook: Dict, config: dict) -> float:
+    """
+    Rough wall-clock cost of importing one notebook, in seconds
+
+    Args:
+        notebook: Dictionary with 'name' and 'sources' keys
+        config: Importer configuration
+    """
+    sharding = config.get('sharding', {})
+    delays = config['notebooklm']['delays']
+    batch_size = config['bulk_operations']['batch_size']
+    sources = len(notebook.get('sources', []))
+    batches = -(-sources // batch_size)
+
+    return (
+        sharding.get('cost_per_notebook', 15)
+        + delays.get('after_create', 2)
+        + delays.get('between_bulk_ops', 2)
+        + batches * (delays.get('after_add_source', 3) + delays.get('between_bulk_ops', 2))
+        + sources * sharding.get('cost_per_source', 1)
+    )
+
+
+def shard_notebooks(notebooks_data: List[Dict], num_shards: int, config: dict) -> List[List[Dict]]:
+    """
+    Balance notebooks across shards by estimated cost
+
+    Uses the longest-processing-time rule: the most expensive notebook goes
+    to the currently lightest shard.
+
+    Returns:
+        One list of notebooks per shard, each kept in manifest order
+    """
+    shards: List[List[tuple]] = [[] for _ in range(num_shards)]
+    heap = [(0.0, i) for i in range(num_shards)]
+
+    ordered = sorted(
+        enumerate(notebooks_data),
+        key=lambda item: estimate_cost(item[1], config),
+        reverse=True
+    )
+    for position, notebook in ordered:
+        load, shard = heapq.heappop(heap)
+        shards[shard].append((position, notebook))
+        heapq.heappush(heap, (load + estimate_cost(notebook, config), shard))
+
+    return [[notebook for _, notebook in sorted(shard)] for shard in shards]
+
+
+def _run_shard(config: dict, profile: str, shard: List[Dict], checkpoint_path: str) -> Dict:
+    """Process entry point: import one shard with one browser profile"""
+    # Imported here so the parent doesn't need the browser stack to plan shards
+    from bulk_import import BulkImporter
+
+    shard_config = copy.deepcopy(config)
+    shard_config['browser']['user_data_dir'] = profile
+    # Shards would all bind the same status port and draw over each other's
+    # progress bars; the parent shows their combined progress instead
+    shard_config.setdefault('progress', {}).update(enabled=False, status_port=None)
+    importer = BulkImporter(config=shard_config)
+    return asyncio.run(importer.import_notebooks(shard, checkpoint_path=checkpoint_path))
+
+
+async def _follow_shards(tracker: ProgressTracker, shards: List[List[Dict]], profiles: List[str],
+                         checkpoint_paths: List[str], interval: float):
+    """Feed notebooks the shards record as completed into the parent's tracker"""
+    sources = {nb['name']: len(nb.get('sources', [])) for shard in shards for nb in shard}
+    seen = set()
+    while True:
+        await asyncio.sleep(interval)
+        for profile, path in zip(profiles, checkpoint_paths):
+            # Shard checkpoints left by an earlier run can name notebooks outside this one
+            for name in load_completed([path]) - seen:
+                seen.add(name)
+                if name in sources:
+                    tracker.finish(name, True, sources[name], profile)
+
+
+async def import_sharded(config: dict, notebooks_data: List[Dict], profiles: List[str],
+                         checkpoint_path: str) -> Dict:
+    """
+    Import notebooks across several browser profiles in parallel processes
+
+    Args:
+        config: Importer configuration
+        notebooks_data: Planned notebooks to import
+        profiles: Browser user data directories, one per process. Each must
+            already be logged in, since child processes can't prompt for login.
+        checkpoint_path: Merged checkpoint file; shards write alongside it
+
+    Returns:
+        Merged results with an extra 'shards' entry describing each process
+    """
+    shards = shard_notebooks(notebooks_data, len(profiles), config)
+    shard_checkpoints = [shard_checkpoint_path(checkpoint_path, i) for i in range(len(profiles))]
+
+    for i, (profile, shard) in enumerate(zip(profiles, shards)):
+        cost = sum(estimate_cost(nb, config) for nb in shard)
+        logger.info(f"Shard {i}: {len(shard)} notebooks, ~{cost / 60:.1f} min, profile {profile}")
+
+    results = {
+        'successful': [],
+        'failed': [],
+        'total': len(notebooks_data),
+        'uploads': [],
+        'records': [],
+        'shards': []
+    }
+
+    # One dashboard for all shards, fed from their checkpoint files
+    progress_config = config.get('progress', {})
+    refresh_interval = progress_config.get('refresh_interval', 1)
+    tracker = ProgressTracker()
+    tracker.add_work(len(notebooks_data), sum(len(nb.get('sources', [])) for nb in notebooks_data))
+    dashboard = ProgressDashboard(
+        tracker,
+        refresh_interval=refresh_interval if progress_config.get('enabled', True) else None,
+        log_interval=progress_config.get('log_interval', 30),
+        status_port=progress_config.get('status_port'),
+        status_host=progress_config.get('status_host', '127.0.0.1')
+    )
+    await dashboard.start()
+    follower = asyncio.ensure_future(
+        _follow_shards(tracker, shards, profiles, shard_checkpoints, refresh_interval or 1)
+    )
+
+    # Spawn rather than fork: Playwright and asyncio state must not be inherited
+    loop = asyncio.get_running_loop()
+    try:
+        with ProcessPoolExecutor(max_workers=len(profiles),
+                                 mp_context=multiprocessing.get_context('spawn')) as pool:
+            futures = [
+                loop.run_in_executor(pool, _run_shard, config, profile, shard, shard_checkpoint)
+                for profile, shard, shard_checkpoint in zip(profiles, shards, shard_checkpoints)
+                if shard
+            ]
+            active = [(profile, shard) for profile, shard in zip(profiles, shards) if shard]
+            outcomes = await asyncio.gather(*futures, return_exceptions=True)
+    finally:
+        follower.cancel()
+        await dashboard.stop()
+
+    for (profile, shard), outcome in zip(active, outcomes):
+        if isinstance(outcome, Exception):
+            logger.error(f"Shard for profile {profile} crashed: {outcome}")
+            outcome = {'successful': [], 'failed': [nb['name'] for nb in shard], 'uploads': [],
+                       'records': [NotebookResult(name=nb['name'], sources_total=len(nb.get('sources', [])),
+                                                  error_class=outcome.__class__.__name__, error=str(outcome),
+                                                  worker=profile)
+                                   for nb in shard]}
+        results['successful'].extend(outcome['successful'])
+        results['failed'].extend(outcome['failed'])
+        results['uploads'].extend(outcome.get('uploads', []))
+        for record in outcome.get('records', []):
+            if record.worker in (None, 'main'):
+                record.worker = profile
+        results['records'].extend(outcome.get('records', []))
+        for key, value in outcome.get('metrics', {}).items():
+            results.setdefault('metrics', {})[key] = results.get('metrics', {}).get(key, 0) + value
+        results['shards'].append({
+            'profile': profile,
+            'notebooks': len(shard),
+            'estimated_seconds': round(sum(estimate_cost(nb, config) for nb in shard), 1),
+            'successful': len(outcome['successful']),
+            'failed': len(outcome['failed'])
+        })
+
+    metrics = results.get('metrics')
+    if metrics and metrics.get('verified_notebooks'):
+        metrics['verify_seconds_per_notebook'] = round(
+            metrics['verify_seconds'] / metrics['verified_notebooks'], 3
+        )
+
+    completed = merge_checkpoints(shard_checkpoints, checkpoint_path)
+    logger.info(f"Merged shard checkpoints: {completed} notebooks completed in {checkpoint_path}")
+    return results
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Startup-time benchmark for the bulk import CLI
+Times fresh interpreter runs of common commands and reports which modules
+dominate import cost, so a stray top-level import of a heavy dependency shows
+up before it ships
+
+Usage:
+    python startup_benchmark.py
+    python startup_benchmark.py --runs 10 --max-ms 300 --top 15
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Dict
+import logging
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+HERE = Path(__file__).resolve().parent
+
+# Modules that must only load when a command actually needs them
+HEAVY_MODULES = ['playwright', 'pandas', 'yaml', 'openpyxl', 'pyarrow', 'httpx', 'watchdog']
+
+COMMANDS = {
+    'import': [sys.executable, '-c', 'import bulk_import'],
+    'help': [sys.executable, str(HERE / 'bulk_import.py'), '--help'],
+    'create-samples': [sys.executable, str(HERE / 'bulk_import.py'), '--create-samples'],
+    'plan-only-json': [sys.executable, str(HERE / 'bulk_import.py'), '--source', 'json',
+                       '--file', 'sample_notebooks.json', '--plan-only',
+                       '--config', str(HERE / 'config.yaml')]
+}
+
+CHECK_HEAVY = (
+    "import sys, json, bulk_import; "
+    "print(json.dumps(sorted({name.split('.')[0] for name in sys.modules} & set(%r))))"
+)
+
+
+def time_command(command: List[str], runs: int, cwd: str) -> Dict:
+    """Median and spread of wall-clock time for a command in fresh interpreters"""
+    env = dict(os.environ, PYTHONPATH=str(HERE))
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run(command, cwd=cwd, env=env, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        samples.append((time.perf_counter() - started) * 1000)
+    return {
+        'median_ms': round(statistics.median(samples), 1),
+        'min_ms': round(min(samples), 1),
+        'max_ms': round(max(samples), 1)
+    }
+
+
+def import_profile(top: int) -> List[Dict]:
+    """Slowest top-level modules by cumulative import time (python -X importtime)"""
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import bulk_import'],
+        cwd=str(HERE), capture_output=True, text=True, check=True
+    )
+    modules = []
+    for line in completed.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth <= 1:
+            # Only bulk_import and the modules it imports directly
+            modules.append({'module': name.strip(), 'cumulative_ms': int(cumulative) / 1000})
+    return sorted(modules, key=lambda m: -m['cumulative_ms'])[:top]
+
+
+def heavy_modules_loaded() -> List[str]:
+    """Heavy dependencies that `import bulk_import` pulls in"""
+    completed = subprocess.run(
+        [sys.executable, '-c', CHECK_HEAVY % HEAVY_MODULES],
+        cwd=str(HERE), capture_output=True, text=True, check=True
+    )
+    return json.loads(completed.stdout)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark bulk_import.py startup time')
+    parser.add_argument('--runs', type=int, default=5, help='Fresh interpreter runs per command')
+    parser.add_argument('--top', type=int, default=10, help='Slowest imports to list')
+    parser.add_argument('--max-ms', type=float,
+                        help='Exit non-zero if any command\'s median exceeds this')
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    args = parser.parse_args()
+
+    report = {'python': sys.version.split()[0], 'commands': {}}
+    with tempfile.TemporaryDirectory() as workdir:
+        # Commands run in order: create-samples writes the JSON plan-only reads
+        for name, command in COMMANDS.items():
+            try:
+                report['commands'][name] = time_command(command, args.runs, workdir)
+            except subprocess.CalledProcessError as e:
+                report['commands'][name] = {'error': f"exit status {e.returncode}"}
+    report['imports'] = import_profile(args.top)
+    report['heavy_modules_on_import'] = heavy_modules_loaded()
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        logger.info(f"Python {report['python']}, {args.runs} runs per command")
+        for name, stats in report['commands'].items():
+            if 'error' in stats:
+                logger.info(f"  {name:<16} failed ({stats['error']})")
+            else:
+                logger.info(f"  {name:<16} {stats['median_ms']:7.1f} ms median "
+                            f"({stats['min_ms']:.1f}-{stats['max_ms']:.1f})")
+        logger.info("Slowest imports under `import bulk_import`:")
+        for module in report['imports']:
+            logger.info(f"  {module['cumulative_ms']:7.1f} ms  {module['module']}")
+        heavy = report['heavy_modules_on_import']
+        logger.info(f"Heavy modules loaded at import: {', '.join(heavy) if heavy else 'none'}")
+
+    slow = [name for name, stats in report['commands'].items()
+            if args.max_ms and stats.get('median_ms', 0) > args.max_ms]
+    if report['heavy_modules_on_import'] or slow or any('error' in s for s in report['commands'].values()):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the NotebookLM web app
+Serves a minimal home page, notebook page and batchexecute RPC endpoint so the
+automation (including RPC replay) can be exercised without a Google account
+
+Usage:
+    python stub_backend.py --port 8765
+    # then set notebooklm.base_url to http://localhost:8765 in config.yaml
+"""
+
+import argparse
+import html
+import json
+import re
+import secrets
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+import logging
+
+from rpc_replay import DEFAULT_RPC_PATH
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+SESSION_TOKEN = secrets.token_hex(8)
+
+HOME_PAGE = """<!doctype html>
+<html><body>
+<h2>Notebooks</h2>
+<ul id="notebooks">%(items)s</ul>
+<button id="create">Create new</button>
+<script>
+const AT = "%(token)s";
+async function rpc(rpcid, payload) {
+  const body = new URLSearchParams();
+  body.set('f.req', JSON.stringify([[[rpcid, JSON.stringify(payload), null, 'generic']]]));
+  body.set('at', AT);
+  const res = await fetch('%(rpc_path)s?rpcids=' + rpcid, {method: 'POST', body});
+  const text = await res.text();
+  return JSON.parse(JSON.parse(text.slice(text.indexOf('\\n') + 1))[0][2]);
+}
+document.getElementById('create').onclick = async () => {
+  const [title, , id] = await rpc('CCqFvf', ['', null, null, [2]]);
+  location.href = '/notebook/' + id;
+};
+</script>
+</body></html>"""
+
+NOTEBOOK_PAGE = """<!doctype html>
+<html><body>
+<h1 id="title" contenteditable="true">%(title)s</h1>
+<ul id="sources">%(items)s</ul>
+<button id="open">Add source</button>
+<div id="dialog" hidden>
+  <textarea placeholder="Paste URLs as source links"></textarea>
+  <button id="submit">Add</button>
+</div>
+<script>
+const AT = "%(token)s";
+const ID = "%(id)s";
+async function rpc(rpcid, payload) {
+  const body = new URLSearchParams();
+  body.set('f.req', JSON.stringify([[[rpcid, JSON.stringify(payload), null, 'generic']]]));
+  body.set('at', AT);
+  await fetch('%(rpc_path)s?rpcids=' + rpcid, {method: 'POST', body});
+}
+const title = document.getElementById('title');
+title.onkeydown = async (e) => {
+  if (e.key === 'Enter') { e.preventDefault(); await rpc('s0tc2d', [ID, title.textContent.trim()]); }
+};
+const dialog = document.getElementById('dialog');
+const opener = document.getElementById('open');
+opener.onclick = () => { dialog.hidden = false; opener.remove(); };
+document.getElementById('submit').onclick = async () => {
+  const urls = dialog.querySelector('textarea').value.split('\\n').filter(Boolean);
+  await rpc('izAoDd', [urls.map(u => [null, null, [u]]), ID]);
+  location.reload();
+};
+</script>
+</body></html>"""
+
+
+class StubState:
+    """In-memory notebooks and sources"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.notebooks = {}
+        self.rpc_calls = 0
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    state = StubState()
+    rpc_path = DEFAULT_RPC_PATH
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+    def _send(self, status: int, body: str, content_type: str = 'text/html; charset=utf-8'):
+        data = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        match = re.fullmatch(r'/notebook/([\w-]+)', path)
+
+        if path == '/':
+            items = ''.join(
+                f'<li role="listitem" data-notebook-id="{nid}">{html.escape(nb["title"])}</li>'
+                for nid, nb in self.state.notebooks.items()
+            )
+            self._send(200, HOME_PAGE % {'items': items, 'token': SESSION_TOKEN,
+                                         'rpc_path': self.rpc_path})
+        elif match and match.group(1) in self.state.notebooks:
+            notebook = self.state.notebooks[match.group(1)]
+            items = ''.join(f'<li class="source" data-source-url="{html.escape(url)}">{html.escape(url)}</li>'
+                            for url in notebook['sources'])
+            self._send(200, NOTEBOOK_PAGE % {'title': html.escape(notebook['title']), 'items': items,
+                                             'token': SESSION_TOKEN, 'id': match.group(1),
+                                             'rpc_path': self.rpc_path})
+        elif path == '/stub/state':
+            self._send(200, json.dumps({'rpc_calls': self.state.rpc_calls,
+                                        'notebooks': self.state.notebooks}),
+                       'application/json')
+        else:
+            self._send(404, 'Not found', 'text/plain')
+
+    def do_POST(self):
+        parsed = urlparse(self.path)
+        if parsed.path != self.rpc_path:
+            self._send(404, 'Not found', 'text/plain')
+            return
+
+        length = int(self.headers.get('Content-Length', 0))
+        form = parse_qs(self.rfile.read(length).decode('utf-8'))
+        if form.get('at', [''])[0] != SESSION_TOKEN:
+            self._send(401, 'Invalid session token', 'text/plain')
+            return
+
+        try:
+            rpcid, payload_json = json.loads(form['f.req'][0])[0][0][:2]
+            payload = json.loads(payload_json)
+        except (KeyError, ValueError, IndexError):
+            self._send(400, 'Malformed f.req', 'text/plain')
+            return
+
+        with self.state.lock:
+            self.state.rpc_calls += 1
+            if rpcid == 'CCqFvf':
+                notebook_id = str(uuid.uuid4())
+                self.state.notebooks[notebook_id] = {'title': 'Untitled notebook', 'sources': []}
+                result = ['Untitled notebook', None, notebook_id]
+            elif rpcid == 's0tc2d':
+                notebook_id, title = payload
+                self.state.notebooks[notebook_id]['title'] = title
+                result = [notebook_id]
+            elif rpcid == 'izAoDd':
+                entries, notebook_id = payload
+                urls = [entry[2][0] for entry in entries]
+                self.state.notebooks[notebook_id]['sources'].extend(urls)
+                result = [[[str(uuid.uuid4())] for _ in urls]]
+            else:
+                self._send(400, f'Unknown rpc {rpcid}', 'text/plain')
+                return
+
+        body = ")]}'\n" + json.dumps([['wrb.fr', rpcid, json.dumps(result), None, None, None, 'generic']])
+        self._send(200, body, 'application/json; charset=utf-8')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local stand-in for NotebookLM')
+    parser.add_argument('--port', type=int, default=8765, help='Port to listen on')
+    parser.add_argument('--rpc-path', default=DEFAULT_RPC_PATH, help='RPC endpoint path')
+    args = parser.parse_args()
+
+    StubHandler.rpc_path = args.rpc_path
+    server = ThreadingHTTPServer(('127.0.0.1', args.port), StubHandler)
+    logger.info(f"Stub NotebookLM backend on http://127.0.0.1:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
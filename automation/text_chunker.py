@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Split large text documents into size-capped chunks for NotebookLM
+Files are memory-mapped and cut on heading or paragraph boundaries, so a
+multi-megabyte document never has to be decoded in one piece
+"""
+
+import mmap
+import re
+from pathlib import Path
+from typing import Iterator, List
+
+# Markdown heading at the start of a block
+HEADING_PATTERN = re.compile(rb'#{1,6}\s')
+PARAGRAPH_BREAK = b'\n\n'
+
+
+def _iter_blocks(data) -> Iterator[slice]:
+    """Yield slices of paragraph blocks, each including its trailing break"""
+    start = 0
+    end = len(data)
+    while start < end:
+        brk = data.find(PARAGRAPH_BREAK, start)
+        if brk == -1:
+            yield slice(start, end)
+            return
+        # Swallow runs of blank lines into the current block
+        stop = brk + len(PARAGRAPH_BREAK)
+        while stop < end and data[stop:stop + 1] == b'\n':
+            stop += 1
+        yield slice(start, stop)
+        start = stop
+
+
+def _utf8_boundary(data, pos: int, start: int) -> int:
+    """Move pos back so it doesn't land inside a multi-byte UTF-8 character"""
+    while pos > start and (data[pos] & 0xC0) == 0x80:
+        pos -= 1
+    return pos
+
+
+def _split_oversized(data, block: slice, max_bytes: int) -> Iterator[slice]:
+    """Cut a single block larger than max_bytes, preferring line breaks"""
+    start = block.start
+    while block.stop - start > max_bytes:
+        cut = data.rfind(b'\n', start, start + max_bytes)
+        if cut <= start:
+            cut = _utf8_boundary(data, start + max_bytes, start)
+        else:
+            cut += 1
+        yield slice(start, cut)
+        start = cut
+    if start < block.stop:
+        yield slice(start, block.stop)
+
+
+def iter_chunks(data, max_bytes: int, min_fill: float = 0.5) -> Iterator[bytes]:
+    """
+    Pack paragraph blocks of a bytes-like buffer into chunks
+
+    Args:
+        data: bytes or mmap with UTF-8 text
+        max_bytes: Largest chunk size in bytes
+        min_fill: Once a chunk is this full, a heading starts a new chunk
+
+    Yields:
+        Chunk contents as bytes
+    """
+    chunk_start = None
+    chunk_end = None
+
+    for block in _iter_blocks(data):
+        size = block.stop - block.start
+        if chunk_start is not None:
+            current = chunk_end - chunk_start
+            starts_section = current >= max_bytes * min_fill and \
+                HEADING_PATTERN.match(data[block.start:min(block.stop, block.start + 512)])
+            if current + size > max_bytes or starts_section:
+                yield data[chunk_start:chunk_end]
+                chunk_start = None
+
+        if size > max_bytes:
+            for piece in _split_oversized(data, block, max_bytes):
+                yield data[piece]
+            continue
+
+        if chunk_start is None:
+            chunk_start = block.start
+        chunk_end = block.stop
+
+    if chunk_start is not None:
+        yield data[chunk_start:chunk_end]
+
+
+def chunk_file(path: str, max_bytes: int = 500_000, min_fill: float = 0.5) -> Iterator[str]:
+    """
+    Memory-map a text file and yield decoded, size-capped chunks
+
+    Args:
+        path: Path to a UTF-8 text or Markdown file
+        max_bytes: Largest chunk size in bytes
+        min_fill: Once a chunk is this full, a heading starts a new chunk
+
+    Yields:
+        Chunk text with surrounding whitespace stripped; empty chunks are skipped
+    """
+    with open(Path(path), 'rb') as f:
+        if Path(path).stat().st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for chunk in iter_chunks(data, max_bytes, min_fill):
+                text = chunk.decode('utf-8', errors='replace').strip()
+                if text:
+                    yield text
+
+
+def chunk_text(text: str, max_bytes: int = 500_000, min_fill: float = 0.5) -> List[str]:
+    """Split an in-memory string the same way chunk_file splits a file"""
+    chunks = iter_chunks(text.encode('utf-8'), max_bytes, min_fill)
+    return [t for t in (c.decode('utf-8').strip() for c in chunks) if t]
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Failure-only debugging artifacts for NotebookLM automation
+Recent steps and warnings are kept in a small in-memory ring. A Playwright
+trace (for sampled steps), a screenshot and the ring are written to disk only
+when a step fails, within a fixed disk budget.
+"""
+
+import json
+import random
+import shutil
+import time
+import uuid
+from collections import deque
+from pathlib import Path
+from typing import Awaitable, Dict, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class _RingHandler(logging.Handler):
+    """Copy warnings into the tracer's ring so failures show what led up to them"""
+
+    def __init__(self, ring: deque):
+        super().__init__(level=logging.WARNING)
+        self.ring = ring
+
+    def emit(self, record: logging.LogRecord):
+        self.ring.append({'time': record.created, 'log': record.levelname, 'message': record.getMessage()})
+
+
+class FailureTracer:
+    """Record steps cheaply and persist debugging artifacts only for failed ones"""
+
+    def __init__(self, artifact_dir: str = 'traces', max_bytes: int = 200 * 1024 * 1024,
+                 ring_size: int = 50, sample_rate: float = 0.25):
+        """
+        Args:
+            artifact_dir: Directory for per-failure artifact folders
+            max_bytes: Disk budget for all artifacts; oldest folders are evicted
+            ring_size: Recent steps and warnings kept in memory
+            sample_rate: Fraction of steps recorded as a Playwright trace chunk.
+                Unsampled steps cost nothing extra and still get a screenshot
+                and the ring on failure. 0 disables Playwright tracing.
+        """
+        self.artifact_dir = Path(artifact_dir)
+        self.max_bytes = max_bytes
+        self.sample_rate = sample_rate
+        self.ring: deque = deque(maxlen=ring_size)
+        self.failures = 0
+        self._context = None
+        self._recording = False
+
+    def capture_logs(self, target: logging.Logger):
+        """Keep the logger's warnings and errors in the ring"""
+        target.addHandler(_RingHandler(self.ring))
+
+    async def attach(self, context):
+        """Prepare a browser context for chunked tracing (idle until a step is sampled)"""
+        if self.sample_rate <= 0:
+            return
+        try:
+            await context.tracing.start(screenshots=True, snapshots=True)
+            # start() opens a chunk; close it unsaved so nothing records between steps
+            await context.tracing.stop_chunk()
+            self._context = context
+        except Exception as e:
+            logger.warning(f"Playwright tracing unavailable, keeping screenshots only: {e}")
+
+    async def run(self, page, step: str, detail: Optional[str], action: Awaitable):
+        """
+        Await an automation step, persisting artifacts if it fails
+
+        A step fails if it raises or returns False. Only one trace chunk can
+        be open per browser context, so steps that overlap a recorded one
+        (e.g. in pipelined tabs) are not traced.
+
+        Returns:
+            The step's result (exceptions are re-raised)
+        """
+        record = (self._context is not None and not self._recording
+                  and random.random() < self.sample_rate)
+        if record:
+            try:
+                await self._context.tracing.start_chunk(title=f"{step}: {detail or ''}")
+                self._recording = True
+            except Exception as e:
+                logger.debug(f"Could not start trace chunk: {e}")
+                record = False
+
+        entry = {'time': time.time(), 'step': step, 'detail': detail, 'ok': True, 'error': None}
+        started = time.monotonic()
+        try:
+            result = await action
+            if result is False:
+                entry.update(ok=False, error='Step returned False')
+            return result
+        except Exception as e:
+            entry.update(ok=False, error=f"{e.__class__.__name__}: {e}")
+            raise
+        finally:
+            entry['seconds'] = round(time.monotonic() - started, 3)
+            entry['url'] = getattr(page, 'url', None)
+            self.ring.append(entry)
+            try:
+                if not entry['ok']:
+                    await self._persist(page, entry, record)
+                elif record:
+                    await self._context.tracing.stop_chunk()
+            except Exception as e:
+                logger.debug(f"Could not save failure artifacts: {e}")
+                if record:
+                    # Never leave a chunk open: it would record every later step
+                    try:
+                        await self._context.tracing.stop_chunk()
+                    except Exception:
+                        pass
+            finally:
+                if record:
+                    self._recording = False
+
+    async def _persist(self, page, entry: Dict, recorded: bool):
+        """Write trace, screenshot and recent steps for a failed step"""
+        self.failures += 1
+        folder = self.artifact_dir / f"{time.strftime('%Y%m%d-%H%M%S')}-{entry['step']}-{uuid.uuid4().hex[:6]}"
+        folder.mkdir(parents=True, exist_ok=True)
+
+        if recorded:
+            await self._context.tracing.stop_chunk(path=str(folder / 'trace.zip'))
+        try:
+            await page.screenshot(path=str(folder / 'screenshot.png'), full_page=True)
+        except Exception as e:
+            logger.debug(f"Could not take failure screenshot: {e}")
+        with open(folder / 'steps.json', 'w') as f:
+            json.dump({'failed': entry, 'recent': list(self.ring)}, f, indent=2, default=str)
+
+        logger.error(f"Step '{entry['step']}' failed, debugging artifacts in {folder}")
+        self._enforce_budget(keep=folder)
+
+    def _enforce_budget(self, keep: Path):
+        """Delete the oldest artifact folders until the total fits the budget"""
+        folders = []
+        for folder in self.artifact_dir.iterdir():
+            if folder.is_dir():
+                size = sum(f.stat().st_size for f in folder.rglob('*') if f.is_file())
+                folders.append((folder.stat().st_mtime, folder, size))
+        total = sum(size for _, _, size in folders)
+
+        for _, folder, size in sorted(folders):
+            if total <= self.max_bytes:
+                break
+            if folder == keep:
+                continue
+            shutil.rmtree(folder, ignore_errors=True)
+            total -= size
+            logger.debug(f"Evicted trace artifacts {folder}")
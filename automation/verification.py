@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Post-import verification for NotebookLM
+Compares the sources a notebook actually lists against the manifest so only
+missing or failed sources are queued for re-adding
+"""
+
+import re
+from typing import List, Dict
+from urllib.parse import urlparse, unquote
+
+# Runs in the page: one pass over the source list returning title, URL and status
+EXTRACT_SOURCES_JS = """
+(config) => {
+    let items = [];
+    for (const selector of config.itemSelectors) {
+        items = Array.from(document.querySelectorAll(selector));
+        if (items.length) break;
+    }
+    const matches = (el, selectors) => selectors.some(s => el.matches(s) || el.querySelector(s));
+    return items.map(el => {
+        const link = el.querySelector('a[href]');
+        let status = 'ok';
+        if (matches(el, config.errorSelectors)) status = 'failed';
+        else if (matches(el, config.processingSelectors)) status = 'processing';
+        return {
+            title: (el.getAttribute('title') || el.textContent || '').trim(),
+            url: el.getAttribute('data-source-url') || (link ? link.href : ''),
+            status: status
+        };
+    });
+}
+"""
+
+SOURCE_ITEM_SELECTORS = [
+    '[data-source-url]',
+    '[data-source-id]',
+    '.single-source-container',
+    '.source-item',
+    '.source'
+]
+SOURCE_ERROR_SELECTORS = [
+    '[aria-label*="error" i]',
+    '[aria-label*="failed" i]',
+    '.error',
+    '.source-error'
+]
+SOURCE_PROCESSING_SELECTORS = [
+    '[role="progressbar"]',
+    'mat-spinner',
+    'mat-progress-spinner',
+    '[aria-busy="true"]'
+]
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form of a URL for matching: no scheme, www, query or trailing slash"""
+    parsed = urlparse((url or '').strip())
+    host = parsed.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    return f"{host}{unquote(parsed.path).rstrip('/')}"
+
+
+def _title_hint(url: str) -> str:
+    """Words a page title is likely to share with its URL (last path segment or host)"""
+    parsed = urlparse(url)
+    segments = [s for s in parsed.path.split('/') if s]
+    hint = segments[-1] if segments else parsed.netloc
+    hint = re.sub(r'\.\w+$', '', unquote(hint))
+    return re.sub(r'[-_+]+', ' ', hint).strip().lower()
+
+
+def compare_sources(expected: List[str], listed: List[Dict]) -> Dict[str, List[str]]:
+    """
+    Match manifest sources against the sources a notebook lists
+
+    Sources are matched by URL where the page exposes one, otherwise by
+    their title. If the notebook lists at least as many healthy sources as
+    expected, unmatched sources are treated as present rather than re-added
+    (titles often don't resemble URLs).
+
+    Args:
+        expected: Source URLs from the manifest
+        listed: Items from EXTRACT_SOURCES_JS with 'title', 'url' and 'status'
+
+    Returns:
+        Dictionary with 'missing', 'failed' and 'processing' source lists
+    """
+    by_url = {}
+    untitled = []
+    for item in listed:
+        if item.get('url'):
+            by_url.setdefault(normalize_url(item['url']), item)
+        else:
+            untitled.append(item)
+
+    report = {'missing': [], 'failed': [], 'processing': []}
+    unmatched = []
+    remaining = list(untitled)
+
+    for source in expected:
+        item = by_url.get(normalize_url(source))
+        if item is None:
+            hint = _title_hint(source)
+            for candidate in remaining:
+                if hint and hint in candidate['title'].lower():
+                    item = candidate
+                    remaining.remove(candidate)
+                    break
+
+        if item is None:
+            unmatched.append(source)
+        elif item['status'] == 'failed':
+            report['failed'].append(source)
+        elif item['status'] == 'processing':
+            report['processing'].append(source)
+
+    healthy = sum(1 for item in listed if item['status'] == 'ok')
+    if unmatched and healthy < len(expected):
+        report['missing'] = unmatched
+    return report
@@ -0,0 +1,262 @@
+"""
+Batch translation of .txt, .md and .srt documents
+Documents are cut on paragraph or subtitle-cue boundaries into chunks within a
+token budget, translated concurrently under a request rate limit with retries,
+and written back in order as soon as each chunk's predecessors are done.
+Subtitle numbering and timings are kept exactly.
+
+Usage:
+    python batch_translate.py talk.srt --source English --target Vietnamese
+    python batch_translate.py notes.md --source English --target French -o notes.fr.md --workers 4 --rpm 30
+"""
+
+import argparse
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+
+FORMATS = ('txt', 'md', 'srt')
+PARAGRAPH_BREAK = re.compile(r'\n\s*\n')
+SRT_TIMING = re.compile(r'^\d\d:\d\d:\d\d[,.]\d{3}\s*-->\s*\d\d:\d\d:\d\d[,.]\d{3}')
+
+
+@dataclass
+class Block:
+    """A paragraph or subtitle cue; header holds an SRT cue's number and timing line"""
+    text: str
+    header: str = ''
+    translatable: bool = True
+
+    def render(self, text=None):
+        text = self.text if text is None else text
+        return f"{self.header}\n{text}" if self.header else text
+
+
+def format_for(path):
+    fmt = os.path.splitext(path)[1].lower().lstrip('.')
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported document type '.{fmt}' (expected {', '.join(FORMATS)})")
+    return fmt
+
+
+def parse_document(text, fmt):
+    """Split a document into blocks; fenced Markdown code is kept untranslated"""
+    text = text.replace('\r\n', '\n').lstrip('\ufeff')
+    if fmt == 'srt':
+        return parse_srt(text)
+
+    blocks = []
+    in_code = False
+    for paragraph in PARAGRAPH_BREAK.split(text.strip('\n')):
+        fences = paragraph.count('```') if fmt == 'md' else 0
+        blocks.append(Block(paragraph, translatable=not in_code and fences == 0))
+        if fences % 2:
+            in_code = not in_code
+    return blocks
+
+
+def parse_srt(text):
+    blocks = []
+    for cue in PARAGRAPH_BREAK.split(text.strip()):
+        lines = cue.split('\n')
+        if len(lines) >= 2 and SRT_TIMING.match(lines[1].strip()):
+            blocks.append(Block('\n'.join(lines[2:]), header='\n'.join(lines[:2]),
+                                translatable=len(lines) > 2))
+        elif lines and SRT_TIMING.match(lines[0].strip()):
+            # Cue without a number
+            blocks.append(Block('\n'.join(lines[1:]), header=lines[0], translatable=len(lines) > 1))
+        else:
+            raise ValueError(f"Malformed subtitle cue: {cue[:80]!r}")
+    return blocks
+
+
+def estimate_tokens(text):
+    # About four characters per token for Latin scripts; one per character is
+    # closer for CJK, so take the larger of the two estimates
+    cjk = sum(1 for char in text if ord(char) > 0x2E80)
+    return max(len(text) // 4, cjk) + 1
+
+
+def chunk_blocks(blocks, max_tokens=1500):
+    """
+    Group consecutive blocks into chunks of at most max_tokens
+
+    Untranslatable blocks form chunks of their own; a single block larger
+    than the budget is sent alone.
+    """
+    chunks = []
+    current, tokens = [], 0
+    for block in blocks:
+        size = estimate_tokens(block.text)
+        if current and (not block.translatable or not current[0].translatable
+                        or tokens + size > max_tokens):
+            chunks.append(current)
+            current, tokens = [], 0
+        current.append(block)
+        tokens += size
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+class RateLimiter:
+    """Spaces calls evenly to at most requests_per_minute, across threads"""
+
+    def __init__(self, requests_per_minute=30):
+        self.interval = 60.0 / requests_per_minute if requests_per_minute else 0.0
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def _translate_with_retries(translate_text, text, limiter, retries, backoff):
+    for attempt in range(retries + 1):
+        limiter.wait()
+        try:
+            translated = translate_text(text)
+            if translated:
+                return translated
+            error = RuntimeError("Empty translation")
+        except Exception as e:
+            error = e
+        if attempt < retries:
+            time.sleep(backoff * 2 ** attempt)
+    raise error
+
+
+def translate_chunk(chunk, translate_text, limiter, retries=3, backoff=2.0):
+    """
+    Translated text for each block of a chunk
+
+    Blocks are sent together separated by blank lines. If the translation
+    doesn't come back with the same number of paragraphs, the blocks are
+    translated one by one so cue boundaries stay exact.
+    """
+    if not chunk[0].translatable:
+        return [block.text for block in chunk]
+    joined = '\n\n'.join(block.text for block in chunk)
+    translated = _translate_with_retries(translate_text, joined, limiter, retries, backoff).strip()
+    if len(chunk) == 1:
+        return [translated]
+    parts = PARAGRAPH_BREAK.split(translated)
+    if len(parts) == len(chunk):
+        return parts
+    return [_translate_with_retries(translate_text, block.text, limiter, retries, backoff).strip()
+            for block in chunk]
+
+
+def translate_document(text, fmt, translate_text, output, max_tokens=1500, max_workers=4,
+                       requests_per_minute=30, retries=3, on_progress=None):
+    """
+    Translate a document and write it to output in order as chunks finish
+
+    Args:
+        text: Document contents
+        fmt: 'txt', 'md' or 'srt'
+        translate_text: Function from source text to translated text (runs
+            in worker threads; None or an exception counts as a failure)
+        output: Writable text stream
+        on_progress: Called as on_progress(done, total, written_text) in the
+            calling thread after each chunk
+
+    Returns:
+        Dictionary with block, chunk and timing counts
+
+    Raises:
+        The last error of a chunk that failed after all retries (everything
+        before it has already been written)
+    """
+    started = time.perf_counter()
+    blocks = parse_document(text, fmt)
+    chunks = chunk_blocks(blocks, max_tokens)
+    limiter = RateLimiter(requests_per_minute)
+    separator = '\n\n'
+    pending = {}
+    next_index = 0
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(translate_chunk, chunk, translate_text, limiter, retries): index
+            for index, chunk in enumerate(chunks)
+        }
+        try:
+            for done, future in enumerate(as_completed(futures), 1):
+                pending[futures[future]] = future.result()
+                written = []
+                while next_index in pending:
+                    for block, translated in zip(chunks[next_index], pending.pop(next_index)):
+                        written.append(block.render(translated) + separator)
+                    next_index += 1
+                if written:
+                    output.write(''.join(written))
+                    output.flush()
+                if on_progress:
+                    on_progress(done, len(chunks), ''.join(written))
+        finally:
+            for future in futures:
+                future.cancel()
+
+    return {
+        'blocks': len(blocks),
+        'chunks': len(chunks),
+        'seconds': round(time.perf_counter() - started, 2)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Translate .txt, .md and .srt files with Groq')
+    parser.add_argument('input', help='Document to translate')
+    parser.add_argument('--source', required=True, help='Source language name, e.g. English')
+    parser.add_argument('--target', required=True, help='Target language name, e.g. Vietnamese')
+    parser.add_argument('-o', '--output', help='Output file (default: <name>.<target>.<ext>)')
+    parser.add_argument('--api-key', default=os.environ.get('GROQ_API_KEY'),
+                        help='Groq API key (default: $GROQ_API_KEY)')
+    parser.add_argument('--max-tokens', type=int, default=1500, help='Token budget per request')
+    parser.add_argument('--workers', type=int, default=4, help='Requests in flight at once')
+    parser.add_argument('--rpm', type=float, default=30, help='Maximum requests per minute')
+    parser.add_argument('--retries', type=int, default=3, help='Extra attempts per chunk')
+    args = parser.parse_args()
+
+    from groq_translator import initialize_client, translate, LANGUAGE_MAP
+
+    for language in (args.source, args.target):
+        if language not in LANGUAGE_MAP:
+            parser.error(f"Unknown language '{language}' (choices: {', '.join(LANGUAGE_MAP)})")
+    if not args.api_key:
+        parser.error('No API key: pass --api-key or set GROQ_API_KEY')
+    client = initialize_client(args.api_key)
+    if not client:
+        sys.exit('Invalid API key')
+
+    fmt = format_for(args.input)
+    stem, extension = os.path.splitext(args.input)
+    output_path = args.output or f"{stem}.{args.target.lower()}{extension}"
+    with open(args.input, encoding='utf-8-sig') as f:
+        text = f.read()
+
+    def show_progress(done, total, written):
+        print(f"\r{done}/{total} chunks", end='', file=sys.stderr, flush=True)
+
+    with open(output_path, 'w', encoding='utf-8') as output:
+        stats = translate_document(
+            text, fmt, lambda chunk: translate(client, chunk, args.source, args.target), output,
+            max_tokens=args.max_tokens, max_workers=args.workers,
+            requests_per_minute=args.rpm, retries=args.retries, on_progress=show_progress
+        )
+    print(f"\nTranslated {stats['blocks']} blocks in {stats['chunks']} requests "
+          f"in {stats['seconds']} s -> {output_path}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
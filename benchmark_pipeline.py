@@ -0,0 +1,227 @@
+"""
+Offline benchmark for the translator audio pipeline
+Synthesizes speech-like signals, runs preprocessing, upload encoding and the
+transcribe/translate/speech requests against a local stand-in for the Groq
+API, and reports per-stage latency, throughput and peak memory. No microphone
+or API key is needed, so the numbers are comparable between branches.
+
+Usage:
+    python benchmark_pipeline.py
+    python benchmark_pipeline.py --seconds 10 60 300 --rates 16000 44100 --json > bench.json
+    python benchmark_pipeline.py --baseline bench.json --max-regression 25
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from audio_encoding import prepare_upload
+from audio_preprocessing import reduce_noise, trim_silence
+from chunked_transcription import split_on_silence, stitch, transcribe_bytes, transcribe_chunks
+from speech_pipeline import split_sentences
+
+WORDS = ('the quick brown fox jumps over a lazy dog while seven small birds sing '
+         'near an old stone bridge under bright morning light').split()
+
+
+def speech_like(seconds, sample_rate, seed=0):
+    """
+    Voiced syllables with a drifting pitch, formant-like harmonics, pauses
+    between phrases and a low noise floor
+    """
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * sample_rate), dtype=np.float32) / sample_rate
+    pitch = 140 + 40 * np.sin(2 * np.pi * 0.3 * t) + 10 * rng.standard_normal() * np.sin(2 * np.pi * 1.1 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / sample_rate
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 8)).astype(np.float32)
+    # About four syllables per second, with a pause every few seconds
+    syllables = np.clip(np.sin(2 * np.pi * 4 * t), 0, None) ** 2
+    phrases = (np.sin(2 * np.pi * t / 3.7) > -0.6).astype(np.float32)
+    audio = 0.3 * voiced * syllables * phrases
+    audio += 0.003 * rng.standard_normal(len(t)).astype(np.float32)
+    return audio.astype(np.float32)
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Answers the OpenAI-compatible Groq endpoints the app uses, with simulated latency"""
+
+    latency = 0.05
+    bandwidth = 20e6  # bits per second
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, body, content_type='application/json'):
+        if isinstance(body, dict):
+            body = json.dumps(body).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        time.sleep(self.latency + len(body) * 8 / self.bandwidth)
+        if self.path.endswith('/audio/transcriptions'):
+            words = max(1, len(body) // 8000)
+            self._reply({'text': ' '.join(WORDS[i % len(WORDS)] for i in range(words)) + '.'})
+        elif self.path.endswith('/chat/completions'):
+            request = json.loads(body)
+            text = request['messages'][-1]['content']
+            self._reply({
+                'id': 'standin', 'object': 'chat.completion', 'created': int(time.time()),
+                'model': request.get('model', 'standin'),
+                'choices': [{'index': 0, 'finish_reason': 'stop',
+                             'message': {'role': 'assistant', 'content': text.upper()}}],
+                'usage': {'prompt_tokens': len(text) // 4, 'completion_tokens': len(text) // 4,
+                          'total_tokens': len(text) // 2}
+            })
+        elif self.path.endswith('/audio/speech'):
+            text = json.loads(body).get('input', '')
+            # Roughly 16 kB of MP3 per second of speech, 15 characters per second
+            self._reply(bytes(len(text) * 1100), content_type='audio/mpeg')
+        else:
+            self.send_error(404)
+
+
+class StandInServer:
+    def __init__(self, latency=0.05, bandwidth=20e6):
+        handler = type('Handler', (StandInHandler,), {'latency': latency, 'bandwidth': bandwidth})
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def measure(results, stage, function, amount=None, unit=None):
+    """Run one stage, recording wall time and the peak traced allocation"""
+    tracemalloc.reset_peak()
+    before, _ = tracemalloc.get_traced_memory()
+    started = time.perf_counter()
+    value = function()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    entry = {'stage': stage, 'ms': round(elapsed * 1000, 2), 'peak_mb': round((peak - before) / 1e6, 2)}
+    if amount is not None and elapsed > 0:
+        entry['throughput'] = round(amount / elapsed, 2)
+        entry['unit'] = unit
+    results.append(entry)
+    return value
+
+
+def run_case(client, seconds, sample_rate, args, translate, source_lang, target_lang):
+    results = []
+    audio = speech_like(seconds, sample_rate)
+    filtered = measure(results, 'reduce_noise', lambda: reduce_noise(audio, sample_rate),
+                       seconds, 'audio s/s')
+    trimmed = measure(results, 'trim_silence', lambda: trim_silence(filtered), seconds, 'audio s/s')
+    parts, report = measure(results, f"encode_{args.codec}",
+                            lambda: prepare_upload(trimmed, sample_rate, args.codec), seconds, 'audio s/s')
+    results[-1]['bytes'] = report.uploaded_bytes
+    results[-1]['raw_bytes'] = report.raw_bytes
+
+    text = measure(results, 'transcribe', lambda: ' '.join(
+        transcribe_bytes(client, part.filename, part.data, 'en') for part in parts), seconds, 'audio s/s')
+
+    def chunked():
+        chunks = [chunk for _, chunk in split_on_silence(trimmed, sample_rate, args.chunk_seconds)]
+        texts, _ = transcribe_chunks(
+            chunks, lambda chunk: ' '.join(transcribe_bytes(client, part.filename, part.data, 'en')
+                                           for part in prepare_upload(chunk, sample_rate, args.codec)[0]),
+            max_workers=args.workers)
+        return stitch(texts)
+    measure(results, 'transcribe_chunked', chunked, seconds, 'audio s/s')
+
+    translation = measure(results, 'translate', lambda: translate(client, text, source_lang, target_lang),
+                          len(text), 'chars/s')
+
+    def speak():
+        return [client.audio.speech.create(model='playai-tts', voice='Fritz-PlayAI', input=sentence,
+                                           response_format='mp3').read()
+                for sentence in split_sentences(translation or text)]
+    measure(results, 'speech', speak, len(translation or text), 'chars/s')
+    return results
+
+
+def compare(report, baseline, max_regression):
+    """Stages slower than the baseline by more than max_regression percent"""
+    previous = {(case['seconds'], case['rate'], stage['stage']): stage['ms']
+                for case in baseline['cases'] for stage in case['stages']}
+    regressions = []
+    for case in report['cases']:
+        for stage in case['stages']:
+            old = previous.get((case['seconds'], case['rate'], stage['stage']))
+            if old and stage['ms'] > old * (1 + max_regression / 100):
+                regressions.append(f"{stage['stage']} ({case['seconds']} s @ {case['rate']} Hz): "
+                                   f"{old:.1f} -> {stage['ms']:.1f} ms")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the translator audio pipeline offline')
+    parser.add_argument('--seconds', type=float, nargs='+', default=[10, 60, 300], help='Signal lengths')
+    parser.add_argument('--rates', type=int, nargs='+', default=[16000, 44100], help='Sample rates')
+    parser.add_argument('--codec', default='flac', choices=['wav', 'flac', 'opus'], help='Upload encoding')
+    parser.add_argument('--chunk-seconds', type=float, default=30, help='Chunk length for chunked transcription')
+    parser.add_argument('--workers', type=int, default=4, help='Parallel chunk requests')
+    parser.add_argument('--latency-ms', type=float, default=50, help='Stand-in API latency per request')
+    parser.add_argument('--bandwidth-mbps', type=float, default=20, help='Stand-in API upload bandwidth')
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    parser.add_argument('--baseline', help='Earlier --json report to compare against')
+    parser.add_argument('--max-regression', type=float, default=25,
+                        help='Percent slowdown against the baseline that fails the run')
+    args = parser.parse_args()
+
+    from groq import Groq
+    from groq_translator import translate, LANGUAGE_MAP
+
+    source_lang, target_lang = list(LANGUAGE_MAP)[:2]
+    report = {'python': sys.version.split()[0], 'numpy': np.__version__, 'codec': args.codec, 'cases': []}
+    tracemalloc.start()
+    with StandInServer(args.latency_ms / 1000, args.bandwidth_mbps * 1e6) as server:
+        client = Groq(api_key='offline-benchmark', base_url=server.url, max_retries=0)
+        # Open the connection pool first so the first case doesn't pay for it
+        transcribe_bytes(client, 'warmup.wav', b'', 'en')
+        for rate in args.rates:
+            for seconds in args.seconds:
+                stages = run_case(client, seconds, rate, args, translate, source_lang, target_lang)
+                report['cases'].append({'seconds': seconds, 'rate': rate, 'stages': stages})
+    tracemalloc.stop()
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"Python {report['python']}, NumPy {report['numpy']}, {args.codec} uploads, "
+              f"stand-in API {args.latency_ms:.0f} ms + {args.bandwidth_mbps:.0f} Mbit/s")
+        for case in report['cases']:
+            print(f"\n{case['seconds']:.0f} s at {case['rate']} Hz")
+            for stage in case['stages']:
+                throughput = f"{stage['throughput']:>10.1f} {stage['unit']}" if 'throughput' in stage else ''
+                size = f"  {stage['bytes'] / 1024:.0f}/{stage['raw_bytes'] / 1024:.0f} KB" if 'bytes' in stage else ''
+                print(f"  {stage['stage']:<20} {stage['ms']:9.1f} ms {stage['peak_mb']:8.1f} MB peak{throughput}{size}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(report, json.load(f), args.max_regression)
+        for regression in regressions:
+            print(f"Regression: {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
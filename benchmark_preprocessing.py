@@ -0,0 +1,83 @@
+"""
+Micro-benchmark: audio_preprocessing against the original loop/filtfilt code
+
+Usage:
+    python benchmark_preprocessing.py
+    python benchmark_preprocessing.py --seconds 60 --rate 16000 --repeat 5
+"""
+
+import argparse
+import time
+
+import numpy as np
+from scipy import signal
+
+from audio_preprocessing import reduce_noise, trim_silence
+
+
+def legacy_reduce_noise(audio_data, sample_rate):
+    b, a = signal.butter(5, 100 / (sample_rate / 2), btype='highpass')
+    return signal.filtfilt(b, a, audio_data)
+
+
+def legacy_trim_silence(audio_data, threshold=0.01, chunk_size=1000):
+    trim_start = 0
+    trim_end = len(audio_data)
+
+    for i in range(0, len(audio_data), chunk_size):
+        if np.max(np.abs(audio_data[i:i+chunk_size])) > threshold:
+            trim_start = i
+            break
+
+    for i in range(len(audio_data) - chunk_size, 0, -chunk_size):
+        if np.max(np.abs(audio_data[i:i+chunk_size])) > threshold:
+            trim_end = i + chunk_size
+            break
+
+    return audio_data[trim_start:trim_end]
+
+
+def make_signal(seconds, sample_rate, silence=0.3):
+    """Noise bursts with long silent head and tail, the worst case for the trim loops"""
+    rng = np.random.default_rng(0)
+    audio = np.zeros(int(seconds * sample_rate), dtype=np.float32)
+    start, end = int(len(audio) * silence), int(len(audio) * (1 - silence))
+    audio[start:end] = 0.1 * rng.standard_normal(end - start).astype(np.float32)
+    return audio
+
+
+def best_of(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare audio preprocessing implementations')
+    parser.add_argument('--seconds', type=float, default=300, help='Signal length')
+    parser.add_argument('--rate', type=int, default=44100, help='Sample rate')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per function (best is reported)')
+    args = parser.parse_args()
+
+    audio = make_signal(args.seconds, args.rate)
+    print(f"{args.seconds:.0f} s at {args.rate} Hz ({len(audio):,} samples), best of {args.repeat}")
+
+    cases = [
+        ('reduce_noise', lambda: legacy_reduce_noise(audio, args.rate), lambda: reduce_noise(audio, args.rate)),
+        ('trim_silence', lambda: legacy_trim_silence(audio), lambda: trim_silence(audio)),
+    ]
+    for name, legacy, current in cases:
+        legacy_time, legacy_out = best_of(legacy, args.repeat)
+        current_time, current_out = best_of(current, args.repeat)
+        error = np.max(np.abs(legacy_out[:len(current_out)] - current_out)) if len(current_out) else 0.0
+        print(f"  {name:<13} legacy {legacy_time * 1000:8.1f} ms ({legacy_out.dtype}), "
+              f"new {current_time * 1000:8.1f} ms ({current_out.dtype}), "
+              f"{legacy_time / current_time:5.1f}x, "
+              f"lengths {len(legacy_out)}/{len(current_out)}, max diff {error:.2e}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+"""
+Parallel transcription of long audio for the Groq translator
+Audio is split at the quietest point near each chunk boundary, chunks overlap
+slightly so no word is cut, and they are transcribed concurrently with
+retries. Transcripts are stitched back in order with the repeated words from
+the overlap removed.
+"""
+
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import numpy as np
+
+from audio_preprocessing import frame_envelope
+
+WHISPER_MODEL = 'whisper-large-v3-turbo'
+
+
+def transcribe_bytes(client, filename, data, language, model=WHISPER_MODEL):
+    """Transcribe one encoded audio file with the Groq client (safe to call from threads)"""
+    transcription = client.audio.transcriptions.create(
+        file=(filename, data),
+        model=model,
+        prompt='Specify context or spelling',  # Optional
+        response_format='json',  # Optional
+        language=language,  # Optional
+        temperature=0.0  # Optional
+    )
+    if hasattr(transcription, 'text'):
+        return transcription.text
+    elif isinstance(transcription, dict) and 'text' in transcription:
+        return transcription['text']
+    raise ValueError(f"Unexpected transcription format: {type(transcription)}")
+
+
+def split_on_silence(audio, sample_rate, chunk_seconds=30.0, overlap_seconds=1.0,
+                     search_seconds=5.0, frame_ms=20):
+    """
+    Split audio into chunks of about chunk_seconds, cutting at silence
+
+    Each cut is placed at the quietest frame in the last search_seconds before
+    the nominal boundary (or less, for chunks shorter than that). Every chunk
+    after the first starts overlap_seconds before its cut.
+
+    Returns:
+        List of (start_seconds, samples) in order
+    """
+    frame_size = max(1, int(sample_rate * frame_ms / 1000))
+    chunk = int(chunk_seconds * sample_rate)
+    if chunk < 2 * frame_size:
+        raise ValueError(f"chunk_seconds must be at least {2 * frame_ms / 1000} s")
+    if len(audio) <= chunk + search_seconds * sample_rate:
+        return [(0.0, audio)]
+
+    envelope = frame_envelope(audio, frame_size)
+    # Keep the window inside the chunk so every cut lands after the previous one
+    search = max(1, min(int(search_seconds * sample_rate / frame_size), chunk // frame_size - 1))
+    cuts = [0]
+    while len(audio) - cuts[-1] > chunk + search * frame_size:
+        end_frame = (cuts[-1] + chunk) // frame_size
+        window = envelope[end_frame - search:end_frame]
+        cuts.append((end_frame - search + int(np.argmin(window))) * frame_size)
+    cuts.append(len(audio))
+
+    overlap = int(overlap_seconds * sample_rate)
+    chunks = []
+    for start, end in zip(cuts, cuts[1:]):
+        start = max(0, start - overlap) if start else 0
+        chunks.append((start / sample_rate, audio[start:end]))
+    return chunks
+
+
+def _with_retries(function, argument, retries, backoff):
+    for attempt in range(retries + 1):
+        try:
+            return function(argument)
+        except Exception:
+            if attempt == retries:
+                raise
+            time.sleep(backoff * 2 ** attempt)
+
+
+def transcribe_chunks(chunks, transcribe, max_workers=4, retries=2, backoff=1.0, on_progress=None):
+    """
+    Transcribe chunks concurrently, keeping their order
+
+    Args:
+        chunks: Sequence of audio chunks
+        transcribe: Function from a chunk to its text (runs in worker threads)
+        max_workers: Requests in flight at once
+        retries: Extra attempts per chunk, with exponential backoff
+        on_progress: Called as on_progress(done, total) in the calling thread
+
+    Returns:
+        (texts, errors): texts[i] is None if chunk i failed; errors maps
+        chunk index to its last exception
+    """
+    texts = [None] * len(chunks)
+    errors = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(_with_retries, transcribe, chunk, retries, backoff): index
+            for index, chunk in enumerate(chunks)
+        }
+        for done, future in enumerate(as_completed(futures), 1):
+            index = futures[future]
+            try:
+                texts[index] = future.result()
+            except Exception as e:
+                errors[index] = e
+            if on_progress:
+                on_progress(done, len(chunks))
+    return texts, errors
+
+
+def _normalize(word):
+    return re.sub(r"[^\w']", '', word.lower())
+
+
+def stitch(texts, max_overlap_words=20):
+    """Join transcripts in order, dropping words the next chunk repeats from the overlap"""
+    words = []
+    for text in texts:
+        if not text:
+            continue
+        new_words = text.split()
+        limit = min(max_overlap_words, len(words), len(new_words))
+        tail = [_normalize(word) for word in words[-limit:]] if limit else []
+        head = [_normalize(word) for word in new_words[:limit]]
+        for size in range(limit, 0, -1):
+            if tail[-size:] == head[:size]:
+                new_words = new_words[size:]
+                break
+        words.extend(new_words)
+    return ' '.join(words)
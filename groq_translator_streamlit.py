@@ -1,13 +1,21 @@
 import streamlit as st
-import os
-import tempfile
+import io
 import sounddevice as sd
-import soundfile as sf
 import numpy as np
 import time
+from concurrent.futures import ThreadPoolExecutor
 import matplotlib.pyplot as plt
-from scipy import signal
 from groq_translator import initialize_client, translate, text_to_speech, LANGUAGE_MAP
+from audio_encoding import EncodedAudio, UploadReport, decode_audio, encode_wav, prepare_upload, read_audio_result, to_mono
+from audio_preprocessing import preprocess
+from chunked_transcription import split_on_silence, stitch, transcribe_bytes, transcribe_chunks
+from speech_pipeline import pipeline, split_sentences
+from audio_stream import StreamingRecorder, VoiceActivitySegmenter
+from batch_translate import format_for, translate_document
+from waveform import WaveformEnvelope, minmax_envelope, plot_envelope
+from translation_cache import TwoLevelCache, speech_key, translation_key
+
+CACHE_DIR = ".translator_cache"
 
 st.set_page_config(page_title="Groq Translator", page_icon="🌐", layout="wide")
 
@@ -17,84 +25,293 @@ st.title("Groq Translator with Text-to-Speech and Voice Input")
 api_key = st.sidebar.text_input("Enter your Groq API key:", type="password")
 client = None
 
-if api_key:
+# Streamlit reruns this script on every interaction; keep the client and caches across reruns
+@st.cache_resource
+def get_client(api_key):
     client = initialize_client(api_key)
-    if client:
+    if not client:
+        # Raised rather than returned, so the failure isn't cached and the key is checked again on the next rerun
+        raise ValueError("Invalid API key")
+    return client
+
+@st.cache_resource
+def get_caches():
+    return {
+        "translation": TwoLevelCache(f"{CACHE_DIR}/translations", max_entries=512, max_bytes=20 * 1024 * 1024),
+        "speech": TwoLevelCache(f"{CACHE_DIR}/speech", max_entries=64, max_bytes=200 * 1024 * 1024),
+    }
+
+caches = get_caches()
+
+if api_key:
+    try:
+        client = get_client(api_key)
         st.sidebar.success("API key is valid!")
-    else:
+    except ValueError:
         st.sidebar.error("Invalid API key. Please try again.")
 
-def safe_remove_file(file_path, max_retries=5, delay=0.1):
-    for _ in range(max_retries):
-        try:
-            os.unlink(file_path)
-            return True
-        except PermissionError:
-            time.sleep(delay)
-    return False
-
-def plot_audio_wave(audio_data):
-    fig, ax = plt.subplots(figsize=(10, 2))
-    ax.plot(audio_data)
-    ax.set_xlabel('Sample')
-    ax.set_ylabel('Amplitude')
-    ax.set_title('Audio Waveform')
-    return fig
-
-def reduce_noise(audio_data, sample_rate):
-    # Simple noise reduction using a high-pass filter
-    b, a = signal.butter(5, 100 / (sample_rate / 2), btype='highpass')
-    return signal.filtfilt(b, a, audio_data)
-
-def trim_silence(audio_data, threshold=0.01, chunk_size=1000):
-    trim_start = 0
-    trim_end = len(audio_data)
-    
-    for i in range(0, len(audio_data), chunk_size):
-        if np.max(np.abs(audio_data[i:i+chunk_size])) > threshold:
-            trim_start = i
-            break
-    
-    for i in range(len(audio_data) - chunk_size, 0, -chunk_size):
-        if np.max(np.abs(audio_data[i:i+chunk_size])) > threshold:
-            trim_end = i + chunk_size
-            break
-    
-    return audio_data[trim_start:trim_end]
-
-def transcribe_audio_with_whisper(filename, language):
+# Whisper works at 16 kHz mono, so uploads are resampled and compressed before sending
+UPLOAD_ENCODINGS = {
+    "FLAC 16 kHz mono": "flac",
+    "Opus 16 kHz mono": "opus",
+    "WAV 16 kHz mono": "wav",
+    "Original (no resampling)": None,
+}
+upload_codec = UPLOAD_ENCODINGS[st.sidebar.selectbox("Upload encoding:", list(UPLOAD_ENCODINGS))]
+
+def plot_audio_wave(audio_data, sample_rate=None):
+    # One min/max pair per pixel column instead of every sample
+    return plot_envelope(*minmax_envelope(audio_data), sample_rate)
+
+def show_waveform(placeholder, envelope, sample_rate):
+    fig = plot_envelope(*envelope.envelope(), sample_rate)
+    placeholder.pyplot(fig)
+    plt.close(fig)
+
+def request_transcription(filename, data, language):
+    # No Streamlit calls here: this also runs in worker threads
+    return transcribe_bytes(client, filename, data, language)
+
+def record_upload_report(report):
+    st.caption(report.summary())
+    reports = st.session_state.setdefault('upload_reports', [])
+    reports.append(report)
+    del reports[:-10]
+
+def transcribe_audio_with_whisper(filename, data, language):
     try:
-        with open(filename, "rb") as file:
-            transcription = client.audio.transcriptions.create(
-                file=(filename, file.read()),
-                model="whisper-large-v3-turbo",
-                prompt="Specify context or spelling",  # Optional
-                response_format="json",  # Optional
-                language=language,  # Optional
-                temperature=0.0  # Optional
-            )
-        st.write(f"Debug: Raw transcription result: {transcription}")
-        if hasattr(transcription, 'text'):
-            return transcription.text
-        elif isinstance(transcription, dict) and 'text' in transcription:
-            return transcription['text']
-        else:
-            st.error(f"Unexpected transcription format: {type(transcription)}")
-            return "Transcription failed: Unexpected format"
+        started = time.perf_counter()
+        text = request_transcription(filename, data, language)
+        record_upload_report(UploadReport("original file", len(data), len(data), 1, 0.0, time.perf_counter() - started))
+        return text
     except Exception as e:
         st.error(f"An error occurred during transcription: {str(e)}")
         return f"Transcription failed: {str(e)}"
 
+def encode_for_upload(audio_data, sample_rate, codec, name):
+    if codec:
+        return prepare_upload(audio_data, sample_rate, codec, name=name)
+    started = time.perf_counter()
+    data = encode_wav(audio_data, sample_rate)
+    part = EncodedAudio(f"{name}.wav", data, "audio/wav", len(audio_data) / sample_rate)
+    return [part], UploadReport("original WAV", len(data), len(data), 1, time.perf_counter() - started)
+
+def transcribe_audio(audio_data, sample_rate, language, codec, name="recording"):
+    # Encode for Whisper (splitting if over the size cap) and transcribe the parts in order
+    try:
+        parts, report = encode_for_upload(audio_data, sample_rate, codec, name)
+        started = time.perf_counter()
+        texts = [request_transcription(part.filename, part.data, language) for part in parts]
+        report.request_seconds = time.perf_counter() - started
+        record_upload_report(report)
+        return " ".join(text.strip() for text in texts)
+    except Exception as e:
+        st.error(f"An error occurred during transcription: {str(e)}")
+        return f"Transcription failed: {str(e)}"
+
+def transcribe_segment(audio_data, sample_rate, language, codec, reports=None):
+    # Upload reports are appended to reports if given; list.append is safe across worker threads
+    parts, report = encode_for_upload(audio_data, sample_rate, codec, "segment")
+    started = time.perf_counter()
+    text = " ".join(request_transcription(part.filename, part.data, language).strip() for part in parts)
+    report.request_seconds = time.perf_counter() - started
+    if reports is not None:
+        reports.append(report)
+    return text
+
+def transcribe_in_chunks(audio_data, sample_rate, language, codec, chunk_seconds, max_workers):
+    # Split at silence, transcribe the chunks concurrently and stitch them back in order
+    started = time.perf_counter()
+    audio_data = to_mono(audio_data)
+    chunks = split_on_silence(audio_data, sample_rate, chunk_seconds=chunk_seconds)
+    progress = st.progress(0.0, text=f"Transcribing {len(chunks)} chunks...")
+
+    def on_progress(done, total):
+        progress.progress(done / total, text=f"Transcribed {done}/{total} chunks")
+
+    reports = []
+    requests_started = time.perf_counter()
+    texts, errors = transcribe_chunks(
+        [chunk for _, chunk in chunks],
+        lambda chunk: transcribe_segment(chunk, sample_rate, language, codec, reports),
+        max_workers=max_workers, on_progress=on_progress
+    )
+    if reports:
+        # One report for the whole upload; requests overlap, so their time is the wall time
+        record_upload_report(UploadReport(
+            reports[0].codec,
+            sum(report.raw_bytes for report in reports),
+            sum(report.uploaded_bytes for report in reports),
+            sum(report.parts for report in reports),
+            sum(report.encode_seconds for report in reports),
+            time.perf_counter() - requests_started
+        ))
+    for index, error in sorted(errors.items()):
+        st.error(f"Chunk {index + 1} at {chunks[index][0]:.0f}s failed: {error}")
+    st.caption(f"Transcribed {len(chunks)} chunks ({len(audio_data) / sample_rate:.0f} s of audio) "
+               f"with {max_workers} parallel requests in {time.perf_counter() - started:.2f} s")
+    if len(errors) == len(chunks):
+        return "Transcription failed: all chunks failed"
+    return stitch(texts)
+
+def stream_transcription(sample_rate, duration, language, codec, volume_gain, threshold, transcript_placeholder, status_placeholder, wave_placeholder=None):
+    # Record with a callback stream and transcribe each speech segment while recording continues
+    segmenter = VoiceActivitySegmenter(sample_rate, threshold=threshold)
+    waveform = WaveformEnvelope()
+    last_drawn = 0.0
+    captured = []
+    segments = []
+
+    def show_transcript():
+        parts = []
+        for start, future in segments:
+            if not future.done():
+                parts.append(f"[{start:.1f}s] ...")
+            elif future.exception():
+                parts.append(f"[{start:.1f}s] (failed: {future.exception()})")
+            else:
+                parts.append(f"[{start:.1f}s] {future.result()}")
+        transcript_placeholder.markdown("\n\n".join(parts) or "Listening...")
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        with StreamingRecorder(sample_rate) as recorder:
+            deadline = time.monotonic() + duration
+            while True:
+                finished = time.monotonic() >= deadline
+                if not finished:
+                    time.sleep(0.1)
+                samples = recorder.read()
+                captured.append(samples)
+                waveform.add(samples * volume_gain)
+                if wave_placeholder is not None and (finished or time.monotonic() - last_drawn >= 0.5):
+                    show_waveform(wave_placeholder, waveform, sample_rate)
+                    last_drawn = time.monotonic()
+                new_segments = segmenter.feed(samples)
+                if finished:
+                    new_segments += segmenter.flush()
+                for start, segment in new_segments:
+                    # Same noise reduction, trimming and gain as a full recording, so both modes transcribe alike
+                    segment = preprocess(segment, sample_rate, gain=volume_gain)
+                    future = executor.submit(transcribe_segment, segment, sample_rate, language, codec)
+                    segments.append((start, future))
+                remaining = max(0.0, deadline - time.monotonic())
+                status_placeholder.write(f"Recording... {remaining:.0f}s left, {len(segments)} segments")
+                show_transcript()
+                if finished:
+                    break
+
+        status_placeholder.write("Recording finished, waiting for the last segments...")
+        for _, future in segments:
+            try:
+                future.result()
+            except Exception:
+                pass
+            show_transcript()
+
+    if recorder.buffer.dropped or recorder.status_errors:
+        st.warning(f"Audio overflow: {recorder.buffer.dropped} samples dropped, {recorder.status_errors} stream errors")
+    status_placeholder.write(f"Transcribed {len(segments)} segments.")
+    audio_data = np.concatenate(captured) if captured else np.zeros(0, dtype=np.float32)
+    text = " ".join(future.result().strip() for _, future in segments if not future.exception())
+    return audio_data, text
+
+def synthesize(text, language):
+    # No Streamlit calls here: this also runs in worker threads
+    audio_file = text_to_speech(text, language)
+    if not audio_file:
+        raise RuntimeError("Failed to convert text to speech")
+    return read_audio_result(audio_file)
+
+def cached_translate(text, source_lang, target_lang):
+    def compute():
+        translated = translate(client, text, source_lang, target_lang)
+        return translated.encode("utf-8") if translated else None
+    translated = caches["translation"].get_or_compute(translation_key(text, source_lang, target_lang), compute)
+    return translated.decode("utf-8") if translated else None
+
+def cached_speech(text, language):
+    return caches["speech"].get_or_compute(speech_key(text, language), lambda: synthesize(text, language))
+
+def show_cache_stats():
+    with st.sidebar.expander("Cache"):
+        for name, cache in caches.items():
+            stats = cache.stats()
+            st.write(f"**{name.capitalize()}**: {stats['hit_rate']:.0%} hit rate over {stats['lookups']} lookups "
+                     f"({stats['memory_hits']} memory, {stats['disk_hits']} disk, {stats['misses']} misses), "
+                     f"{stats['disk_bytes'] / 1024 / 1024:.1f} MB on disk")
+
+def speak_pipelined(text, source_lang, target_lang):
+    # Translate and speak sentence by sentence, playing the first while the rest are processed
+    sentences = split_sentences(text)
+    metrics = st.columns(2)
+    first_audio = metrics[0].empty()
+    total_time = metrics[1].empty()
+    translation_placeholder = st.empty()
+    translations = []
+    audio_parts = []
+    results = pipeline(
+        sentences,
+        lambda sentence: cached_translate(sentence, source_lang, target_lang),
+        lambda translation: cached_speech(translation, LANGUAGE_MAP[target_lang])
+    )
+    for index, sentence, translation, audio, elapsed in results:
+        if not translation:
+            st.error(f"Translation failed for sentence {index + 1}: {sentence}")
+            continue
+        translations.append(translation)
+        translation_placeholder.text_area("Translated text:", " ".join(translations), height=150, key=f"pipelined_{index}")
+        if audio is None:
+            st.error(f"Speech failed for sentence {index + 1}: {translation}")
+            continue
+        if not audio_parts:
+            first_audio.metric("Time to first audio", f"{elapsed:.2f} s")
+        st.audio(audio, format="audio/mp3", autoplay=not audio_parts)
+        audio_parts.append(audio)
+        total_time.metric(f"Sentences ready ({len(audio_parts)}/{len(sentences)})", f"{elapsed:.2f} s")
+    if len(audio_parts) > 1:
+        # MP3 frames can be concatenated into one playable file
+        st.write("Full translation:")
+        st.audio(b"".join(audio_parts), format="audio/mp3")
+    return " ".join(translations)
+
+def translate_uploaded_document(document, source_lang, target_lang, max_workers, requests_per_minute):
+    # Translate a whole document chunk by chunk, previewing the output as it is written in order
+    output = io.StringIO()
+    progress = st.progress(0.0, text="Translating document...")
+    preview = st.empty()
+
+    def on_progress(done, total, written):
+        progress.progress(done / total, text=f"Translated {done}/{total} chunks")
+        if written:
+            preview.text_area("Translated document:", output.getvalue(), height=300, key=f"document_{done}")
+
+    try:
+        stats = translate_document(
+            document.getvalue().decode("utf-8-sig"), format_for(document.name),
+            lambda chunk: cached_translate(chunk, source_lang, target_lang), output,
+            max_workers=max_workers, requests_per_minute=requests_per_minute, on_progress=on_progress
+        )
+        st.caption(f"Translated {stats['blocks']} blocks in {stats['chunks']} requests in {stats['seconds']} s")
+    except Exception as e:
+        st.error(f"Document translation stopped: {str(e)}")
+    if output.getvalue():
+        stem, extension = document.name.rsplit(".", 1)
+        st.download_button("Download translation", output.getvalue(), file_name=f"{stem}.{target_lang.lower()}.{extension}")
+
 # Main app
 if client:
     col1, col2 = st.columns(2)
 
     with col1:
         source_lang = st.selectbox("Select source language:", list(LANGUAGE_MAP.keys()), key="source_lang")
-        input_method = st.radio("Choose input method:", ["Text", "Microphone", "System Sound", "Upload Audio"])
+        input_method = st.radio("Choose input method:", ["Text", "Microphone", "System Sound", "Upload Audio", "Document"])
 
         if input_method == "Text":
             text_to_translate = st.text_area("Enter text to translate:", height=150)
+        elif input_method == "Document":
+            document = st.file_uploader("Choose a document", type=["txt", "md", "srt"])
+            document_workers = st.slider("Parallel requests", min_value=1, max_value=8, value=4)
+            document_rpm = st.number_input("Maximum requests per minute", min_value=1, max_value=600, value=30)
         elif input_method in ["Microphone", "System Sound"]:
             show_wave = st.checkbox("Show audio wave during recording")
             wave_placeholder = st.empty()
@@ -105,7 +322,34 @@ if client:
             # Add recording duration input
             duration = st.number_input("Recording duration (seconds)", min_value=1, max_value=300, value=10)
 
-            if st.button(f"Record Audio ({duration} seconds)"):
+            stream_mode = False
+            if input_method == "Microphone":
+                stream_mode = st.checkbox("Transcribe while recording")
+            if stream_mode:
+                vad_threshold = st.slider("Voice activity threshold", min_value=0.001, max_value=0.1, value=0.01, step=0.001, format="%.3f")
+
+            if stream_mode and st.button(f"Record and Transcribe (up to {duration} seconds)"):
+                sample_rate = 44100
+                status_placeholder = st.empty()
+                transcript_placeholder = st.empty()
+                try:
+                    audio_data, text_to_translate = stream_transcription(
+                        sample_rate, duration, LANGUAGE_MAP[source_lang], upload_codec, volume_gain, vad_threshold,
+                        transcript_placeholder, status_placeholder, wave_placeholder if show_wave else None
+                    )
+                    if len(audio_data) > 0:
+                        audio_data = preprocess(audio_data, sample_rate, gain=volume_gain)
+                        st.session_state.recording = (audio_data, sample_rate)
+                        st.session_state.audio_bytes = encode_wav(audio_data, sample_rate)
+                    if text_to_translate:
+                        st.text_area("Transcribed text:", text_to_translate, height=150)
+                    else:
+                        st.warning("No speech was detected. Try lowering the voice activity threshold or raising the volume gain.")
+                except Exception as e:
+                    st.error(f"An error occurred during recording: {str(e)}")
+                    st.write("Please make sure your audio devices are properly configured and try again.")
+
+            elif not stream_mode and st.button(f"Record Audio ({duration} seconds)"):
                 st.write("Recording started...")
                 sample_rate = 44100  # Sample rate
                 
@@ -125,27 +369,19 @@ if client:
                     st.write(f"Debug: Audio data min: {np.min(audio_data)}, max: {np.max(audio_data)}")
                 
                     if len(audio_data) > 0:
-                        # Apply noise reduction
-                        audio_data = reduce_noise(audio_data, sample_rate)
-                        
-                        # Trim silence
-                        audio_data = trim_silence(audio_data)
-                        
-                        # Apply volume gain
-                        audio_data = audio_data * volume_gain
+                        # Noise reduction, silence trimming and volume gain
+                        audio_data = preprocess(audio_data, sample_rate, gain=volume_gain)
                         
                         st.write(f"Debug: Processed audio data size: {len(audio_data)}")
                         st.write(f"Debug: Processed audio data min: {np.min(audio_data)}, max: {np.max(audio_data)}")
                         
-                        # Save as PCM WAV
-                        with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as temp_audio:
-                            sf.write(temp_audio.name, audio_data, sample_rate, subtype='PCM_16')
-                            st.session_state.audio_file = temp_audio.name
-                        st.write(f"Debug: Audio file saved: {st.session_state.audio_file}")
-                        st.write(f"Debug: Audio file size: {os.path.getsize(st.session_state.audio_file)} bytes")
+                        # Keep the samples for transcription and a PCM WAV in memory for playback
+                        st.session_state.recording = (audio_data, sample_rate)
+                        st.session_state.audio_bytes = encode_wav(audio_data, sample_rate)
+                        st.write(f"Debug: Encoded audio size: {len(st.session_state.audio_bytes)} bytes")
                     
                         if show_wave:
-                            fig = plot_audio_wave(audio_data)
+                            fig = plot_audio_wave(audio_data, sample_rate)
                             wave_placeholder.pyplot(fig)
                             plt.close(fig)
                     else:
@@ -160,51 +396,74 @@ if client:
                     st.error(f"An error occurred during recording: {str(e)}")
                     st.write("Please make sure your audio devices are properly configured and try again.")
 
-            if 'audio_file' in st.session_state and st.session_state.audio_file:
-                st.audio(st.session_state.audio_file, format="audio/wav")
+            if st.session_state.get('audio_bytes'):
+                st.audio(st.session_state.audio_bytes, format="audio/wav")
                 if st.button("Transcribe Audio"):
                     st.write("Transcribing...")
-                    if os.path.exists(st.session_state.audio_file):
-                        text_to_translate = transcribe_audio_with_whisper(st.session_state.audio_file, LANGUAGE_MAP[source_lang])
-                        if text_to_translate.startswith("Transcription failed"):
-                            st.error(text_to_translate)
-                            text_to_translate = ""
-                        else:
-                            st.text_area("Transcribed text:", text_to_translate, height=150)
+                    recorded_audio, recorded_rate = st.session_state.recording
+                    text_to_translate = transcribe_audio(recorded_audio, recorded_rate, LANGUAGE_MAP[source_lang], upload_codec)
+                    if text_to_translate.startswith("Transcription failed"):
+                        st.error(text_to_translate)
+                        text_to_translate = ""
                     else:
-                        st.error("Audio file not found. Please record audio again.")
-                        st.session_state.audio_file = None
+                        st.text_area("Transcribed text:", text_to_translate, height=150)
 
         elif input_method == "Upload Audio":
             uploaded_file = st.file_uploader("Choose an audio file", type=["wav", "mp3", "ogg"])
+            chunked = st.checkbox("Split long files at silence and transcribe chunks in parallel", value=True)
+            if chunked:
+                chunk_seconds = st.slider("Chunk length (seconds)", min_value=10, max_value=120, value=30, step=5)
+                max_workers = st.slider("Parallel requests", min_value=1, max_value=8, value=4)
             if uploaded_file is not None:
                 st.audio(uploaded_file, format=f"audio/{uploaded_file.name.split('.')[-1]}")
                 if st.button("Transcribe Uploaded Audio"):
-                    with tempfile.NamedTemporaryFile(delete=False, suffix=f"_{time.time()}.{uploaded_file.name.split('.')[-1]}") as temp_audio:
-                        temp_audio.write(uploaded_file.getvalue())
-                        text_to_translate = transcribe_audio_with_whisper(temp_audio.name, LANGUAGE_MAP[source_lang])
-                        if text_to_translate.startswith("Transcription failed"):
-                            st.error(text_to_translate)
-                            text_to_translate = ""
-                        else:
-                            st.text_area("Transcribed text:", text_to_translate, height=150)
-                    safe_remove_file(temp_audio.name)
+                    decoded = None
+                    if upload_codec or chunked:
+                        try:
+                            decoded = decode_audio(uploaded_file.getvalue())
+                        except Exception as e:
+                            st.write(f"Debug: Could not decode {uploaded_file.name} ({e}), uploading it unchanged")
+                    if decoded is not None and chunked:
+                        text_to_translate = transcribe_in_chunks(decoded[0], decoded[1], LANGUAGE_MAP[source_lang], upload_codec, chunk_seconds, max_workers)
+                    elif decoded is not None:
+                        name = uploaded_file.name.rsplit('.', 1)[0]
+                        text_to_translate = transcribe_audio(decoded[0], decoded[1], LANGUAGE_MAP[source_lang], upload_codec, name=name)
+                    else:
+                        text_to_translate = transcribe_audio_with_whisper(uploaded_file.name, uploaded_file.getvalue(), LANGUAGE_MAP[source_lang])
+                    if text_to_translate.startswith("Transcription failed"):
+                        st.error(text_to_translate)
+                        text_to_translate = ""
+                    else:
+                        st.text_area("Transcribed text:", text_to_translate, height=150)
 
     with col2:
         target_lang = st.selectbox("Select target language:", list(LANGUAGE_MAP.keys()), key="target_lang")
         
-        if 'text_to_translate' in locals() and text_to_translate:
+        pipelined = input_method != "Document" and st.checkbox("Speak sentence by sentence while translating")
+
+        if input_method == "Document":
+            if document is None:
+                st.warning("Please upload a .txt, .md or .srt document to translate.")
+            elif st.button("Translate Document"):
+                translate_uploaded_document(document, source_lang, target_lang, document_workers, document_rpm)
+        elif 'text_to_translate' in locals() and text_to_translate and pipelined:
+            try:
+                speak_pipelined(text_to_translate, source_lang, target_lang)
+            except Exception as e:
+                st.error(f"An error occurred during translation: {str(e)}")
+        elif 'text_to_translate' in locals() and text_to_translate:
             with st.spinner("Translating..."):
-                translated_text = translate(client, text_to_translate, source_lang, target_lang)
+                translated_text = cached_translate(text_to_translate, source_lang, target_lang)
             if translated_text:
                 st.text_area("Translated text:", translated_text, height=150)
                 
                 with st.spinner("Converting to speech..."):
-                    audio_file = text_to_speech(translated_text, LANGUAGE_MAP[target_lang])
-                if audio_file:
-                    st.audio(audio_file, format="audio/mp3")
-                    if not safe_remove_file(audio_file):
-                        st.warning(f"Could not remove temporary file: {audio_file}")
+                    try:
+                        speech = cached_speech(translated_text, LANGUAGE_MAP[target_lang])
+                    except Exception:
+                        speech = None
+                if speech:
+                    st.audio(speech, format="audio/mp3")
                 else:
                     st.error("Failed to convert text to speech.")
             else:
@@ -215,5 +474,12 @@ if client:
 else:
     st.warning("Please enter a valid Groq API key in the sidebar to use the translator.")
 
+show_cache_stats()
+
+if st.session_state.get('upload_reports'):
+    with st.sidebar.expander("Upload stats"):
+        for report in reversed(st.session_state.upload_reports):
+            st.write(report.summary())
+
 st.markdown("---")
 st.markdown("Created with Streamlit and Groq API")
@@ -0,0 +1,89 @@
+"""
+Sentence-pipelined translation and speech for the Groq translator
+The input is split into sentences that are translated and synthesized
+concurrently, but handed back strictly in order, so the first sentence can be
+played while later ones are still being processed.
+"""
+
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+SENTENCE_END = re.compile(r'(?<=[.!?;。！？；…])\s+|\n+')
+
+
+def split_sentences(text, min_chars=20, max_chars=300):
+    """
+    Split text into sentences for pipelining
+
+    Fragments shorter than min_chars are merged into the next sentence (so
+    "Dr." or "OK." don't become requests of their own) and sentences longer
+    than max_chars are cut at the last comma or space before the limit.
+    """
+    sentences = []
+    pending = ''
+    for part in SENTENCE_END.split(text):
+        part = part.strip()
+        if not part:
+            continue
+        pending = f"{pending} {part}".strip()
+        if len(pending) >= min_chars:
+            sentences.append(pending)
+            pending = ''
+    if pending:
+        if sentences and len(sentences[-1]) + len(pending) < max_chars:
+            sentences[-1] = f"{sentences[-1]} {pending}"
+        else:
+            sentences.append(pending)
+
+    limited = []
+    for sentence in sentences:
+        while len(sentence) > max_chars:
+            cut = sentence.rfind(', ', 0, max_chars)
+            if cut <= 0:
+                cut = sentence.rfind(' ', 0, max_chars)
+            cut = cut + 1 if cut > 0 else max_chars
+            limited.append(sentence[:cut].strip())
+            sentence = sentence[cut:].strip()
+        if sentence:
+            limited.append(sentence)
+    return limited
+
+
+def pipeline(sentences, translate_sentence, speak, max_workers=3):
+    """
+    Translate and synthesize sentences concurrently, yielding them in order
+
+    Each sentence is translated and then spoken in one worker, so sentence 1
+    can be playing while sentence 2 is translated and sentence 3 synthesized.
+
+    Args:
+        sentences: Source sentences
+        translate_sentence: Function from a sentence to its translation
+        speak: Function from a translation to audio bytes; if it raises,
+            that sentence is yielded with audio None and the rest go on
+        max_workers: Sentences in flight at once
+
+    Yields:
+        (index, sentence, translation, audio, seconds since start)
+    """
+    started = time.perf_counter()
+
+    def process(sentence):
+        translation = translate_sentence(sentence)
+        if not translation:
+            return translation, None
+        try:
+            return translation, speak(translation)
+        except Exception:
+            return translation, None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(process, sentence) for sentence in sentences]
+        try:
+            for index, (sentence, future) in enumerate(zip(sentences, futures)):
+                translation, audio = future.result()
+                yield index, sentence, translation, audio, time.perf_counter() - started
+        finally:
+            for future in futures:
+                future.cancel()
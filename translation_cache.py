@@ -0,0 +1,159 @@
+"""
+Two-level cache for translations and synthesized speech
+An in-process LRU answers repeated lookups during Streamlit reruns; an on-disk
+store keeps results across restarts and evicts the least recently used files
+once it grows past its size budget.
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+
+def cache_key(*parts):
+    return hashlib.sha256('\0'.join(parts).encode('utf-8')).hexdigest()
+
+
+def translation_key(text, source_lang, target_lang):
+    return cache_key('translation', source_lang, target_lang, text)
+
+
+def speech_key(text, language):
+    return cache_key('speech', language, text)
+
+
+class LRUCache:
+    """Thread-safe in-memory LRU keyed by string"""
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return self._items[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+
+    def __len__(self):
+        return len(self._items)
+
+
+class DiskCache:
+    """Bytes stored one file per key, evicting least recently used files past max_bytes"""
+
+    def __init__(self, directory, max_bytes=100 * 1024 * 1024):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.size = sum(path.stat().st_size for path in self._files())
+
+    def _files(self):
+        return (path for path in self.directory.glob('*/*') if path.suffix != '.tmp')
+
+    def _path(self, key):
+        return self.directory / key[:2] / key
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        # The modification time doubles as the last-access time for eviction
+        os.utime(path)
+        with self._lock:
+            self.hits += 1
+        return data
+
+    def put(self, key, data):
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        tmp_path = path.with_name(f"{key}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(data)
+        previous = path.stat().st_size if path.exists() else 0
+        tmp_path.replace(path)
+        with self._lock:
+            self.size += len(data) - previous
+            if self.size > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        entries = []
+        for path in self._files():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, path, stat.st_size))
+        self.size = sum(size for _, _, size in entries)
+        # Evict down to 90% so the next few writes don't rescan the directory
+        for _, path, size in sorted(entries):
+            if self.size <= self.max_bytes * 0.9:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            self.size -= size
+
+
+class TwoLevelCache:
+    """Memory LRU in front of a DiskCache; values are bytes"""
+
+    def __init__(self, directory, max_entries=256, max_bytes=100 * 1024 * 1024):
+        self.memory = LRUCache(max_entries)
+        self.disk = DiskCache(directory, max_bytes)
+
+    def get(self, key):
+        value = self.memory.get(key)
+        if value is None:
+            value = self.disk.get(key)
+            if value is not None:
+                self.memory.put(key, value)
+        return value
+
+    def put(self, key, value):
+        self.memory.put(key, value)
+        self.disk.put(key, value)
+
+    def get_or_compute(self, key, compute):
+        """Cached value, or compute() stored for next time (None results are not cached)"""
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            if value is not None:
+                self.put(key, value)
+        return value
+
+    def stats(self):
+        lookups = self.memory.hits + self.memory.misses
+        return {
+            'lookups': lookups,
+            'memory_hits': self.memory.hits,
+            'disk_hits': self.disk.hits,
+            'misses': self.disk.misses,
+            'hit_rate': (self.memory.hits + self.disk.hits) / lookups if lookups else 0.0,
+            'memory_entries': len(self.memory),
+            'disk_bytes': self.disk.size,
+        }
@@ -0,0 +1,113 @@
+"""
+Decimated waveform rendering for the Groq translator
+A waveform is drawn as the min/max envelope of one bucket of samples per pixel
+column, so drawing cost depends on the plot width, not the recording length.
+WaveformEnvelope keeps that envelope up to date while audio streams in.
+"""
+
+import numpy as np
+
+DEFAULT_COLUMNS = 1000
+
+
+def minmax_envelope(audio, columns=DEFAULT_COLUMNS):
+    """
+    Per-column minimum and maximum of the audio, computed in one pass
+
+    Returns:
+        (mins, maxs, samples_per_column); short audio is returned unchanged
+        with one sample per column
+    """
+    audio = np.asarray(audio, dtype=np.float32).reshape(-1)
+    if len(audio) <= columns:
+        return audio, audio, 1.0
+    starts = (np.arange(columns) * (len(audio) / columns)).astype(np.intp)
+    return np.minimum.reduceat(audio, starts), np.maximum.reduceat(audio, starts), len(audio) / columns
+
+
+class WaveformEnvelope:
+    """
+    Incrementally maintained min/max envelope with bounded size
+
+    Samples are folded into buckets of `bucket_size` samples. When there are
+    more than 2 * columns buckets, neighbouring buckets are merged and the
+    bucket size doubles, so memory and redraw cost stay constant however
+    long the recording runs.
+    """
+
+    def __init__(self, columns=DEFAULT_COLUMNS, bucket_size=64):
+        self.columns = columns
+        self.bucket_size = bucket_size
+        self.samples = 0
+        self.mins = np.zeros(0, dtype=np.float32)
+        self.maxs = np.zeros(0, dtype=np.float32)
+        # Bucket still being filled
+        self._count = 0
+        self._min = np.inf
+        self._max = -np.inf
+
+    def add(self, block):
+        block = np.asarray(block, dtype=np.float32).reshape(-1)
+        self.samples += len(block)
+        while len(block):
+            if self._count:
+                # Top up the bucket being filled first
+                head = block[:self.bucket_size - self._count]
+                block = block[len(head):]
+                self._fold(head.min(), head.max(), len(head))
+                if self._count == self.bucket_size:
+                    low, high = self._min, self._max
+                    self._count, self._min, self._max = 0, np.inf, -np.inf
+                    self._append(np.array([low]), np.array([high]))
+                continue
+
+            count = len(block) // self.bucket_size
+            if not count:
+                self._fold(block.min(), block.max(), len(block))
+                break
+            buckets = block[:count * self.bucket_size].reshape(count, self.bucket_size)
+            block = block[count * self.bucket_size:]
+            # A merge during the append may leave a partial bucket, so loop
+            self._append(buckets.min(axis=1), buckets.max(axis=1))
+
+    def _fold(self, low, high, count):
+        self._min = min(self._min, float(low))
+        self._max = max(self._max, float(high))
+        self._count += count
+
+    def _append(self, mins, maxs):
+        self.mins = np.concatenate((self.mins, mins.astype(np.float32)))
+        self.maxs = np.concatenate((self.maxs, maxs.astype(np.float32)))
+        while len(self.mins) > 2 * self.columns:
+            self._merge()
+
+    def _merge(self):
+        pairs = len(self.mins) // 2
+        if len(self.mins) % 2:
+            # The odd bucket out joins the partial one, which is still shorter than a merged bucket
+            self._fold(self.mins[-1], self.maxs[-1], self.bucket_size)
+        self.mins = np.minimum(self.mins[:2 * pairs:2], self.mins[1:2 * pairs:2])
+        self.maxs = np.maximum(self.maxs[:2 * pairs:2], self.maxs[1:2 * pairs:2])
+        self.bucket_size *= 2
+
+    def envelope(self):
+        """(mins, maxs, samples_per_column) including the bucket still being filled"""
+        mins, maxs = self.mins, self.maxs
+        if self._count:
+            mins = np.append(mins, np.float32(self._min))
+            maxs = np.append(maxs, np.float32(self._max))
+        return mins, maxs, float(self.bucket_size)
+
+
+def plot_envelope(mins, maxs, samples_per_column, sample_rate=None, title='Audio Waveform'):
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(10, 2))
+    x = np.arange(len(mins)) * samples_per_column
+    if sample_rate:
+        x = x / sample_rate
+    ax.fill_between(x, mins, maxs, linewidth=0.5)
+    ax.set_xlabel('Time (s)' if sample_rate else 'Sample')
+    ax.set_ylabel('Amplitude')
+    ax.set_title(title)
+    return fig